@@ -0,0 +1,125 @@
+"""
+Benchmark of the extraction of components from a (PyPSA) network.
+
+It times function '_get_components' on a synthetic network and, when another version of PyPSATopo is given (e.g. the one preceding a change, which can be
+retrieved with "git show <revision>:pypsatopo.py > baseline.py"), it also times that version and checks that both generate the same DOT representation for a
+set of scenarios (without the metadata at its beginning, which holds the time of generation and the parameters used). Focusing is not part of these scenarios,
+as it does not work in versions prior to 'user-013' (i.e. a single bus to focus on raises a TypeError and a list of buses an UnboundLocalError).
+
+Usage: python benchmarks/benchmark_get_components.py [--baseline baseline.py] [--buses 3000] [--snapshots 50] [--repeat 3]
+"""
+
+
+import argparse
+import importlib.util
+import inspect
+import os
+import sys
+import tempfile
+import time
+import contextlib
+import io
+import numpy
+import pandas
+import pypsa
+
+
+
+def build_network(buses_count, snapshots_count, seed = 0):
+    # build a synthetic network with generators, loads, stores, storage units, links and lines attached to its buses (some of which have non-default units)
+    rng = numpy.random.default_rng(seed)
+    network = pypsa.Network(name = "Synthetic Network")
+    network.set_snapshots(pandas.date_range("2020-01-01", periods = snapshots_count, freq = "h"))
+    carriers = ["AC", "H2", "heat", "gas"]
+    buses = ["bus%d" % i for i in range(buses_count)]
+    network.add("Bus", buses, carrier = [carriers[i % 4] for i in range(buses_count)], unit = [("MW", "None", "MWh_th", "t_co2")[i % 4] for i in range(buses_count)])
+    generators = ["generator%d" % i for i in range(buses_count * 2)]
+    network.add("Generator", generators, bus = [buses[i % buses_count] for i in range(len(generators))], carrier = [carriers[i % 4] for i in range(len(generators))], p_nom = rng.random(len(generators)) * 100, p_nom_extendable = [bool(i % 2) for i in range(len(generators))])
+    network.generators_t.p = pandas.DataFrame(rng.random((snapshots_count, len(generators))), index = network.snapshots, columns = generators)
+    loads = ["load%d" % i for i in range(buses_count)]
+    network.add("Load", loads, bus = [buses[(i * 7) % buses_count] for i in range(buses_count)], carrier = "AC", p_set = rng.random(buses_count))
+    stores = ["store%d" % i for i in range(buses_count // 2)]
+    network.add("Store", stores, bus = [buses[(i * 3) % buses_count] for i in range(len(stores))], carrier = "H2", e_nom = rng.random(len(stores)))
+    network.stores_t.e = pandas.DataFrame(rng.random((snapshots_count, len(stores))), index = network.snapshots, columns = stores)
+    storage_units = ["storage_unit%d" % i for i in range(buses_count // 2)]
+    network.add("StorageUnit", storage_units, bus = [buses[(i * 5) % buses_count] for i in range(len(storage_units))], carrier = "hydro", p_nom = rng.random(len(storage_units)))
+    links = ["link%d" % i for i in range(buses_count)]
+    network.add("Link", links, bus0 = [buses[i] for i in range(buses_count)], bus1 = [buses[(i * 11 + 1) % buses_count] for i in range(buses_count)], carrier = "DC", p_nom = rng.random(buses_count), efficiency = rng.random(buses_count))
+    network.links_t.p0 = pandas.DataFrame(rng.random((snapshots_count, buses_count)), index = network.snapshots, columns = links)
+    lines = ["line%d" % i for i in range(buses_count)]
+    network.add("Line", lines, bus0 = [buses[i] for i in range(buses_count)], bus1 = [buses[(i * 13 + 2) % buses_count] for i in range(buses_count)], x = 0.1, r = 0.01, s_nom = rng.random(buses_count))
+    return network
+
+
+
+def load_module(path, name):
+    # load a version of PyPSATopo from the given path
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+
+def time_get_components(module, network, repeat):
+    # time function '_get_components' (which took the bus to focus on as second parameter in older versions), keeping the best of several runs
+    parameters = inspect.signature(module._get_components).parameters
+    arguments = (network, None, False, False, False) if "focus" in parameters else (network, False, False, False)
+    result = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        module._get_components(*arguments)
+        elapsed = time.perf_counter() - start
+        result = elapsed if result is None else min(result, elapsed)
+    return result
+
+
+
+def get_dot_representation(module, network, directory, name, parameters):
+    # generate DOT representation of network (the tool 'dot' not being needed, as the DOT file is written regardless) and strip its metadata
+    file_output = os.path.join(directory, "%s.svg" % name)
+    with contextlib.redirect_stdout(io.StringIO()):
+        module.generate(network, file_output = file_output, **parameters)
+    with open(os.path.join(directory, "%s.dot" % name)) as handle:
+        return [line for line in handle.read().splitlines() if not line.startswith("//")]
+
+
+
+SCENARIOS = {"default": {},
+             "broken_missing": {"broken_missing": True},
+             "context": {"context": True, "bus_filter": "bus[0-3]$", "broken_missing": True},
+             "carrier_color": {"carrier_color": True, "carrier_filter": "AC|H2"},
+             "negative_efficiency": {"negative_efficiency": False, "broken_missing": True},
+             "filters": {"generator_filter": "generator1", "load_filter": "load[0-4]", "store_filter": "store", "storage_unit_filter": "storage_unit1", "line_filter": "line[12]", "bus_filter": "bus"}}
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Benchmark of the extraction of components from a (PyPSA) network")
+    parser.add_argument("--baseline", help = "Path of another version of PyPSATopo to compare with")
+    parser.add_argument("--buses", type = int, default = 3000, help = "Number of buses of the synthetic network")
+    parser.add_argument("--snapshots", type = int, default = 50, help = "Number of snapshots of the synthetic network")
+    parser.add_argument("--repeat", type = int, default = 3, help = "Number of runs (the best of which is reported)")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    import pypsatopo
+    modules = {"current": pypsatopo}
+    if args.baseline:
+        modules["baseline"] = load_module(args.baseline, "pypsatopo_baseline")
+
+    network = build_network(args.buses, args.snapshots)
+    print("Network with %d buses, %d components and %d snapshots" % (len(network.buses), len(network.generators) + len(network.loads) + len(network.stores) + len(network.storage_units) + len(network.links) + len(network.lines), len(network.snapshots)))
+    for name, module in modules.items():
+        print("%s: _get_components took %.2f seconds" % (name, time_get_components(module, network, args.repeat)))
+
+    if args.baseline:
+        network = build_network(min(args.buses, 200), min(args.snapshots, 10))
+        status = 0
+        with tempfile.TemporaryDirectory() as directory:
+            for name, parameters in SCENARIOS.items():
+                representations = [get_dot_representation(module, network, directory, "%s_%s" % (key, name), parameters) for key, module in modules.items()]
+                same = representations[0] == representations[1]
+                print("Scenario '%s': DOT representations are %s" % (name, "identical" if same else "different"))
+                status |= not same
+        sys.exit(status)
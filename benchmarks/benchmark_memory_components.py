@@ -0,0 +1,56 @@
+"""
+Benchmark of the memory used by the components extracted from a (PyPSA) network.
+
+It measures (with module 'tracemalloc') the memory retained by the result of function '_get_components' on the synthetic network of benchmark
+'benchmark_get_components.py', as well as the peak memory reached while extracting it. When another version of PyPSATopo is given (e.g. the one preceding the
+switch to slotted records, which can be retrieved with "git show <revision>:pypsatopo.py > baseline.py"), it measures that version as well.
+
+Usage: python benchmarks/benchmark_memory_components.py [--baseline baseline.py] [--buses 3000] [--snapshots 50]
+"""
+
+
+import argparse
+import gc
+import inspect
+import os
+import sys
+import time
+import tracemalloc
+from benchmark_get_components import build_network, load_module
+
+
+
+def measure_get_components(module, network):
+    # measure memory retained by (and peak memory reached during) the extraction of components, as well as the time it took
+    parameters = inspect.signature(module._get_components).parameters
+    arguments = (network, None, False, False, False) if "focus" in parameters else (network, False, False, False)
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    components = module._get_components(*arguments)
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del components
+    return retained, peak, elapsed
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Benchmark of the memory used by the components extracted from a (PyPSA) network")
+    parser.add_argument("--baseline", help = "Path of another version of PyPSATopo to compare with")
+    parser.add_argument("--buses", type = int, default = 3000, help = "Number of buses of the synthetic network")
+    parser.add_argument("--snapshots", type = int, default = 50, help = "Number of snapshots of the synthetic network")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    import pypsatopo
+    modules = {"current": pypsatopo}
+    if args.baseline:
+        modules["baseline"] = load_module(args.baseline, "pypsatopo_baseline")
+
+    network = build_network(args.buses, args.snapshots)
+    print("Network with %d buses, %d components and %d snapshots" % (len(network.buses), len(network.generators) + len(network.loads) + len(network.stores) + len(network.storage_units) + len(network.links) + len(network.lines), len(network.snapshots)))
+    for name, module in modules.items():
+        retained, peak, elapsed = measure_get_components(module, network)
+        print("%s: _get_components retained %.1f MB (peak %.1f MB) and took %.2f seconds" % (name, retained / 1e6, peak / 1e6, elapsed))
@@ -13,16 +13,30 @@ __status__ = "Development"
 
 
 # import necessary modules
-from collections import deque
+from functools import lru_cache
+from itertools import accumulate, chain, islice, repeat
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import asyncio
+import weakref
+import io
 import os
 import sys
 import re
 import argparse
+import copy
 import datetime
 import subprocess
+import tempfile
+import time
+import hashlib
+import shutil
+import json
+import pickle
 import colorsys
 import pypsa
 import pandas
+import numpy
 
 
 
@@ -33,6 +47,10 @@ DOT_REPRESENTATION = {"BUS": "   \"%s (bus)\" [label = <<font color = \"%s\">%s<
                       "LOAD": "   \"%s (load)\" [label = <<font color = \"%s\">%s</font>>, tooltip = \"Load: %s\nBus: %s\nCarrier: %s\nPower set: %s %s\", shape = \"invtriangle\", width = %.2f, height = %.2f, style = \"setlinewidth(%.2f)\", color = \"%s\"]   \"%s (bus)\" -> \"%s (load)\" [style = \"setlinewidth(%.2f)\", color = \"%s\", arrowhead = \"none\"]",
                       "STORE": "   \"%s (store)\" [label = <<font color = \"%s\">%s</font>>, tooltip = \"Store: %s\nBus: %s\nCarrier: %s\nExtendable nominal energy: %s\nNominal energy: %.2f %sh\nPower set: %s %s\nCyclic energy: %s\nCapital cost: %.2f currency/%s\nMarginal cost: %s currency/%sh\n\nOptimised nominal energy: %.2f %sh\nEnergy time series: %s %sh\nPower time series: %s %s\", shape = \"box\", width = %.2f, style = \"setlinewidth(%.2f)\", color = \"%s\"]   \"%s (bus)\" -> \"%s (store)\" [style = \"setlinewidth(%.2f)\", color = \"%s\", arrowhead = \"none\"]",
                       "STORAGE_UNIT": "   \"%s (storage unit)\" [label = <<font color = \"%s\">%s</font>>, tooltip = \"Storage unit: %s\nBus: %s\nCarrier: %s\nExtendable nominal power: %s\nNominal power: %.2f %s\nPower set: %s %s\nCharge cyclic state: %s\nCapital cost: %.2f currency/%s\nMarginal cost: %s currency/%sh\n\nOptimised nominal power: %.2f %s\nPower time series: %s %s\", shape = \"parallelogram\", width = %.2f, style = \"setlinewidth(%.2f)\", color = \"%s\"]   \"%s (bus)\" -> \"%s (storage unit)\" [style = \"setlinewidth(%.2f)\", color = \"%s\", arrowhead = \"none\"]",
+                      "GENERATOR_GROUP": "   \"%s (%s generators)\" [label = <<font color = \"%s\">%s</font>>, tooltip = \"Generators: %d\nBus: %s\nCarrier: %s\nNominal power: %.2f %s\nOptimised nominal power: %.2f %s\", shape = \"circle\", peripheries = 2, width = %.2f, style = \"setlinewidth(%.2f)\", color = \"%s\"]   \"%s (%s generators)\" -> \"%s (bus)\" [style = \"setlinewidth(%.2f)\", color = \"%s\", arrowhead = \"none\"]",
+                      "LOAD_GROUP": "   \"%s (%s loads)\" [label = <<font color = \"%s\">%s</font>>, tooltip = \"Loads: %d\nBus: %s\nCarrier: %s\", shape = \"invtriangle\", peripheries = 2, width = %.2f, height = %.2f, style = \"setlinewidth(%.2f)\", color = \"%s\"]   \"%s (bus)\" -> \"%s (%s loads)\" [style = \"setlinewidth(%.2f)\", color = \"%s\", arrowhead = \"none\"]",
+                      "STORE_GROUP": "   \"%s (%s stores)\" [label = <<font color = \"%s\">%s</font>>, tooltip = \"Stores: %d\nBus: %s\nCarrier: %s\nNominal energy: %.2f %sh\nOptimised nominal energy: %.2f %sh\", shape = \"box\", peripheries = 2, width = %.2f, style = \"setlinewidth(%.2f)\", color = \"%s\"]   \"%s (bus)\" -> \"%s (%s stores)\" [style = \"setlinewidth(%.2f)\", color = \"%s\", arrowhead = \"none\"]",
+                      "STORAGE_UNIT_GROUP": "   \"%s (%s storage units)\" [label = <<font color = \"%s\">%s</font>>, tooltip = \"Storage units: %d\nBus: %s\nCarrier: %s\nNominal power: %.2f %s\nOptimised nominal power: %.2f %s\", shape = \"parallelogram\", peripheries = 2, width = %.2f, style = \"setlinewidth(%.2f)\", color = \"%s\"]   \"%s (bus)\" -> \"%s (%s storage units)\" [style = \"setlinewidth(%.2f)\", color = \"%s\", arrowhead = \"none\"]",
                       "LINK": "   \"%s (bus)\" -> \"%s (bus)\" [label = <<font color = \"%s\">%s</font>>, tooltip = \"Link: %s\nFrom: %s\nTo: %s\nCarrier: %s\nExtendable nominal power: %s\nNominal power: %.2f MW\nEfficiency: %.2f\nCapital cost: %.2f currency/MW\nMarginal cost: %s currency/MWh\n\nOptimised nominal power: %.2f MW\nPower time series (%s): %s MW\nPower time series (%s): %s MW\", style = \"setlinewidth(%.2f)\", color = \"%s\", arrowhead = \"%s\", arrowsize = %.2f]",
                       "BROKEN_LINK": "   \"%s (bus)\" -> \"%s (bus)\" [label = <<font color = \"%s\">%s</font>>, tooltip = \"Link: %s\nFrom: %s\nTo: %s\nCarrier: %s\nExtendable nominal power: %s\nNominal power: %.2f MW\nEfficiency: %.2f\nCapital cost: %.2f currency/MW\nMarginal cost: %s currency/MWh\n\nOptimised nominal power: 0.00 MW\nPower time series (%s): N/A MW\nPower time series (%s): N/A MW\", style = \"setlinewidth(%.2f), dashed\", color = \"%s\", arrowhead = \"%s\", arrowsize = %.2f]",
                       "BIDIRECTIONAL_LINK": "   \"%s (bus)\" -> \"%s (bus)\" [label = <<font color = \"%s\">%s</font>>, tooltip = \"Bidirectional link: %s\nFrom: %s\nTo: %s\nCarrier: %s\nExtendable nominal power: %s\nNominal power: %.2f MW\nEfficiency: 1.00\nCapital cost: %.2f currency/MW\nMarginal cost: %s currency/MWh\n\nOptimised nominal power: %.2f MW\nPower time series (p0): %s MW\nPower time series (p1): %s MW\", style = \"setlinewidth(%.2f)\", color = \"%s\", arrowhead = \"%s\", arrowtail = \"%s\", arrowsize = %.2f, dir = \"both\"]",
@@ -46,7 +64,7 @@ DOT_REPRESENTATION = {"BUS": "   \"%s (bus)\" [label = <<font color = \"%s\">%s<
                       "BROKEN_LINE": "   \"%s (bus)\" -> \"%s (bus)\" [label = <<font color = \"%s\">%s</font>>, tooltip = \"Line: %s\nBus0: %s\nBus1: %s\nCarrier: %s\nExtendable nominal power: %s\nNominal power: %.2f MVA\nCapital cost: %.2f currency/MVA\n\nOptimised nominal power: 0.00 MVA\nPower time series (p0): N/A MW\nPower time series (p1): N/A MW\", style = \"setlinewidth(%.2f), dashed\", color = \"%s\", arrowhead = \"%s\", arrowtail = \"%s\", arrowsize = %.2f, dir = \"both\"]"
                      }
 FILE_OUTPUT = "topography.svg"
-FILE_FORMAT = "svg"   # acceptable values are: "svg", "png", "jpg", "gif", "pdf" and "ps"
+FILE_FORMAT = "svg"   # acceptable values are: "svg", "png", "jpg", "gif", "pdf" and "ps" (or a list of these)
 MARGIN = 0.0
 BACKGROUND_COLOR = "transparent"
 NETWORK_NAME = "My Network"
@@ -54,6 +72,11 @@ RANK_DIRECTION = "TB"   # acceptable values are: "TB" (top to bottom), "BT" (bot
 RANK_SEPARATION = 1.0
 NODE_SEPARATION = 1.0
 EDGE_STYLE = "polyline"   # acceptable values are: "polyline", "curved", "ortho" and "none"
+LAYOUT_ENGINE = "dot"   # acceptable values are: "dot", "sfdp", "neato", "fdp" and "auto"
+LAYOUT_THRESHOLD = 5000   # number of components (to represent) from which the layout engine "auto" switches from "dot" to "sfdp"
+RENDER_TIMEOUT = None   # maximum number of seconds that the tool 'dot' may take to lay out and render the topographical representation of the network before it is killed (None meaning no limit)
+RENDER_CACHE_SIZE = 512 * 1024 * 1024   # maximum size (in bytes) of the render cache, beyond which its least recently used files are evicted
+RENDER_PROCESSES = os.cpu_count() or 1   # maximum number of processes of the tool 'dot' running concurrently when rendering asynchronously (i.e. through function 'generate_async' or method 'render_async')
 TEXT_FONT = "Courier New"
 TEXT_SIZE = 8.0
 TEXT_COLOR = "red"
@@ -85,19 +108,294 @@ LINE_ARROW_SIZE = 1.2
 BROKEN_MISSING_COLOR = "grey60"
 FADED_TEXT_COLOR = "#ffb0b0"
 FADED_COMPONENT_COLOR = "grey90"
+WRITE_DOT_FILE = True   # write DOT representation of the network into a file (named after the output file) besides piping it to the tool 'dot'
+LAZY_READING = True   # read NetCDF and HDF5 files directly (only loading static tables and the first values of time series) instead of through PyPSA
 
 
 
 # declare (private) global variables (these should not be overwritten by the caller)
 _MISSING_BUS_COUNT = 0
+_CACHE_FORMAT = 2   # format of the cache files (increased whenever the records extracted from the (PyPSA) network change, so that cache files of a previous format are not read)
+_TIMEOUT_STATUS = -2   # status returned when the tool 'dot' is killed for exceeding the render timeout
+_INTERRUPTED_STATUS = -3   # status returned when the tool 'dot' is killed by user request (which is not treated as an error)
+_SEMAPHORES = weakref.WeakKeyDictionary()   # semaphores limiting the number of processes of the tool 'dot' running concurrently (one per event loop, as these cannot be shared between event loops)
+_BATCH_SIZE = 1024   # number of lines of the DOT representation written at once into the DOT file and the standard input of the tool 'dot'
+_LINK_EDGE = 0
+_MULTI_LINK_BRANCH_EDGE = 1
+_LINE_EDGE = 2
+_COMPONENTS = (("Bus", "buses"), ("Generator", "generators"), ("Load", "loads"), ("Store", "stores"), ("StorageUnit", "storage_units"), ("Link", "links"), ("Line", "lines"))
+_STATIC_DEFAULTS = None
+_SERIES_REGEXP = re.compile("^(p[0-9]*|e|p_set|marginal_cost)$")   # time series attributes shown in the topographical representation of the network
+_SPECIFIER_REGEXP = re.compile("%(%|[-#0 +]*[0-9]*(\\.[0-9]+)?[diouxXeEfFgGcrsa])")   # conversion specifiers of the DOT representations of the components
+_LABEL_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})   # characters escaped in (HTML-like) labels
+_TOOLTIP_TABLE = str.maketrans({"\\": "\\\\", "\"": "\\\""})   # characters escaped in (double-quoted) identifiers and tooltips
+_TOOLTIP_REGEXP = re.compile("tooltip = \"((?:[^\"\\\\]|\\\\.)*)\"")   # tooltips of the DOT representations of the components (which change with the results of an optimisation while the layout does not)
+_ENTITY_REGEXP = re.compile("&(#[0-9]+|#[xX][0-9a-fA-F]+|[A-Za-z][A-Za-z0-9]*);")   # entities in tooltips (which the tool 'dot' decodes)
+_SPACE_REGEXP = re.compile("(?<= ) ")   # spaces following another space in tooltips (which the tool 'dot' writes as non-breaking spaces in SVG files)
+_TITLE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", "\"": "&quot;", "'": "&#39;", "-": "&#45;", "\n": "&#10;", "\r": "&#13;"})   # characters escaped by the tool 'dot' in tooltips of SVG files
+_TITLE_REGEXP = re.compile("xlink:title=\"([^\"]*)\"")   # tooltips in SVG files generated by the tool 'dot'
+
+
+
+# declare (private) records holding the components extracted from the (PyPSA) network (slotted to keep their memory footprint low)
+class _Bus:
+    """
+    Record of a bus (and of the components attached to it) extracted from the (PyPSA) network.
+    """
+
+    __slots__ = ("name", "carrier", "unit", "p_time_series", "location", "missing", "selected", "generators", "loads", "stores", "storage_units", "links", "multi_link_trunks", "multi_link_branches", "lines")
+
+
+    def __init__(self, name, missing, carrier = "", unit = "", p_time_series = "", location = ""):
+        self.name = name
+        self.carrier = carrier
+        self.unit = unit
+        self.p_time_series = p_time_series
+        self.location = location
+        self.missing = missing
+        self.selected = False
+        self.generators = list()
+        self.loads = list()
+        self.stores = list()
+        self.storage_units = list()
+        self.links = list()
+        self.multi_link_trunks = list()
+        self.multi_link_branches = list()
+        self.lines = list()
+
+
+
+class _Generator:
+    """
+    Record of a generator extracted from the (PyPSA) network.
+    """
+
+    __slots__ = ("name", "carrier", "unit", "p_nom_extendable", "p_nom", "p_set", "efficiency", "capital_cost", "marginal_cost", "p_nom_opt", "p_time_series", "selected")
+
+
+    def __init__(self, name, carrier, unit, p_nom_extendable, p_nom, p_set, efficiency, capital_cost, marginal_cost, p_nom_opt, p_time_series):
+        self.name = name
+        self.carrier = carrier
+        self.unit = unit
+        self.p_nom_extendable = p_nom_extendable
+        self.p_nom = p_nom
+        self.p_set = p_set
+        self.efficiency = efficiency
+        self.capital_cost = capital_cost
+        self.marginal_cost = marginal_cost
+        self.p_nom_opt = p_nom_opt
+        self.p_time_series = p_time_series
+        self.selected = False
+
+
+
+class _Load:
+    """
+    Record of a load extracted from the (PyPSA) network.
+    """
+
+    __slots__ = ("name", "carrier", "unit", "p_set", "selected")
+
+
+    def __init__(self, name, carrier, unit, p_set):
+        self.name = name
+        self.carrier = carrier
+        self.unit = unit
+        self.p_set = p_set
+        self.selected = False
+
+
+
+class _Store:
+    """
+    Record of a store extracted from the (PyPSA) network.
+    """
+
+    __slots__ = ("name", "carrier", "unit", "e_nom_extendable", "e_nom", "p_set", "e_cyclic", "capital_cost", "marginal_cost", "e_nom_opt", "e_time_series", "p_time_series", "selected")
+
+
+    def __init__(self, name, carrier, unit, e_nom_extendable, e_nom, p_set, e_cyclic, capital_cost, marginal_cost, e_nom_opt, e_time_series, p_time_series):
+        self.name = name
+        self.carrier = carrier
+        self.unit = unit
+        self.e_nom_extendable = e_nom_extendable
+        self.e_nom = e_nom
+        self.p_set = p_set
+        self.e_cyclic = e_cyclic
+        self.capital_cost = capital_cost
+        self.marginal_cost = marginal_cost
+        self.e_nom_opt = e_nom_opt
+        self.e_time_series = e_time_series
+        self.p_time_series = p_time_series
+        self.selected = False
+
+
+
+class _StorageUnit:
+    """
+    Record of a storage unit extracted from the (PyPSA) network.
+    """
+
+    __slots__ = ("name", "carrier", "unit", "p_nom_extendable", "p_nom", "p_set", "cyclic_state_charge", "capital_cost", "marginal_cost", "p_nom_opt", "p_time_series", "selected")
+
+
+    def __init__(self, name, carrier, unit, p_nom_extendable, p_nom, p_set, cyclic_state_charge, capital_cost, marginal_cost, p_nom_opt, p_time_series):
+        self.name = name
+        self.carrier = carrier
+        self.unit = unit
+        self.p_nom_extendable = p_nom_extendable
+        self.p_nom = p_nom
+        self.p_set = p_set
+        self.cyclic_state_charge = cyclic_state_charge
+        self.capital_cost = capital_cost
+        self.marginal_cost = marginal_cost
+        self.p_nom_opt = p_nom_opt
+        self.p_time_series = p_time_series
+        self.selected = False
+
+
+
+class _Link:
+    """
+    Record of a link (as seen from one of its two buses) extracted from the (PyPSA) network.
+    """
+
+    __slots__ = ("name", "bus_to", "carrier", "p_nom_extendable", "p_nom", "efficiency", "capital_cost", "marginal_cost", "p_nom_opt", "p0_time_series", "p1_time_series", "bidirectional", "direction", "missing", "selected", "duplicated")
+
+
+    def __init__(self, name, bus_to, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, p1_time_series, bidirectional, direction, missing):
+        self.name = name
+        self.bus_to = bus_to
+        self.carrier = carrier
+        self.p_nom_extendable = p_nom_extendable
+        self.p_nom = p_nom
+        self.efficiency = efficiency
+        self.capital_cost = capital_cost
+        self.marginal_cost = marginal_cost
+        self.p_nom_opt = p_nom_opt
+        self.p0_time_series = p0_time_series
+        self.p1_time_series = p1_time_series
+        self.bidirectional = bidirectional
+        self.direction = direction
+        self.missing = missing
+        self.selected = False
+        self.duplicated = False
+
+
+
+class _MultiLinkTrunk:
+    """
+    Record of a multi-link trunk (attached to bus0) extracted from the (PyPSA) network.
+    """
+
+    __slots__ = ("name", "bus_to", "bus_to_efficiencies", "carrier", "p_nom_extendable", "p_nom", "capital_cost", "marginal_cost", "p_nom_opt", "p0_time_series", "count", "missing", "selected")
+
+
+    def __init__(self, name, bus_to, bus_to_efficiencies, carrier, p_nom_extendable, p_nom, capital_cost, marginal_cost, p_nom_opt, p0_time_series, count, missing):
+        self.name = name
+        self.bus_to = bus_to
+        self.bus_to_efficiencies = bus_to_efficiencies
+        self.carrier = carrier
+        self.p_nom_extendable = p_nom_extendable
+        self.p_nom = p_nom
+        self.capital_cost = capital_cost
+        self.marginal_cost = marginal_cost
+        self.p_nom_opt = p_nom_opt
+        self.p0_time_series = p0_time_series
+        self.count = count
+        self.missing = missing
+        self.selected = False
+
+
+
+class _MultiLinkBranch:
+    """
+    Record of a multi-link branch (as seen from one of its two ends) extracted from the (PyPSA) network.
+    """
+
+    __slots__ = ("name", "bus_to", "bus_value", "carrier", "p_nom_extendable", "p_nom", "efficiency", "capital_cost", "marginal_cost", "p_nom_opt", "p0_time_series", "px", "px_time_series", "index", "direction", "selected", "duplicated")
+
+
+    def __init__(self, name, bus_to, bus_value, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, px, px_time_series, index, direction):
+        self.name = name
+        self.bus_to = bus_to
+        self.bus_value = bus_value
+        self.carrier = carrier
+        self.p_nom_extendable = p_nom_extendable
+        self.p_nom = p_nom
+        self.efficiency = efficiency
+        self.capital_cost = capital_cost
+        self.marginal_cost = marginal_cost
+        self.p_nom_opt = p_nom_opt
+        self.p0_time_series = p0_time_series
+        self.px = px
+        self.px_time_series = px_time_series
+        self.index = index
+        self.direction = direction
+        self.selected = False
+        self.duplicated = False
+
+
+
+class _Line:
+    """
+    Record of a line (as seen from one of its two buses) extracted from the (PyPSA) network.
+    """
+
+    __slots__ = ("name", "bus_to", "carrier", "s_nom_extendable", "s_nom", "capital_cost", "s_nom_opt", "p0_time_series", "p1_time_series", "direction", "missing", "selected", "duplicated")
+
+
+    def __init__(self, name, bus_to, carrier, s_nom_extendable, s_nom, capital_cost, s_nom_opt, p0_time_series, p1_time_series, direction, missing):
+        self.name = name
+        self.bus_to = bus_to
+        self.carrier = carrier
+        self.s_nom_extendable = s_nom_extendable
+        self.s_nom = s_nom
+        self.capital_cost = capital_cost
+        self.s_nom_opt = s_nom_opt
+        self.p0_time_series = p0_time_series
+        self.p1_time_series = p1_time_series
+        self.direction = direction
+        self.missing = missing
+        self.selected = False
+        self.duplicated = False
+
+
+
+class _Network:
+    """
+    Lightweight (PyPSA-like) network read directly from a file, holding the static tables of the components and the first values of their time series.
+    """
+
+    def __init__(self, name, snapshots):
+        self.name = name
+        self.snapshots = range(snapshots)   # only the number of snapshots is needed
+
+
+
+class _Filter:
+    """
+    Filter (i.e. regular expression) whose matches are memoized per text, as the same names and carriers are matched over and over again while processing the components.
+    """
 
+    __slots__ = ("regexp", "match")
 
 
-def _format_series(values):
+    def __init__(self, pattern):
+        self.regexp = re.compile(pattern)
+        self.match = lru_cache(maxsize = None)(self.regexp.match)
+
+
+
+def _format_series(components_t, attribute, length):
     """
     Parameters
     ----------
-    values : TYPE
+    components_t : TYPE
+        DESCRIPTION.
+    attribute : TYPE
+        DESCRIPTION.
+    length : TYPE
         DESCRIPTION.
 
     Returns
@@ -106,21 +404,25 @@ def _format_series(values):
         DESCRIPTION.
     """
 
-    length = len(values)
+    result = dict()
+
+
+    # check if time series exists
+    if not components_t or attribute not in components_t:
+        return result
+
+
+    # format the (up to) five first values of all the time series of the frame in one single slice (the length of the time series is the number of snapshots of the network, as the frame may only hold its first values)
+    frame = components_t[attribute]
     if length == 0:
-        result = "[]"
-    elif length == 1:
-        result = "[%.2f]" % values.iloc[0]
-    elif length == 2:
-        result = "[%.2f, %.2f]" % (values.iloc[0], values.iloc[1])
-    elif length == 3:
-        result = "[%.2f, %.2f, %.2f]" % (values.iloc[0], values.iloc[1], values.iloc[2])
-    elif length == 4:
-        result = "[%.2f, %.2f, %.2f, %.2f]" % (values.iloc[0], values.iloc[1], values.iloc[2], values.iloc[3])
-    elif length == 5:
-        result = "[%.2f, %.2f, %.2f, %.2f, %.2f]" % (values.iloc[0], values.iloc[1], values.iloc[2], values.iloc[3], values.iloc[4])
-    else:   # length > 5
-        result = "[%.2f, %.2f, %.2f, %.2f, %.2f, ...]" % (values.iloc[0], values.iloc[1], values.iloc[2], values.iloc[3], values.iloc[4])
+        for name in frame.columns:
+            result[name] = "[]"
+    else:
+        values = frame.iloc[:5].to_numpy().T.tolist()
+        template = "[%s%s]" % (", ".join(["%.2f"] * min(length, 5)), ", ..." if length > 5 else "")
+        for name, head in zip(frame.columns, values):
+            result[name] = template % tuple(head)
+
 
     return result
 
@@ -139,450 +441,1904 @@ def _replace(text):
         DESCRIPTION.
     """
 
+    # escape characters that have a special meaning in (HTML-like) labels in one single pass over the text (only done when the text has any of these, which is rarely the case)
+    if "&" in text or "<" in text or ">" in text:
+        return text.translate(_LABEL_TABLE)
+    return text
+
+
+
+def _quote(text):
+    """
+    Parameters
+    ----------
+    text : TYPE
+        DESCRIPTION.
+
+    Returns
+    -------
+    TYPE
+        DESCRIPTION.
+    """
+
+    # escape characters that have a special meaning in (double-quoted) identifiers and tooltips in one single pass over the text (only done when the text has any of these, which is rarely the case)
+    if "\"" in text or "\\" in text:
+        return text.translate(_TOOLTIP_TABLE)
+    return text
+
+
+
+def _bind(template, constants):
+    """
+    Parameters
+    ----------
+    template : TYPE
+        DESCRIPTION.
+    constants : TYPE
+        DESCRIPTION.
+
+    Returns
+    -------
+    TYPE
+        DESCRIPTION.
+    """
+
     result = []
+    position = 0
+
 
+    # get conversion specifiers of template (e.g. "%s" or "%.2f", but not the escaped "%%")
+    specifiers = [specifier for specifier in _SPECIFIER_REGEXP.finditer(template) if specifier.group() != "%%"]
 
-    for c in text:
-        if c == ">":
-            result.append("&gt;")
-        elif c == "<":
-            result.append("&lt;")
-        elif c == "&":
-            result.append("&amp;")
+
+    # replace conversion specifiers that have a constant value (given by their index, or by their index counted from the end when negative) with the formatted value itself, escaping the latter so that it is not interpreted as a specifier when the template is formatted later on
+    for index, specifier in enumerate(specifiers):
+        result.append(template[position:specifier.start()])
+        if index in constants:
+            result.append((specifier.group() % constants[index]).replace("%", "%%"))
+        elif index - len(specifiers) in constants:
+            result.append((specifier.group() % constants[index - len(specifiers)]).replace("%", "%%"))
         else:
-            result.append(c)
+            result.append(specifier.group())
+        position = specifier.end()
+    result.append(template[position:])
 
 
     return "".join(result)
 
 
 
-def _get_components(network, focus, log, log_info, log_warning):
+def _bind_representation(key, text_color_index, constants):
     """
     Parameters
     ----------
-    network : TYPE
+    key : TYPE
         DESCRIPTION.
-    focus : TYPE
+    text_color_index : TYPE
         DESCRIPTION.
-    log : TYPE
+    constants : TYPE
         DESCRIPTION.
-    log_info : TYPE
+
+    Returns
+    -------
+    TYPE
         DESCRIPTION.
-    log_warning : TYPE
+    """
+
+    # bind DOT representation of component (as currently declared, since it may have been overwritten by the caller) to its constants, once with the text color of selected components and once with the one of faded components
+    template = DOT_REPRESENTATION[key]
+    return _bind(template, {text_color_index: TEXT_COLOR, **constants}), _bind(template, {text_color_index: FADED_TEXT_COLOR, **constants})
+
+
+
+def _get_booleans(values):
+    """
+    Parameters
+    ----------
+    values : TYPE
         DESCRIPTION.
 
     Returns
-    result : TYPE
     -------
+    TYPE
         DESCRIPTION.
     """
 
-    global _MISSING_BUS_COUNT
+    return ["True" if value else "False" for value in values.tolist()]
 
 
-    result = dict()
 
+def _get_static_defaults():
+    """
+    Returns
+    -------
+    TYPE
+        DESCRIPTION.
+    """
 
-    # get buses from (PyPSA) network
-    if log or log_info:
-        print("[INF] Retrieving buses from network")
-    buses = network.buses
-    buses_t = getattr(network, "buses_t", None)
-    for i in range(len(buses)):
-        bus = buses.index[i]
-        carrier = buses.carrier.iloc[i]
-        unit = "MW" if buses.unit.iloc[i] == "None" else buses.unit.iloc[i]
-        p_time_series = _format_series(buses_t.p[bus]) if buses_t and bus in buses_t.p else "N/A"
-        result[bus] = {"generators": list(), "loads": list(), "stores": list(), "storage_units": list(), "links": list(), "multi_link_trunks": list(), "multi_link_branches": list(), "lines": list(), "generators_count": 0, "loads_count": 0, "stores_count": 0, "storage_units_count": 0, "incoming_links_count": 0, "outgoing_links_count": 0, "lines_count": 0, "missing": False, "selected": False, "carrier": carrier, "unit": unit, "p_time_series": p_time_series}
+    global _STATIC_DEFAULTS
 
 
-    # get generators from (PyPSA) network
-    if log or log_info:
-        print("[INF] Retrieving generators from network")
-    generators = network.generators
-    generators_t = getattr(network, "generators_t", None)
-    for i in range(len(generators)):
-        generator = generators.index[i]
-        bus = generators.bus.iloc[i]
-        carrier = generators.carrier.iloc[i]
-        if bus in buses:
-            tmp = buses.loc[bus].unit
-            unit = "MW" if tmp == "None" else tmp
-        else:
-            unit = "MW"
-        p_nom_extendable = "True" if generators.p_nom_extendable.iloc[i] else "False"
-        p_nom = generators.p_nom.iloc[i]
-        p_set = _format_series(generators_t.p_set[generator]) if generators_t and generator in generators_t.p_set else "%.2f" % generators.p_set.iloc[i]
-        efficiency = generators.efficiency.iloc[i]
-        capital_cost = generators.capital_cost.iloc[i]
-        marginal_cost = _format_series(generators_t.marginal_cost[generator]) if generators_t and generator in generators_t.marginal_cost else "%.2f" % generators.marginal_cost.iloc[i]
-        p_nom_opt = generators.p_nom_opt.iloc[i]
-        p_time_series = _format_series(generators_t.p[generator]) if generators_t and generator in generators_t.p else "N/A"
-        if bus:
-            if bus in result:
-                if result[bus]["missing"]:
-                    if log or log_warning:
-                        print("[WAR] Generator '%s' connects to bus '%s' which does not exist" % (generator, bus))
-            else:
-                if log or log_warning:
-                    print("[WAR] Generator '%s' connects to bus '%s' which does not exist" % (generator, bus))
-                result[bus] = {"generators": list(), "loads": list(), "stores": list(), "storage_units": list(), "links": list(), "multi_link_trunks": list(), "multi_link_branches": list(), "lines": list(), "generators_count": 0, "loads_count": 0, "stores_count": 0, "storage_units_count": 0, "incoming_links_count": 0, "outgoing_links_count": 0, "lines_count": 0, "missing": True, "selected": False, "carrier": "", "unit": "", "p_time_series": ""}
-        else:
-            if log or log_warning:
-                print("[WAR] Generator '%s' does not have a bus specified" % generator)
-            bus = "bus #%d" % _MISSING_BUS_COUNT
-            _MISSING_BUS_COUNT += 1
-            result[bus] = {"generators": list(), "loads": list(), "stores": list(), "storage_units": list(), "links": list(), "multi_link_trunks": list(), "multi_link_branches": list(), "lines": list(), "generators_count": 0, "loads_count": 0, "stores_count": 0, "storage_units_count": 0, "incoming_links_count": 0, "outgoing_links_count": 0, "lines_count": 0, "missing": True, "selected": False, "carrier": "", "unit": "", "p_time_series": ""}
-        result[bus]["generators"].append([generator, carrier, unit, p_nom_extendable, p_nom, p_set, efficiency, capital_cost, marginal_cost, p_nom_opt, p_time_series, False])
+    # get default values of the static attributes of the components from the metadata of a (PyPSA) network (only done once)
+    if _STATIC_DEFAULTS is None:
+        network = pypsa.Network()
+        _STATIC_DEFAULTS = dict()
+        for component, list_name in _COMPONENTS:
+            metadata = network.components[component]
+            attributes = metadata.defaults if hasattr(metadata, "defaults") else metadata["attrs"]   # PyPSA versions older than 1.0 only provide the metadata of the attributes under key "attrs"
+            attributes = attributes[attributes["static"] & (attributes.index != "name")]
+            _STATIC_DEFAULTS[list_name] = attributes["default"].to_dict()
 
 
-    # get loads from (PyPSA) network
-    if log or log_info:
-        print("[INF] Retrieving loads from network")
-    loads = network.loads
-    loads_t = getattr(network, "loads_t", None)
-    for i in range(len(loads)):
-        load = loads.index[i]
-        bus = loads.bus.iloc[i]
-        carrier = loads.carrier.iloc[i]
-        if bus in buses:
-            tmp = buses.loc[bus].unit
-            unit = "MW" if tmp == "None" else tmp
-        else:
-            unit = "MW"
-        p_set = _format_series(loads_t.p_set[load]) if loads_t and load in loads_t.p_set else "%.2f" % loads.p_set.iloc[i]
-        if bus:
-            if bus in result:
-                if result[bus]["missing"]:
-                    if log or log_warning:
-                        print("[WAR] Load '%s' connects to bus '%s' which does not exist" % (load, bus))
-            else:
-                if log or log_warning:
-                    print("[WAR] Load '%s' connects to bus '%s' which does not exist" % (load, bus))
-                result[bus] = {"generators": list(), "loads": list(), "stores": list(), "storage_units": list(), "links": list(), "multi_link_trunks": list(), "multi_link_branches": list(), "lines": list(), "generators_count": 0, "loads_count": 0, "stores_count": 0, "storage_units_count": 0, "incoming_links_count": 0, "outgoing_links_count": 0, "lines_count": 0, "missing": True, "selected": False, "carrier": "", "unit": "", "p_time_series": ""}
-        else:
-            if log or log_warning:
-                print("[WAR] Load '%s' does not have a bus specified" % load)
-            bus = "bus #%d" % _MISSING_BUS_COUNT
-            _MISSING_BUS_COUNT += 1
-            result[bus] = {"generators": list(), "loads": list(), "stores": list(), "storage_units": list(), "links": list(), "multi_link_trunks": list(), "multi_link_branches": list(), "lines": list(), "generators_count": 0, "loads_count": 0, "stores_count": 0, "storage_units_count": 0, "incoming_links_count": 0, "outgoing_links_count": 0, "lines_count": 0, "missing": True, "selected": False, "carrier": "", "unit": "", "p_time_series": ""}
-        result[bus]["loads"].append([load, carrier, unit, p_set, False])
+    return _STATIC_DEFAULTS
 
 
-    # get stores from (PyPSA) network
-    if log or log_info:
-        print("[INF] Retrieving stores from network")
-    stores = network.stores
-    stores_t = getattr(network, "stores_t", None)
-    for i in range(len(stores)):
-        store = stores.index[i]
-        bus = stores.bus.iloc[i]
-        carrier = stores.carrier.iloc[i]
-        if bus in buses:
-            tmp = buses.loc[bus].unit
-            unit = "MW" if tmp == "None" else tmp
-        else:
-            unit = "MW"
-        e_nom_extendable = "True" if stores.e_nom_extendable.iloc[i] else "False"
-        e_nom = stores.e_nom.iloc[i]
-        p_set = _format_series(stores_t.p_set[store]) if stores_t and store in stores_t.p_set else "%.2f" % stores.p_set.iloc[i]
-        e_cyclic = "True" if stores.e_cyclic.iloc[i] else "False"
-        capital_cost = stores.capital_cost.iloc[i]
-        marginal_cost = _format_series(stores_t.marginal_cost[store]) if stores_t and store in stores_t.marginal_cost else "%.2f" % stores.marginal_cost.iloc[i]
-        e_nom_opt = stores.e_nom_opt.iloc[i]
-        e_time_series = _format_series(stores_t.e[store]) if stores_t and store in stores_t.p else "N/A"
-        p_time_series = _format_series(stores_t.p[store]) if stores_t and store in stores_t.p else "N/A"
-        if bus:
-            if bus in result:
-                if result[bus]["missing"]:
-                    if log or log_warning:
-                        print("[WAR] Store '%s' connects to bus '%s' which does not exist" % (store, bus))
-            else:
-                if log or log_warning:
-                    print("[WAR] Store '%s' connects to bus '%s' which does not exist" % (store, bus))
-                result[bus] = {"generators": list(), "loads": list(), "stores": list(), "storage_units": list(), "links": list(), "multi_link_trunks": list(), "multi_link_branches": list(), "lines": list(), "generators_count": 0, "loads_count": 0, "stores_count": 0, "storage_units_count": 0, "incoming_links_count": 0, "outgoing_links_count": 0, "lines_count": 0, "missing": True, "selected": False, "carrier": "", "unit": "", "p_time_series": ""}
-        else:
-            if log or log_warning:
-                print("[WAR] Store '%s' does not have a bus specified" % store)
-            bus = "bus #%d" % _MISSING_BUS_COUNT
-            _MISSING_BUS_COUNT += 1
-            result[bus] = {"generators": list(), "loads": list(), "stores": list(), "storage_units": list(), "links": list(), "multi_link_trunks": list(), "multi_link_branches": list(), "lines": list(), "generators_count": 0, "loads_count": 0, "stores_count": 0, "storage_units_count": 0, "incoming_links_count": 0, "outgoing_links_count": 0, "lines_count": 0, "missing": True, "selected": False, "carrier": "", "unit": "", "p_time_series": ""}
-        result[bus]["stores"].append([store, carrier, unit, e_nom_extendable, e_nom, p_set, e_cyclic, capital_cost, marginal_cost, e_nom_opt, e_time_series, p_time_series, False])
 
+def _get_static_table(list_name, names, columns):
+    """
+    Parameters
+    ----------
+    list_name : TYPE
+        DESCRIPTION.
+    names : TYPE
+        DESCRIPTION.
+    columns : TYPE
+        DESCRIPTION.
 
-    # get storage units from (PyPSA) network
-    if log or log_info:
-        print("[INF] Retrieving storage units from network")
-    storage_units = network.storage_units
-    storage_units_t = getattr(network, "storage_units_t", None)
-    for i in range(len(storage_units)):
-        storage_unit = storage_units.index[i]
-        bus = storage_units.bus.iloc[i]
-        carrier = storage_units.carrier.iloc[i]
-        if bus in buses:
-            tmp = buses.loc[bus].unit
-            unit = "MW" if tmp == "None" else tmp
-        else:
-            unit = "MW"
-        p_nom_extendable = "True" if storage_units.p_nom_extendable.iloc[i] else "False"
-        p_nom = storage_units.p_nom.iloc[i]
-        p_set = _format_series(storage_units_t.p_set[storage_unit]) if storage_units_t and storage_unit in storage_units_t.p_set else "%.2f" % storage_units.p_set.iloc[i]
-        cyclic_state_charge = "True" if storage_units.cyclic_state_of_charge.iloc[i] else "False"
-        capital_cost = storage_units.capital_cost.iloc[i]
-        marginal_cost = _format_series(storage_units_t.marginal_cost[storage_unit]) if storage_units_t and storage_unit in storage_units_t.marginal_cost else "%.2f" % storage_units.marginal_cost.iloc[i]
-        p_nom_opt = storage_units.p_nom_opt.iloc[i]
-        p_time_series = _format_series(storage_units_t.p[storage_unit]) if storage_units_t and storage_unit in storage_units_t.p else "N/A"
-        if bus:
-            if bus in result:
-                if result[bus]["missing"]:
-                    if log or log_warning:
-                        print("[WAR] Storage unit '%s' connects to bus '%s' which does not exist" % (storage_unit, bus))
-            else:
-                if log or log_warning:
-                    print("[WAR] Storage unit '%s' connects to bus '%s' which does not exist" % (storage_unit, bus))
-                result[bus] = {"generators": list(), "loads": list(), "stores": list(), "storage_units": list(), "links": list(), "multi_link_trunks": list(), "multi_link_branches": list(), "lines": list(), "generators_count": 0, "loads_count": 0, "stores_count": 0, "storage_units_count": 0, "incoming_links_count": 0, "outgoing_links_count": 0, "lines_count": 0, "missing": True, "selected": False, "carrier": "", "unit": "", "p_time_series": ""}
+    Returns
+    -------
+    TYPE
+        DESCRIPTION.
+    """
+
+    data = dict()
+
+
+    # complete the columns read from the file with the default values of the attributes not stored in it (as PyPSA only stores non-default attributes)
+    for attribute, default in _get_static_defaults()[list_name].items():
+        if attribute in columns:
+            values = columns.pop(attribute)
+            data[attribute] = values.astype(bool) if isinstance(default, bool) else values
         else:
-            if log or log_warning:
-                print("[WAR] Storage unit '%s' does not have a bus specified" % storage_unit)
-            bus = "bus #%d" % _MISSING_BUS_COUNT
-            _MISSING_BUS_COUNT += 1
-            result[bus] = {"generators": list(), "loads": list(), "stores": list(), "storage_units": list(), "links": list(), "multi_link_trunks": list(), "multi_link_branches": list(), "lines": list(), "generators_count": 0, "loads_count": 0, "stores_count": 0, "storage_units_count": 0, "incoming_links_count": 0, "outgoing_links_count": 0, "lines_count": 0, "missing": True, "selected": False, "carrier": "", "unit": "", "p_time_series": ""}
-        result[bus]["storage_units"].append([storage_unit, carrier, unit, p_nom_extendable, p_nom, p_set, cyclic_state_charge, capital_cost, marginal_cost, p_nom_opt, p_time_series, False])
+            data[attribute] = [default] * len(names)
+    data.update(columns)   # add non-standard attributes (e.g. bus2 and efficiency2 of multi-links)
 
 
-    # get declared buses that links connect to
-    if log or log_info:
-        print("[INF] Retrieving links from network")
-    links = network.links
-    links_t = getattr(network, "links_t", None)
-    bus_regexp = re.compile("^bus[0-9]+$")
-    declared_buses = list()
-    for column in links.columns:
-        if bus_regexp.match(column):
-            declared_buses.append(column)
+    return pandas.DataFrame(data, index = pandas.Index(names, name = "name"))
 
 
-    # get declared efficiencies that links have
-    efficiency_regexp = re.compile("^efficiency[0-9]*$")
-    declared_efficiencies = set()
-    for column in links.columns:
+
+def _get_series_table(list_name, names, attribute, table):
+    """
+    Parameters
+    ----------
+    list_name : TYPE
+        DESCRIPTION.
+    names : TYPE
+        DESCRIPTION.
+    attribute : TYPE
+        DESCRIPTION.
+    table : TYPE
+        DESCRIPTION.
+
+    Returns
+    -------
+    TYPE
+        DESCRIPTION.
+    """
+
+    # complete time series of output attributes (e.g. "p" and "p0") with zeros for the components not stored in the file (as PyPSA does when reading it)
+    if attribute not in _get_static_defaults()[list_name]:
+        return table.reindex(columns = names, fill_value = 0.0)
+
+
+    return table
+
+
+
+def _read_netcdf(file_input, snapshots):
+    """
+    Parameters
+    ----------
+    file_input : TYPE
+        DESCRIPTION.
+    snapshots : TYPE
+        DESCRIPTION.
+
+    Returns
+    -------
+    result : TYPE
+        DESCRIPTION.
+    """
+
+    import netCDF4
+
+
+    with netCDF4.Dataset(file_input, "r") as dataset:
+        dataset.set_auto_mask(False)
+        variables = dataset.variables
+
+
+        # get name and number of snapshots of (PyPSA) network
+        name = dataset.getncattr("network_name") if "network_name" in dataset.ncattrs() else ""
+        result = _Network(name, len(dataset.dimensions["snapshots"]) if "snapshots" in dataset.dimensions else 1)
+
+
+        # get static tables and first values of time series of components (e.g. variables "generators_i", "generators_bus" and "generators_t_p")
+        for component, list_name in _COMPONENTS:
+            index = "%s_i" % list_name
+            names = variables[index][:].tolist() if index in variables else []
+            columns = dict()
+            series = dict()
+            for variable in variables:
+                if variable.startswith("%s_t_" % list_name):
+                    attribute = variable[len(list_name) + 3:]
+                    if _SERIES_REGEXP.match(attribute) and "%s_i" % variable in variables:
+                        variables[variable].set_var_chunk_cache(0, 0, 0)   # do not keep decompressed chunks in memory as each time series is read only once
+                        table = pandas.DataFrame(variables[variable][:snapshots, :], columns = variables["%s_i" % variable][:].tolist())   # read only the first snapshots
+                        series[attribute] = _get_series_table(list_name, names, attribute, table)
+                elif variable.startswith("%s_" % list_name) and variable != index:
+                    columns[variable[len(list_name) + 1:]] = variables[variable][:]
+            setattr(result, list_name, _get_static_table(list_name, names, columns))
+            setattr(result, "%s_t" % list_name, series)
+
+
+    return result
+
+
+
+def _read_hdf5(file_input, snapshots):
+    """
+    Parameters
+    ----------
+    file_input : TYPE
+        DESCRIPTION.
+    snapshots : TYPE
+        DESCRIPTION.
+
+    Returns
+    -------
+    result : TYPE
+        DESCRIPTION.
+    """
+
+    with pandas.HDFStore(file_input, mode = "r") as store:
+        keys = store.keys()
+
+
+        # get name and number of snapshots of (PyPSA) network
+        name = store["/network"].index[0] if "/network" in keys else ""
+        result = _Network(name, store.get_storer("/snapshots").nrows if "/snapshots" in keys else 1)
+
+
+        # get static tables and first values of time series of components (e.g. tables "/generators" and "/generators_t/p")
+        for component, list_name in _COMPONENTS:
+            names = []
+            columns = dict()
+            series = dict()
+            if "/%s" % list_name in keys:
+                table = store["/%s" % list_name].set_index("name")
+                names = table.index.tolist()
+                for column in table.columns:
+                    columns[column] = table[column].to_numpy()
+            for key in keys:
+                if key.startswith("/%s_t/" % list_name) and _SERIES_REGEXP.match(key[len(list_name) + 4:]):
+                    attribute = key[len(list_name) + 4:]
+                    table = store.select(key, start = 0, stop = snapshots)   # read only the first snapshots
+                    table.columns = [names[i] for i in table.columns]   # columns are stored as positions in the static table
+                    series[attribute] = _get_series_table(list_name, names, attribute, table)
+            setattr(result, list_name, _get_static_table(list_name, names, columns))
+            setattr(result, "%s_t" % list_name, series)
+
+
+    return result
+
+
+
+def _read_network(file_input, log, log_info, log_warning):
+    """
+    Parameters
+    ----------
+    file_input : TYPE
+        DESCRIPTION.
+    log : TYPE
+        DESCRIPTION.
+    log_info : TYPE
+        DESCRIPTION.
+    log_warning : TYPE
+        DESCRIPTION.
+
+    Returns
+    -------
+    TYPE
+        DESCRIPTION.
+    """
+
+    # read (PyPSA) network directly from file (only the five first values of the time series are needed)
+    extension = os.path.splitext(file_input)[1][1:].lower()
+    if LAZY_READING and extension in ("nc", "h5", "hdf5"):
+        if log or log_info:
+            print("[INF] Reading static tables and time series heads from file '%s' containing PyPSA-based network" % file_input)
+        try:
+            if extension == "nc":
+                return _read_netcdf(file_input, 5)
+            else:
+                return _read_hdf5(file_input, 5)
+        except Exception as exception:   # e.g. module 'netCDF4' (for NetCDF files) or 'tables' (for HDF5 files) not installed, or file not written by PyPSA
+            if log or log_warning:
+                print("[WAR] The file '%s' could not be read directly (%s: %s) and will be read through PyPSA instead" % (file_input, type(exception).__name__, exception))
+
+
+    # read (PyPSA) network through PyPSA
+    if log or log_info:
+        print("[INF] Reading file '%s' containing PyPSA-based network" % file_input)
+    return pypsa.Network(file_input)
+
+
+
+def _get_focus_depths(focus, neighbourhood):
+    """
+    Parameters
+    ----------
+    focus : TYPE
+        DESCRIPTION.
+    neighbourhood : TYPE
+        DESCRIPTION.
+
+    Returns
+    -------
+    result : TYPE
+        DESCRIPTION.
+    """
+
+    result = list()
+
+
+    # pair each bus to focus on with the neighbourhood to visit around it
+    if isinstance(focus, str):
+        if isinstance(neighbourhood, int):
+            result.append((focus, neighbourhood))
+        else:   # list
+            result.append((focus, neighbourhood[0] if len(neighbourhood) else 0))
+    else:   # list
+        for i in range(len(focus)):
+            if isinstance(neighbourhood, int):
+                result.append((focus[i], neighbourhood))
+            else:   # list
+                result.append((focus[i], neighbourhood[i] if i < len(neighbourhood) else 0))
+
+
+    return result
+
+
+
+def _restrict_network(network, focus, neighbourhood, log, log_info, log_warning):
+    """
+    Parameters
+    ----------
+    network : TYPE
+        DESCRIPTION.
+    focus : TYPE
+        DESCRIPTION.
+    neighbourhood : TYPE
+        DESCRIPTION.
+    log : TYPE
+        DESCRIPTION.
+    log_info : TYPE
+        DESCRIPTION.
+    log_warning : TYPE
+        DESCRIPTION.
+
+    Returns
+    -------
+    result : TYPE
+        DESCRIPTION.
+    """
+
+    adjacency = dict()
+    remaining = dict()
+
+
+    # display info message
+    if log or log_info:
+        print("[INF] Restricting network to the buses reachable from the bus(es) to focus on")
+
+
+    # build adjacency of the buses straight from the bus columns of the links (i.e. "bus0" to "busN") and lines
+    links = network.links
+    lines = network.lines
+    declared_buses = [column for column in links.columns if re.match("^bus[0-9]+$", column) and column != "bus0"]
+    for bus0, columns in ((links.bus0.tolist(), [links[column].tolist() for column in declared_buses]), (lines.bus0.tolist(), [lines.bus1.tolist()])):
+        for values in columns:
+            for bus_from, bus_to in zip(bus0, values):
+                if isinstance(bus_from, str) and isinstance(bus_to, str) and bus_from.strip() and bus_to.strip():
+                    adjacency.setdefault(bus_from, []).append(bus_to)
+                    adjacency.setdefault(bus_to, []).append(bus_from)
+
+
+    # visit buses keeping the largest neighbourhood that remains to be visited around each one of them (in decreasing order of remaining neighbourhood, so that each bus is expanded once)
+    depths = _get_focus_depths(focus, neighbourhood)
+    buckets = [[] for _ in range(max(depth for bus, depth in depths) + 1)]
+    for bus, depth in depths:
+        if remaining.get(bus, -1) < depth:
+            remaining[bus] = depth
+            buckets[depth].append(bus)
+    for depth in range(len(buckets) - 1, 0, -1):
+        for bus in buckets[depth]:
+            if remaining[bus] == depth:
+                for bus_to in adjacency.get(bus, ()):
+                    if remaining.get(bus_to, -1) < depth - 1:
+                        remaining[bus_to] = depth - 1
+                        buckets[depth - 1].append(bus_to)
+
+
+    # get buses whose attached components may be visited (i.e. with neighbourhood remaining) and select components attached to them
+    inner = {bus for bus, depth in remaining.items() if depth > 0}
+    selected_links = links.bus0.isin(inner)
+    for column in declared_buses:
+        selected_links |= links[column].isin(inner)
+    selected_lines = lines.bus0.isin(inner) | lines.bus1.isin(inner)
+    buses = set(remaining)
+    for column in ["bus0"] + declared_buses:
+        buses.update(links[column][selected_links].tolist())
+    buses.update(lines.bus0[selected_lines].tolist())
+    buses.update(lines.bus1[selected_lines].tolist())
+
+
+    # create (PyPSA-like) network holding only the selected components and their time series
+    result = _Network(network.name, len(network.snapshots))
+    for component, list_name in _COMPONENTS:
+        table = getattr(network, list_name)
+        if list_name == "buses":
+            table = table[table.index.isin(buses)]
+        elif list_name == "links":
+            table = table[selected_links]
+        elif list_name == "lines":
+            table = table[selected_lines]
+        else:   # one-port components
+            table = table[table.bus.isin(inner)]
+        setattr(result, list_name, table)
+        series = dict()
+        components_t = getattr(network, "%s_t" % list_name, None)
+        if components_t:
+            for attribute in components_t:
+                if _SERIES_REGEXP.match(attribute):
+                    frame = components_t[attribute]
+                    series[attribute] = frame[frame.columns[frame.columns.isin(table.index)]]
+        setattr(result, "%s_t" % list_name, series)
+
+
+    return result
+
+
+
+def _get_components(network, log, log_info, log_warning):
+    """
+    Parameters
+    ----------
+    network : TYPE
+        DESCRIPTION.
+    log : TYPE
+        DESCRIPTION.
+    log_info : TYPE
+        DESCRIPTION.
+    log_warning : TYPE
+        DESCRIPTION.
+
+    Returns
+    result : TYPE
+    -------
+        DESCRIPTION.
+    """
+
+    global _MISSING_BUS_COUNT
+
+
+    result = dict()
+    snapshots = len(network.snapshots)
+
+
+    # get buses from (PyPSA) network
+    if log or log_info:
+        print("[INF] Retrieving buses from network")
+    buses = network.buses
+    buses_t = getattr(network, "buses_t", None)
+    p_time_series_values = _format_series(buses_t, "p", snapshots)
+    locations = buses.location.tolist() if "location" in buses.columns else repeat("")
+    for bus, carrier, unit, location in zip(buses.index, buses.carrier.tolist(), buses.unit.tolist(), locations):
+        unit = "MW" if unit == "None" else unit
+        p_time_series = p_time_series_values.get(bus, "N/A")
+        result[bus] = _Bus(bus, False, carrier, unit, p_time_series, location if isinstance(location, str) else "")
+
+
+    # get generators from (PyPSA) network
+    if log or log_info:
+        print("[INF] Retrieving generators from network")
+    generators = network.generators
+    generators_t = getattr(network, "generators_t", None)
+    p_set_values = _format_series(generators_t, "p_set", snapshots)
+    marginal_cost_values = _format_series(generators_t, "marginal_cost", snapshots)
+    p_time_series_values = _format_series(generators_t, "p", snapshots)
+    for generator, bus, carrier, unit, p_nom_extendable, p_nom, p_set, efficiency, capital_cost, marginal_cost, p_nom_opt in zip(generators.index, generators.bus.tolist(), generators.carrier.tolist(), repeat("MW"), _get_booleans(generators.p_nom_extendable), generators.p_nom.tolist(), generators.p_set.tolist(), generators.efficiency.tolist(), generators.capital_cost.tolist(), generators.marginal_cost.tolist(), generators.p_nom_opt.tolist()):
+        p_set = p_set_values[generator] if generator in p_set_values else "%.2f" % p_set
+        marginal_cost = marginal_cost_values[generator] if generator in marginal_cost_values else "%.2f" % marginal_cost
+        p_time_series = p_time_series_values.get(generator, "N/A")
+        if bus:
+            if bus in result:
+                if result[bus].missing:
+                    if log or log_warning:
+                        print("[WAR] Generator '%s' connects to bus '%s' which does not exist" % (generator, bus))
+            else:
+                if log or log_warning:
+                    print("[WAR] Generator '%s' connects to bus '%s' which does not exist" % (generator, bus))
+                result[bus] = _Bus(bus, True)
+        else:
+            if log or log_warning:
+                print("[WAR] Generator '%s' does not have a bus specified" % generator)
+            bus = "bus #%d" % _MISSING_BUS_COUNT
+            _MISSING_BUS_COUNT += 1
+            result[bus] = _Bus(bus, True)
+        result[bus].generators.append(_Generator(generator, carrier, unit, p_nom_extendable, p_nom, p_set, efficiency, capital_cost, marginal_cost, p_nom_opt, p_time_series))
+
+
+    # get loads from (PyPSA) network
+    if log or log_info:
+        print("[INF] Retrieving loads from network")
+    loads = network.loads
+    loads_t = getattr(network, "loads_t", None)
+    p_set_values = _format_series(loads_t, "p_set", snapshots)
+    for load, bus, carrier, unit, p_set in zip(loads.index, loads.bus.tolist(), loads.carrier.tolist(), repeat("MW"), loads.p_set.tolist()):
+        p_set = p_set_values[load] if load in p_set_values else "%.2f" % p_set
+        if bus:
+            if bus in result:
+                if result[bus].missing:
+                    if log or log_warning:
+                        print("[WAR] Load '%s' connects to bus '%s' which does not exist" % (load, bus))
+            else:
+                if log or log_warning:
+                    print("[WAR] Load '%s' connects to bus '%s' which does not exist" % (load, bus))
+                result[bus] = _Bus(bus, True)
+        else:
+            if log or log_warning:
+                print("[WAR] Load '%s' does not have a bus specified" % load)
+            bus = "bus #%d" % _MISSING_BUS_COUNT
+            _MISSING_BUS_COUNT += 1
+            result[bus] = _Bus(bus, True)
+        result[bus].loads.append(_Load(load, carrier, unit, p_set))
+
+
+    # get stores from (PyPSA) network
+    if log or log_info:
+        print("[INF] Retrieving stores from network")
+    stores = network.stores
+    stores_t = getattr(network, "stores_t", None)
+    p_set_values = _format_series(stores_t, "p_set", snapshots)
+    marginal_cost_values = _format_series(stores_t, "marginal_cost", snapshots)
+    e_time_series_values = _format_series(stores_t, "e", snapshots)
+    p_time_series_values = _format_series(stores_t, "p", snapshots)
+    for store, bus, carrier, unit, e_nom_extendable, e_nom, p_set, e_cyclic, capital_cost, marginal_cost, e_nom_opt in zip(stores.index, stores.bus.tolist(), stores.carrier.tolist(), repeat("MW"), _get_booleans(stores.e_nom_extendable), stores.e_nom.tolist(), stores.p_set.tolist(), _get_booleans(stores.e_cyclic), stores.capital_cost.tolist(), stores.marginal_cost.tolist(), stores.e_nom_opt.tolist()):
+        p_set = p_set_values[store] if store in p_set_values else "%.2f" % p_set
+        marginal_cost = marginal_cost_values[store] if store in marginal_cost_values else "%.2f" % marginal_cost
+        e_time_series = e_time_series_values.get(store, "N/A")
+        p_time_series = p_time_series_values.get(store, "N/A")
+        if bus:
+            if bus in result:
+                if result[bus].missing:
+                    if log or log_warning:
+                        print("[WAR] Store '%s' connects to bus '%s' which does not exist" % (store, bus))
+            else:
+                if log or log_warning:
+                    print("[WAR] Store '%s' connects to bus '%s' which does not exist" % (store, bus))
+                result[bus] = _Bus(bus, True)
+        else:
+            if log or log_warning:
+                print("[WAR] Store '%s' does not have a bus specified" % store)
+            bus = "bus #%d" % _MISSING_BUS_COUNT
+            _MISSING_BUS_COUNT += 1
+            result[bus] = _Bus(bus, True)
+        result[bus].stores.append(_Store(store, carrier, unit, e_nom_extendable, e_nom, p_set, e_cyclic, capital_cost, marginal_cost, e_nom_opt, e_time_series, p_time_series))
+
+
+    # get storage units from (PyPSA) network
+    if log or log_info:
+        print("[INF] Retrieving storage units from network")
+    storage_units = network.storage_units
+    storage_units_t = getattr(network, "storage_units_t", None)
+    p_set_values = _format_series(storage_units_t, "p_set", snapshots)
+    marginal_cost_values = _format_series(storage_units_t, "marginal_cost", snapshots)
+    p_time_series_values = _format_series(storage_units_t, "p", snapshots)
+    for storage_unit, bus, carrier, unit, p_nom_extendable, p_nom, p_set, cyclic_state_charge, capital_cost, marginal_cost, p_nom_opt in zip(storage_units.index, storage_units.bus.tolist(), storage_units.carrier.tolist(), repeat("MW"), _get_booleans(storage_units.p_nom_extendable), storage_units.p_nom.tolist(), storage_units.p_set.tolist(), _get_booleans(storage_units.cyclic_state_of_charge), storage_units.capital_cost.tolist(), storage_units.marginal_cost.tolist(), storage_units.p_nom_opt.tolist()):
+        p_set = p_set_values[storage_unit] if storage_unit in p_set_values else "%.2f" % p_set
+        marginal_cost = marginal_cost_values[storage_unit] if storage_unit in marginal_cost_values else "%.2f" % marginal_cost
+        p_time_series = p_time_series_values.get(storage_unit, "N/A")
+        if bus:
+            if bus in result:
+                if result[bus].missing:
+                    if log or log_warning:
+                        print("[WAR] Storage unit '%s' connects to bus '%s' which does not exist" % (storage_unit, bus))
+            else:
+                if log or log_warning:
+                    print("[WAR] Storage unit '%s' connects to bus '%s' which does not exist" % (storage_unit, bus))
+                result[bus] = _Bus(bus, True)
+        else:
+            if log or log_warning:
+                print("[WAR] Storage unit '%s' does not have a bus specified" % storage_unit)
+            bus = "bus #%d" % _MISSING_BUS_COUNT
+            _MISSING_BUS_COUNT += 1
+            result[bus] = _Bus(bus, True)
+        result[bus].storage_units.append(_StorageUnit(storage_unit, carrier, unit, p_nom_extendable, p_nom, p_set, cyclic_state_charge, capital_cost, marginal_cost, p_nom_opt, p_time_series))
+
+
+    # get declared buses that links connect to
+    if log or log_info:
+        print("[INF] Retrieving links from network")
+    links = network.links
+    links_t = getattr(network, "links_t", None)
+    marginal_cost_values = _format_series(links_t, "marginal_cost", snapshots)
+    px_time_series_values = {"p0": _format_series(links_t, "p0", snapshots), "p1": _format_series(links_t, "p1", snapshots)}
+    bus_regexp = re.compile("^bus[0-9]+$")
+    declared_buses = list()
+    for column in links.columns:
+        if bus_regexp.match(column):
+            declared_buses.append(column)
+
+
+    # get declared efficiencies that links have
+    efficiency_regexp = re.compile("^efficiency[0-9]*$")
+    declared_efficiencies = dict()
+    for column in links.columns:
         if efficiency_regexp.match(column):
             if column == "efficiency":
-                declared_efficiencies.add("0")
+                declared_efficiencies["0"] = links[column].tolist()
+            else:
+                declared_efficiencies[column[10:]] = links[column].tolist()
+
+
+    # get columns of declared buses and efficiencies (one single pass over the links)
+    declared_buses_values = [(bus, bus[3:], links[bus].tolist()) for bus in declared_buses]
+    efficiency_values = declared_efficiencies["0"] if "0" in declared_efficiencies else None
+
+
+    # loop through existing links
+    for i, (link, bus0, bus1, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, p_min_pu) in enumerate(zip(links.index, links.bus0.tolist(), links.bus1.tolist(), links.carrier.tolist(), _get_booleans(links.p_nom_extendable), links.p_nom.tolist(), links.efficiency.tolist(), links.capital_cost.tolist(), links.marginal_cost.tolist(), links.p_nom_opt.tolist(), links.p_min_pu.tolist())):
+
+        # get specified buses (from declared buses) that the link connects to as well as efficiency values
+        specified_buses = dict()
+        for bus, number, values in declared_buses_values:
+            value = values[i]
+            if not pandas.isna(value):
+                if number == "0":
+                    bus_efficiency = 1.0
+                elif number == "1":
+                    if efficiency_values is not None:
+                        bus_efficiency = efficiency_values[i]
+                        if pandas.isna(bus_efficiency):
+                            bus_efficiency = 1.0
+                    else:
+                        bus_efficiency = 1.0
+                elif number in declared_efficiencies:
+                    if value.strip() == "":
+                        continue
+                    bus_efficiency = declared_efficiencies[number][i]
+                    if pandas.isna(bus_efficiency):
+                        bus_efficiency = 1.0
+                else:
+                    bus_efficiency = 1.0
+                specified_buses[bus] = [value, bus_efficiency]
+
+
+        # process link
+        if len(specified_buses) < 3:   # mono-link
+
+            # process mono-link
+            marginal_cost_value = marginal_cost
+            marginal_cost = marginal_cost_values[link] if link in marginal_cost_values else "%.2f" % marginal_cost
+            p0_time_series = px_time_series_values["p0"].get(link, "N/A")
+            p1_time_series = px_time_series_values["p1"].get(link, "N/A")
+            bidirectional = (efficiency == 1 and marginal_cost_value == 0 and p_min_pu == -1)
+            if bus0:
+                if bus0 in result:
+                    if result[bus0].missing:
+                        if log or log_warning:
+                            print("[WAR] Link '%s' connects to bus '%s' (bus0) which does not exist" % (link, bus0))
+                    missing0 = result[bus0].missing
+                else:
+                    if log or log_warning:
+                        print("[WAR] Link '%s' connects to bus '%s' (bus0) which does not exist" % (link, bus0))
+                    result[bus0] = _Bus(bus0, True)
+                    missing0 = True
+            else:
+                if log or log_warning:
+                    print("[WAR] Link '%s' does not have bus0 specified" % link)
+                bus0 = "bus #%d" % _MISSING_BUS_COUNT
+                _MISSING_BUS_COUNT += 1
+                result[bus0] = _Bus(bus0, True)
+                missing0 = True
+            if bus1:
+                if bus1 in result:
+                    if result[bus1].missing:
+                        if log or log_warning:
+                            print("[WAR] Link '%s' connects to bus '%s' (bus1) which does not exist" % (link, bus1))
+                    missing1 = result[bus1].missing
+                else:
+                    if log or log_warning:
+                        print("[WAR] Link '%s' connects to bus '%s' (bus1) which does not exist" % (link, bus1))
+                    result[bus1] = _Bus(bus1, True)
+                    missing1 = True
+            else:
+                if log or log_warning:
+                    print("[WAR] Link '%s' does not have bus1 specified" % link)
+                bus1 = "bus #%d" % _MISSING_BUS_COUNT
+                _MISSING_BUS_COUNT += 1
+                result[bus1] = _Bus(bus1, True)
+                missing1 = True
+            result[bus0].links.append(_Link(link, bus1, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, p1_time_series, bidirectional, True, missing0 or missing1))
+            result[bus1].links.append(_Link(link, bus0, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, p1_time_series, bidirectional, False, missing0 or missing1))
+
+        else:   # multi-link
+
+            # check that buses that the link connects to exist
+            missing = 0
+            for key, value in specified_buses.items():
+                bus_value, bus_efficiency = value
+                if bus_value:
+                    if bus_value in result:
+                        if result[bus_value].missing:
+                            if log or log_warning:
+                                print("[WAR] Link '%s' connects to bus '%s' (%s) which does not exist" % (link, bus_value, key))
+                            if key != "bus0":
+                                missing += 1
+                    else:
+                        if log or log_warning:
+                            print("[WAR] Link '%s' connects to bus '%s' (%s) which does not exist" % (link, bus_value, key))
+                        result[bus_value] = _Bus(bus_value, True)
+                        if key != "bus0":
+                            missing += 1
+                else:
+                    if log or log_warning:
+                        print("[WAR] Link '%s' does not have %s specified" % (link, key))
+                    bus_value = "bus #%d" % _MISSING_BUS_COUNT
+                    _MISSING_BUS_COUNT += 1
+                    result[bus_value] = _Bus(bus_value, True)
+                    value[0] = bus_value
+                    if key != "bus0":
+                        missing += 1
+
+
+            # process multi-link
+            marginal_cost = marginal_cost_values[link] if link in marginal_cost_values else "%.2f" % marginal_cost
+            p0_time_series = px_time_series_values["p0"].get(link, "N/A")
+            bus0_value, bus0_efficiency = specified_buses["bus0"]
+            index = len(result[bus0_value].multi_link_trunks)
+            bus_to = []
+            bus_to_efficiencies = []
+            for key, value in specified_buses.items():
+                bus_value, bus_efficiency = value
+                if key != "bus0":
+                    bus_to.append("To: %s (%s)" % (bus_value, key))
+                    bus_to_efficiencies.append("Efficiency: %.2f (%s)" % (bus_efficiency, key))
+                    px = "p%s" % key[3:]
+                    if px not in px_time_series_values:
+                        px_time_series_values[px] = _format_series(links_t, px, snapshots)
+                    px_time_series = px_time_series_values[px].get(link, "N/A")
+                    result[bus0_value].multi_link_branches.append(_MultiLinkBranch(link, bus_value, key, carrier, p_nom_extendable, p_nom, bus_efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, px, px_time_series, index, True))
+                    result[bus_value].multi_link_branches.append(_MultiLinkBranch(link, bus0_value, key, carrier, p_nom_extendable, p_nom, bus_efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, px, px_time_series, index, False))
+            result[bus0_value].multi_link_trunks.append(_MultiLinkTrunk(link, bus_to, bus_to_efficiencies, carrier, p_nom_extendable, p_nom, capital_cost, marginal_cost, p_nom_opt, p0_time_series, len(specified_buses) - 1, missing))
+
+
+    # get lines from (PyPSA) network
+    if log or log_info:
+        print("[INF] Retrieving lines from network")
+    lines = network.lines
+    lines_t = getattr(network, "lines_t", None)
+    p0_time_series_values = _format_series(lines_t, "p0", snapshots)
+    p1_time_series_values = _format_series(lines_t, "p1", snapshots)
+    for line, bus0, bus1, carrier, s_nom_extendable, s_nom, capital_cost, s_nom_opt in zip(lines.index, lines.bus0.tolist(), lines.bus1.tolist(), lines.carrier.tolist(), _get_booleans(lines.s_nom_extendable), lines.s_nom.tolist(), lines.capital_cost.tolist(), lines.s_nom_opt.tolist()):
+        p0_time_series = p0_time_series_values.get(line, "N/A")
+        p1_time_series = p1_time_series_values.get(line, "N/A")
+        if bus0:
+            if bus0 in result:
+                if result[bus0].missing:
+                    if log or log_warning:
+                        print("[WAR] Line '%s' connects to bus '%s' (bus0) which does not exist" % (line, bus0))
+                missing0 = result[bus0].missing
+            else:
+                if log or log_warning:
+                    print("[WAR] Line '%s' connects to bus '%s' (bus0) which does not exist" % (line, bus0))
+                result[bus0] = _Bus(bus0, True)
+                missing0 = True
+        else:
+            if log or log_warning:
+                print("[WAR] Line '%s' does not have bus0 specified" % line)
+            bus0 = "bus #%d" % _MISSING_BUS_COUNT
+            _MISSING_BUS_COUNT += 1
+            result[bus0] = _Bus(bus0, True)
+            missing0 = True
+        if bus1:
+            if bus1 in result:
+                if result[bus1].missing:
+                    if log or log_warning:
+                        print("[WAR] Line '%s' connects to bus '%s' (bus1) which does not exist" % (line, bus1))
+                missing1 = result[bus1].missing
+            else:
+                if log or log_warning:
+                    print("[WAR] Line '%s' connects to bus '%s' (bus1) which does not exist" % (line, bus1))
+                result[bus1] = _Bus(bus1, True)
+                missing1 = True
+        else:
+            if log or log_warning:
+                print("[WAR] Line '%s' does not have bus1 specified" % line)
+            bus1 = "bus #%d" % _MISSING_BUS_COUNT
+            _MISSING_BUS_COUNT += 1
+            result[bus1] = _Bus(bus1, True)
+            missing1 = True
+        result[bus0].lines.append(_Line(line, bus1, carrier, s_nom_extendable, s_nom, capital_cost, s_nom_opt, p0_time_series, p1_time_series, True, missing0 or missing1))
+        result[bus1].lines.append(_Line(line, bus0, carrier, s_nom_extendable, s_nom, capital_cost, s_nom_opt, p0_time_series, p1_time_series, False, missing0 or missing1))
+
+
+    return result
+
+
+
+def _process_components(buses, bus_filter, generator_filter, load_filter, store_filter, storage_unit_filter, link_filter, line_filter, carrier_filter, negative_efficiency, broken_missing, carrier_color, context):
+    """
+    Parameters
+    ----------
+    buses : TYPE
+        DESCRIPTION.
+    bus_filter : TYPE
+        DESCRIPTION.
+    generator_filter : TYPE
+        DESCRIPTION.
+    load_filter : TYPE
+        DESCRIPTION.
+    store_filter : TYPE
+        DESCRIPTION.
+    storage_unit_filter : TYPE
+        DESCRIPTION.
+    link_filter : TYPE
+        DESCRIPTION.
+    line_filter : TYPE
+        DESCRIPTION.
+    carrier_filter : TYPE
+        DESCRIPTION.
+    negative_efficiency : TYPE
+        DESCRIPTION.
+    broken_missing : TYPE
+        DESCRIPTION.
+    carrier_color : TYPE
+        DESCRIPTION.
+    context : TYPE
+        DESCRIPTION.
+
+    Returns
+    -------
+    carriers : TYPE
+        DESCRIPTION.
+    """
+
+    carriers = dict()
+    bus_to = ""   # bus (at the other end) of the last link processed, which lines are (also) matched against
+
+
+    # loop through existing buses
+    for bus, values0 in buses.items():
+
+        # process bus
+        if (not values0.missing or broken_missing) and (not bus_filter or bus_filter.match(bus)) and (not carrier_filter or carrier_filter.match(values0.carrier)):
+            if carrier_color:
+                carrier = values0.carrier
+                if carrier and carrier not in carriers:
+                    carriers[carrier] = None
+            values0.selected = True
+
+
+        # process generators (attached to the bus)
+        generators = values0.generators
+        for values1 in generators:
+            if values0.selected and (not generator_filter or generator_filter.match(values1.name)) and (not carrier_filter or carrier_filter.match(values1.carrier)):
+                if carrier_color:
+                    if values1.carrier and values1.carrier not in carriers:
+                        carriers[values1.carrier] = None
+                values1.selected = True
+
+
+        # process loads (attached to the bus)
+        loads = values0.loads
+        for values1 in loads:
+            if values0.selected and (not load_filter or load_filter.match(values1.name)) and (not carrier_filter or carrier_filter.match(values1.carrier)):
+                if carrier_color:
+                    if values1.carrier and values1.carrier not in carriers:
+                        carriers[values1.carrier] = None
+                values1.selected = True
+
+
+        # process stores (attached to the bus)
+        stores = values0.stores
+        for values1 in stores:
+            if values0.selected and (not store_filter or store_filter.match(values1.name)) and (not carrier_filter or carrier_filter.match(values1.carrier)):
+                if carrier_color:
+                    if values1.carrier and values1.carrier not in carriers:
+                        carriers[values1.carrier] = None
+                values1.selected = True
+
+
+        # process storage units (attached to the bus)
+        storage_units = values0.storage_units
+        for values1 in storage_units:
+            if values0.selected and (not storage_unit_filter or storage_unit_filter.match(values1.name)) and (not carrier_filter or carrier_filter.match(values1.carrier)):
+                if carrier_color:
+                    if values1.carrier and values1.carrier not in carriers:
+                        carriers[values1.carrier] = None
+                values1.selected = True
+
+
+        # process links (attached to the bus)
+        links = values0.links
+        for values1 in links:
+            if values1.duplicated:   # the link is processed (and represented) from bus0 only
+                continue
+            bus_to = values1.bus_to
+            if not values1.missing or broken_missing:
+                if values0.selected and (not bus_filter or bus_filter.match(values1.bus_to)) and (not link_filter or link_filter.match(values1.name)) and (not carrier_filter or carrier_filter.match(values1.carrier)):
+                    values1.selected = True
+
+
+        # process multi-link trunks (attached to the bus)
+        multi_link_trunks = values0.multi_link_trunks
+        multi_link_branches = values0.multi_link_branches
+        branches = None   # index of the multi-link branches (attached to the bus) by name, only built when a trunk needs to look up its branches
+        for values1 in multi_link_trunks:
+            bus_to = values1.bus_to
+            not_missing = values1.count - values1.missing
+            if not_missing or broken_missing:
+                if values0.selected and (not link_filter or link_filter.match(values1.name)) and (not carrier_filter or carrier_filter.match(values1.carrier)):
+                    if bus_filter:
+                        if branches is None:
+                            branches = dict()
+                            for values2 in multi_link_branches:
+                                branches.setdefault(values2.name, []).append(values2)
+                        for values2 in branches.get(values1.name, ()):
+                            bus_to = values2.bus_to
+                            if not values0.missing and not buses[values2.bus_to].missing or broken_missing:
+                                if bus_filter.match(values2.bus_to):
+                                    values1.selected = True
+                                    break
+                    else:
+                        values1.selected = True
+
+
+        # process multi-link branches (attached to the bus)
+        for values1 in multi_link_branches:
+            if values1.duplicated:   # the multi-link branch is processed (and represented) from bus0 only
+                continue
+            bus_to = values1.bus_to
+            if not values0.missing and not buses[values1.bus_to].missing or broken_missing:
+                if values0.selected and (not bus_filter or bus_filter.match(values1.bus_to)) and (not link_filter or link_filter.match(values1.name)) and (not carrier_filter or carrier_filter.match(values1.carrier)):
+                    values1.selected = True
+
+
+        # process lines (attached to the bus)
+        lines = values0.lines
+        for values1 in lines:
+            if values1.duplicated:   # the line is processed (and represented) from bus0 only
+                continue
+            if not values1.missing or broken_missing:
+                if values0.selected and (not bus_filter or bus_filter.match(bus_to)) and (not line_filter or line_filter.match(values1.name)) and (not carrier_filter or carrier_filter.match(values1.carrier)):
+                    if carrier_color:
+                        if values1.carrier and values1.carrier not in carriers:
+                            carriers[values1.carrier] = None
+                    values1.selected = True
+
+
+    return carriers
+
+
+
+def _aggregate_buses(components, aggregate_buses):
+    """
+    Parameters
+    ----------
+    components : TYPE
+        DESCRIPTION.
+    aggregate_buses : TYPE
+        DESCRIPTION.
+
+    Returns
+    -------
+    TYPE
+        DESCRIPTION.
+    """
+
+    result = dict()
+    groups = dict()
+    external = set()
+    indices = dict()
+    links = dict()
+    lines = dict()
+
+
+    # get group of each bus, i.e. the match of the regular expression (or of its first group, if any) or the location of the bus (buses that do not belong to any group, as well as missing buses, are kept as they are)
+    regexp = re.compile(aggregate_buses) if isinstance(aggregate_buses, str) else None
+    for bus, values0 in components.items():
+        group = None
+        if not values0.missing:
+            if regexp:
+                match = regexp.match(bus)
+                if match:
+                    group = match.group(1) if regexp.groups else match.group()
+            else:
+                group = values0.location
+        groups[bus] = group if group else bus
+
+
+    # merge buses into their groups (keeping the carrier and unit of the buses only when these are the same for all of them) and attach their one-port components to the groups
+    for bus, values0 in components.items():
+        group = groups[bus]
+        values1 = result.get(group)
+        if values1 is None:
+            values1 = _Bus(group, values0.missing, values0.carrier, values0.unit, values0.p_time_series, values0.location)
+            result[group] = values1
+        else:
+            values1.missing = values1.missing and values0.missing
+            values1.p_time_series = "N/A"   # the power time series of several buses cannot be shown as one
+            if values1.carrier != values0.carrier:
+                values1.carrier = ""
+            if values1.unit != values0.unit:
+                values1.unit = ""
+        values1.generators.extend(values0.generators)
+        values1.loads.extend(values0.loads)
+        values1.stores.extend(values0.stores)
+        values1.storage_units.extend(values0.storage_units)
+
+
+    # get links and lines connecting different groups (from their forward records), indexed by the groups they connect and by their carrier (as well as by their sense and state, as these determine how they are represented), dropping those connecting buses of the same group as they would loop on the group
+    for bus, values0 in components.items():
+        group = groups[bus]
+        for values1 in values0.links:
+            if values1.direction:
+                bus_to = groups[values1.bus_to]
+                if bus_to != group:
+                    links.setdefault((group, bus_to, values1.carrier, values1.bidirectional, values1.efficiency < 0, values1.missing), []).append(values1)
+        for values1 in values0.multi_link_branches:
+            if values1.direction and groups[values1.bus_to] != group:
+                external.add(values1.name)   # multi-links connecting buses of one group only are dropped as well
+        for values1 in values0.lines:
+            if values1.direction:
+                bus_to = groups[values1.bus_to]
+                if bus_to != group:
+                    lines.setdefault((group, bus_to, values1.carrier, values1.missing), []).append(values1)
+
+
+    # attach links to the groups they connect, merging those connecting the same groups into one link (whose nominal powers are the sum of those of the merged links) so that the number of links represented is bounded by the number of groups
+    for key, values0 in links.items():
+        group, bus_to, carrier, bidirectional, inverted, missing = key
+        if len(values0) == 1:
+            values1 = copy.copy(values0[0])
+            values1.bus_to = bus_to
+        else:
+            values1 = _Link("%s (and %d more)" % (values0[0].name, len(values0) - 1), bus_to, carrier, "True" if any(values2.p_nom_extendable == "True" for values2 in values0) else "False", sum(values2.p_nom for values2 in values0), sum(values2.efficiency for values2 in values0) / len(values0), sum(values2.capital_cost for values2 in values0) / len(values0), "N/A", sum(values2.p_nom_opt for values2 in values0), "N/A", "N/A", bidirectional, True, missing)
+        result[group].links.append(values1)
+        values1 = copy.copy(values1)
+        values1.bus_to = group
+        values1.direction = False
+        result[bus_to].links.append(values1)
+
+
+    # attach multi-link trunks and branches to the groups of their buses (the index of a multi-link branch referring to the multi-link trunk in the group of bus0)
+    for bus, values0 in components.items():
+        values1 = result[groups[bus]]
+        for index, values2 in enumerate(values0.multi_link_trunks):
+            if values2.name in external:
+                indices[(bus, index)] = len(values1.multi_link_trunks)
+                values1.multi_link_trunks.append(values2)
+    for bus, values0 in components.items():
+        values1 = result[groups[bus]]
+        for values2 in values0.multi_link_branches:
+            if values2.name in external:
+                values3 = copy.copy(values2)
+                values3.bus_to = groups[values2.bus_to]
+                values3.index = indices[(bus if values2.direction else values2.bus_to, values2.index)]
+                values1.multi_link_branches.append(values3)
+
+
+    # attach lines to the groups they connect, merging those connecting the same groups into one line (whose nominal powers are the sum of those of the merged lines)
+    for key, values0 in lines.items():
+        group, bus_to, carrier, missing = key
+        if len(values0) == 1:
+            values1 = copy.copy(values0[0])
+            values1.bus_to = bus_to
+        else:
+            values1 = _Line("%s (and %d more)" % (values0[0].name, len(values0) - 1), bus_to, carrier, "True" if any(values2.s_nom_extendable == "True" for values2 in values0) else "False", sum(values2.s_nom for values2 in values0), sum(values2.capital_cost for values2 in values0) / len(values0), sum(values2.s_nom_opt for values2 in values0), "N/A", "N/A", True, missing)
+        result[group].lines.append(values1)
+        values1 = copy.copy(values1)
+        values1.bus_to = group
+        values1.direction = False
+        result[bus_to].lines.append(values1)
+
+
+    return result, groups
+
+
+
+def _get_counters(buses):
+    """
+    Parameters
+    ----------
+    buses : TYPE
+        DESCRIPTION.
+
+    Returns
+    -------
+    TYPE
+        DESCRIPTION.
+    """
+
+    ids = dict()
+    one_ports = ([], [], [], [])
+    one_port_ids = ([], [], [], [])
+    records = list()
+    sources = list()
+    targets = list()
+    kinds = list()
+    missing = list()
+    bidirectional = list()
+    negative = list()
+
+
+    # assign an integer identifier to each bus
+    for bus in buses:
+        ids[bus] = len(ids)
+    size = len(ids)
+
+
+    # flatten the static tables of the components into arrays holding the identifier of the bus(es) each component is attached to (links, multi-link branches and lines through their forward records only, i.e. from bus0)
+    for index, values0 in enumerate(buses.values()):
+        for values1, values2, values3 in zip(one_ports, one_port_ids, (values0.generators, values0.loads, values0.stores, values0.storage_units)):
+            values1.extend(values3)
+            values2.extend(repeat(index, len(values3)))
+        for values1 in chain(values0.links, values0.multi_link_branches, values0.lines):
+            if not values1.direction:
+                continue
+            records.append(values1)
+            sources.append(index)
+            targets.append(ids[values1.bus_to])
+            if isinstance(values1, _Link):
+                kinds.append(_LINK_EDGE)
+                missing.append(values1.missing)
+                bidirectional.append(values1.bidirectional)
+                negative.append(not values1.efficiency >= 0)
+            elif isinstance(values1, _MultiLinkBranch):
+                kinds.append(_MULTI_LINK_BRANCH_EDGE)
+                missing.append(values0.missing or buses[values1.bus_to].missing)
+                bidirectional.append(False)
+                negative.append(not values1.efficiency >= 0)
+            else:   # _Line
+                kinds.append(_LINE_EDGE)
+                missing.append(values1.missing)
+                bidirectional.append(False)
+                negative.append(False)
+    one_port_ids = tuple(numpy.array(values0, dtype = numpy.intp) for values0 in one_port_ids)
+    sources = numpy.array(sources, dtype = numpy.intp)
+    targets = numpy.array(targets, dtype = numpy.intp)
+
+
+    # get offsets of the components attached to each bus (so that only the components attached to some buses can be counted, as the components are flattened in the order of the buses), links, multi-link branches and lines being also ordered by the bus they point to
+    one_port_offsets = tuple(numpy.concatenate(([0], numpy.cumsum(numpy.bincount(values0, minlength = size)))) for values0 in one_port_ids)
+    source_offsets = numpy.concatenate(([0], numpy.cumsum(numpy.bincount(sources, minlength = size))))
+    target_order = numpy.argsort(targets, kind = "stable")
+    target_offsets = numpy.concatenate(([0], numpy.cumsum(numpy.bincount(targets, minlength = size))))
+
+
+    return list(ids), one_ports, one_port_ids, one_port_offsets, records, sources, targets, source_offsets, target_order, target_offsets, numpy.array(kinds), numpy.array(missing, dtype = bool), numpy.array(bidirectional, dtype = bool), numpy.array(negative, dtype = bool)
+
+
+
+def _get_positions(offsets, indices):
+    """
+    Parameters
+    ----------
+    offsets : TYPE
+        DESCRIPTION.
+    indices : TYPE
+        DESCRIPTION.
+
+    Returns
+    -------
+    TYPE
+        DESCRIPTION.
+    """
+
+    # get positions of the items (in flattened arrays) belonging to the given indices, i.e. the concatenation of the ranges offsets[index]:offsets[index + 1]
+    starts = offsets[indices]
+    lengths = offsets[indices + 1] - starts
+    return numpy.arange(lengths.sum()) + numpy.repeat(starts - numpy.cumsum(lengths) + lengths, lengths)
+
+
+
+def _count_per_bus(counters, negative_efficiency, broken_missing, selected, buses = None):
+    """
+    Parameters
+    ----------
+    counters : TYPE
+        DESCRIPTION.
+    negative_efficiency : TYPE
+        DESCRIPTION.
+    broken_missing : TYPE
+        DESCRIPTION.
+    selected : TYPE
+        DESCRIPTION.
+    buses : TYPE, optional
+        DESCRIPTION. The default is None.
+
+    Returns
+    -------
+    TYPE
+        DESCRIPTION.
+    """
+
+    names, one_ports, one_port_ids, one_port_offsets, records, sources, targets, source_offsets, target_order, target_offsets, kinds, missing, bidirectional, negative = counters
+    size = len(names)
+    result = list()
+
+
+    # get positions of the components to count in case only those attached to some buses are (e.g. the buses visited when focusing)
+    if buses is not None:
+        buses = numpy.fromiter(buses, dtype = numpy.intp)
+        buses.sort()
+        one_port_positions = tuple(_get_positions(values0, buses) for values0 in one_port_offsets)
+        positions = numpy.union1d(_get_positions(source_offsets, buses), target_order[_get_positions(target_offsets, buses)])
+    else:
+        one_port_positions = (None, None, None, None)
+        positions = None
+
+
+    # count generators, loads, stores and storage units attached to each bus (either all of them or the selected ones only)
+    for values0, values1, values2 in zip(one_ports, one_port_ids, one_port_positions):
+        if values2 is not None:
+            values1 = values1[values2]
+            values0 = [values0[index] for index in values2.tolist()]
+        if selected:
+            values1 = values1[numpy.fromiter((values3.selected for values3 in values0), dtype = bool, count = len(values0))]
+        result.append(numpy.bincount(values1, minlength = size))
+
+
+    # get links, multi-link branches and lines to count (either all of those not broken/missing or the selected ones only)
+    if positions is not None:
+        sources = sources[positions]
+        targets = targets[positions]
+        kinds = kinds[positions]
+        missing = missing[positions]
+        bidirectional = bidirectional[positions]
+        negative = negative[positions]
+        records = [records[index] for index in positions.tolist()]
+    if broken_missing:
+        mask = numpy.ones(len(records), dtype = bool)
+    else:
+        mask = ~missing
+    if selected:
+        mask &= numpy.fromiter((values1.selected for values1 in records), dtype = bool, count = len(records))
+
+
+    # count incoming and outgoing links attached to each bus (a bidirectional link counts as both, and a link with a negative efficiency is reversed unless negative efficiencies are represented as they are)
+    both = mask & (kinds != _LINE_EDGE) & bidirectional
+    forward = mask & (kinds != _LINE_EDGE) & ~bidirectional
+    if negative_efficiency:
+        backward = numpy.zeros(len(records), dtype = bool)
+    else:
+        backward = forward & negative
+        forward &= ~negative
+    result.append(numpy.bincount(targets[forward], minlength = size) + numpy.bincount(sources[backward], minlength = size) + numpy.bincount(sources[both], minlength = size) + numpy.bincount(targets[both], minlength = size))
+    result.append(numpy.bincount(sources[forward], minlength = size) + numpy.bincount(targets[backward], minlength = size) + numpy.bincount(sources[both], minlength = size) + numpy.bincount(targets[both], minlength = size))
+
+
+    # count lines attached to each bus
+    lines = mask & (kinds == _LINE_EDGE)
+    result.append(numpy.bincount(sources[lines], minlength = size) + numpy.bincount(targets[lines], minlength = size))
+
+
+    # map each bus (or only the given buses) to its counts
+    if buses is not None:
+        return dict(zip((names[index] for index in buses.tolist()), zip(*(values0[buses].tolist() for values0 in result))))
+    return dict(zip(names, zip(*(values0.tolist() for values0 in result))))
+
+
+
+def _count_components(buses, broken_missing, context):
+    """
+    Parameters
+    ----------
+    buses : TYPE
+        DESCRIPTION.
+    broken_missing : TYPE
+        DESCRIPTION.
+    context : TYPE
+        DESCRIPTION.
+
+    Returns
+    -------
+    TYPE
+        DESCRIPTION.
+    """
+
+    buses_count = 0
+    generators_count = 0
+    loads_count = 0
+    stores_count = 0
+    storage_units_count = 0
+    links_count = 0
+    multi_link_trunks_count = 0
+    multi_link_branches_count = 0
+    lines_count = 0
+
+
+    # count components that will be represented in DOT (i.e. following the same conditions as function "_represent_components" without building the representations themselves)
+    for bus, values in buses.items():
+
+        # count bus
+        faded = context and (not values.missing or broken_missing)
+        if values.selected or faded:
+            buses_count += 1
+
+
+        # count generators, loads, stores and storage units (attached to the bus)
+        for values1 in values.generators:
+            if values1.selected or faded:
+                generators_count += 1
+        for values1 in values.loads:
+            if values1.selected or faded:
+                loads_count += 1
+        for values1 in values.stores:
+            if values1.selected or faded:
+                stores_count += 1
+        for values1 in values.storage_units:
+            if values1.selected or faded:
+                storage_units_count += 1
+
+
+        # count links (attached to the bus)
+        for values1 in values.links:
+            if not values1.duplicated and (values1.selected or context) and (not values1.missing or broken_missing):
+                links_count += 1
+
+
+        # count multi-link trunks (attached to the bus)
+        for values1 in values.multi_link_trunks:
+            if (values1.selected or context) and (values1.count > values1.missing or broken_missing):
+                multi_link_trunks_count += 1
+
+
+        # count multi-link branches (attached to the bus)
+        for values1 in values.multi_link_branches:
+            if not values1.duplicated and (values1.selected or context) and (not (values.missing or buses[values1.bus_to].missing) or broken_missing):
+                multi_link_branches_count += 1
+
+
+        # count lines (attached to the bus)
+        for values1 in values.lines:
+            if not values1.duplicated and (values1.selected or context) and (not values1.missing or broken_missing):
+                lines_count += 1
+
+
+    return buses_count, generators_count, loads_count, stores_count, storage_units_count, links_count, multi_link_trunks_count, multi_link_branches_count, lines_count
+
+
+
+def _group_one_ports(one_ports, context):
+    """
+    Parameters
+    ----------
+    one_ports : TYPE
+        DESCRIPTION.
+    context : TYPE
+        DESCRIPTION.
+
+    Returns
+    -------
+    TYPE
+        DESCRIPTION.
+    """
+
+    result = dict()
+    faded = dict()
+
+
+    # group one-port components by carrier (a group holds the selected components of its carrier or, when none is selected and in context mode, all the excluded ones, in which case the group is faded)
+    for values in one_ports:
+        if values.selected:
+            result.setdefault(values.carrier, []).append(values)
+        elif context:
+            faded.setdefault(values.carrier, []).append(values)
+    for carrier, values in faded.items():
+        if carrier not in result:
+            result[carrier] = values
+
+
+    return result
+
+
+
+def _represent_components(buses, carriers, counts, counters, negative_efficiency, broken_missing, carrier_color, context, aggregate_one_ports, log, log_info, log_warning):
+    """
+    Parameters
+    ----------
+    buses : TYPE
+        DESCRIPTION.
+    carriers : TYPE
+        DESCRIPTION.
+    counts : TYPE
+        DESCRIPTION.
+    counters : TYPE
+        DESCRIPTION.
+    negative_efficiency : TYPE
+        DESCRIPTION.
+    broken_missing : TYPE
+        DESCRIPTION.
+    carrier_color : TYPE
+        DESCRIPTION.
+    context : TYPE
+        DESCRIPTION.
+    aggregate_one_ports : TYPE
+        DESCRIPTION.
+    log : TYPE
+        DESCRIPTION.
+    log_info : TYPE
+        DESCRIPTION.
+    log_warning : TYPE
+        DESCRIPTION.
+
+    Yields
+    ------
+    TYPE
+        DESCRIPTION.
+    """
+
+    # add carrier color table
+    if carrier_color:
+        if isinstance(carrier_color, bool) and carrier_color:
+            hue = 1.0 / (len(carriers) + 1)
+            i = 0
+            for key in carriers.keys():
+                red, green, blue = colorsys.hsv_to_rgb(hue * i, 1.0, 1.0)
+                carriers[key] = "#%02x%02x%02x" % (int(255 * red), int(255 * green), int(255 * blue))
+                i += 1
+        else:   # dictionary
+            carriers = carrier_color
+        yield "   // carrier color table"
+        yield "   \"Carrier Color Table\" [shape = \"none\" label = <"
+        yield "      <table border = \"0\" cellborder = \"1\" cellspacing = \"0\" cellpadding = \"5\">"
+        yield "         <tr>"
+        yield "            <td width = \"110\" bgcolor = \"grey90\"><font color = \"black\"><b>CARRIER</b></font></td><td width = \"130\" bgcolor = \"grey92\"><font color = \"black\"><b>COLOR</b></font></td>"
+        yield "         </tr>"
+        for key, value in carriers.items():
+            yield "         <tr>"
+            yield "            <td width = \"110\">%s</td><td width = \"130\" bgcolor = \"%s\"></td>" % (_replace(key), _quote(value))
+            yield "         </tr>"
+        yield "      </table>"
+        yield "   >];"
+        yield ""
+
+
+    # get component DOT representations, binding the parts that stay the same for the whole rendering (i.e. text colors, widths, thicknesses, arrow shapes and sizes) once so that only the parts that vary are formatted for each component (the normal and faded variants of each representation only differ in their text color)
+    bus_representation, faded_bus_representation = _bind_representation("BUS", 1, {-3: BUS_MINIMUM_WIDTH, -2: BUS_THICKNESS})
+    missing_bus_representation, faded_missing_bus_representation = _bind_representation("MISSING_BUS", 1, {-3: BUS_MINIMUM_WIDTH, -2: BUS_THICKNESS})
+    generator_representation, faded_generator_representation = _bind_representation("GENERATOR", 1, {-7: GENERATOR_MINIMUM_WIDTH, -6: GENERATOR_THICKNESS, -2: LINK_THICKNESS})
+    load_representation, faded_load_representation = _bind_representation("LOAD", 1, {-8: LOAD_MINIMUM_WIDTH, -7: LOAD_MINIMUM_HEIGHT, -6: LOAD_THICKNESS, -2: LINK_THICKNESS})
+    store_representation, faded_store_representation = _bind_representation("STORE", 1, {-7: STORE_MINIMUM_WIDTH, -6: STORE_THICKNESS, -2: LINK_THICKNESS})
+    storage_unit_representation, faded_storage_unit_representation = _bind_representation("STORAGE_UNIT", 1, {-7: STORAGE_UNIT_MINIMUM_WIDTH, -6: STORAGE_UNIT_THICKNESS, -2: LINK_THICKNESS})
+    generator_group_representation, faded_generator_group_representation = _bind_representation("GENERATOR_GROUP", 2, {-8: GENERATOR_MINIMUM_WIDTH, -7: GENERATOR_THICKNESS, -2: LINK_THICKNESS})
+    load_group_representation, faded_load_group_representation = _bind_representation("LOAD_GROUP", 2, {-9: LOAD_MINIMUM_WIDTH, -8: LOAD_MINIMUM_HEIGHT, -7: LOAD_THICKNESS, -2: LINK_THICKNESS})
+    store_group_representation, faded_store_group_representation = _bind_representation("STORE_GROUP", 2, {-8: STORE_MINIMUM_WIDTH, -7: STORE_THICKNESS, -2: LINK_THICKNESS})
+    storage_unit_group_representation, faded_storage_unit_group_representation = _bind_representation("STORAGE_UNIT_GROUP", 2, {-8: STORAGE_UNIT_MINIMUM_WIDTH, -7: STORAGE_UNIT_THICKNESS, -2: LINK_THICKNESS})
+    link_representation, faded_link_representation = _bind_representation("LINK", 2, {-4: LINK_THICKNESS, -2: LINK_ARROW_SHAPE, -1: LINK_ARROW_SIZE})
+    broken_link_representation, faded_broken_link_representation = _bind_representation("BROKEN_LINK", 2, {-4: LINK_THICKNESS, -2: LINK_ARROW_SHAPE, -1: LINK_ARROW_SIZE})
+    bidirectional_link_representation, faded_bidirectional_link_representation = _bind_representation("BIDIRECTIONAL_LINK", 2, {-5: LINK_THICKNESS, -3: LINK_ARROW_SHAPE, -2: LINK_ARROW_SHAPE, -1: LINK_ARROW_SIZE})
+    broken_bidirectional_link_representation, faded_broken_bidirectional_link_representation = _bind_representation("BROKEN_BIDIRECTIONAL_LINK", 2, {-5: LINK_THICKNESS, -3: LINK_ARROW_SHAPE, -2: LINK_ARROW_SHAPE, -1: LINK_ARROW_SIZE})
+    multi_link_point_representation, faded_multi_link_point_representation = _bind_representation("MULTI_LINK_POINT", 1, {-2: MULTI_LINK_POINT_WIDTH})
+    multi_link_trunk_representation, faded_multi_link_trunk_representation = _bind_representation("MULTI_LINK_TRUNK", 2, {-2: LINK_THICKNESS})
+    broken_multi_link_trunk_representation, faded_broken_multi_link_trunk_representation = _bind_representation("BROKEN_MULTI_LINK_TRUNK", 2, {-2: LINK_THICKNESS})
+    multi_link_branch_representation, faded_multi_link_branch_representation = _bind_representation("MULTI_LINK_BRANCH", 2, {-4: LINK_THICKNESS, -2: LINK_ARROW_SHAPE, -1: LINK_ARROW_SIZE})
+    broken_multi_link_branch_representation, faded_broken_multi_link_branch_representation = _bind_representation("BROKEN_MULTI_LINK_BRANCH", 2, {-4: LINK_THICKNESS, -2: LINK_ARROW_SHAPE, -1: LINK_ARROW_SIZE})
+    line_representation, faded_line_representation = _bind_representation("LINE", 2, {-5: LINE_THICKNESS, -3: LINE_ARROW_SHAPE, -2: LINE_ARROW_SHAPE, -1: LINE_ARROW_SIZE})
+    broken_line_representation, faded_broken_line_representation = _bind_representation("BROKEN_LINE", 2, {-5: LINE_THICKNESS, -3: LINE_ARROW_SHAPE, -2: LINE_ARROW_SHAPE, -1: LINE_ARROW_SIZE})
+
+
+    # loop through existing buses (once per type of component, so that the DOT representation is yielded in the same order as it is laid out)
+    # add buses to result
+    yield "   // buses (%d)" % counts[0]
+    for bus, values in buses.items():
+        # represent bus in DOT
+        if values.missing:
+            if values.selected:
+                representation = missing_bus_representation
+                bus_color = BROKEN_MISSING_COLOR
+            elif context and broken_missing:
+                representation = faded_missing_bus_representation
+                bus_color = FADED_COMPONENT_COLOR
+            else:
+                continue
+            bus_name = _quote(bus)
+            yield representation % (bus_name, _replace(bus), bus_name, *counters[bus], _quote(values.unit), bus_color)
+        else:
+            if values.selected:
+                representation = bus_representation
+                bus_color = carriers[values.carrier] if values.carrier in carriers else BUS_COLOR
+            elif context:
+                representation = faded_bus_representation
+                bus_color = FADED_COMPONENT_COLOR
             else:
-                declared_efficiencies.add(column[10:])
+                continue
+            bus_name = _quote(bus)
+            unit = _quote(values.unit)
+            yield representation % (bus_name, _replace(bus), bus_name, _quote(values.carrier), unit, *counters[bus], values.p_time_series, unit, bus_color)
+    yield ""
 
 
-    # loop through existing links
-    for i in range(len(links)):
+    # add generators to result
+    yield "   // generators (%d)" % counts[1]
+    for bus, values in buses.items():
+        # represent generators (attached to the bus) in DOT
+        generators = values.generators
+        if aggregate_one_ports:   # represent one component per carrier instead
+            for carrier, values1 in _group_one_ports(generators, context and (not values.missing or broken_missing)).items():
+                if values1[0].selected:
+                    representation = generator_group_representation
+                    generator_color = carriers[carrier] if carrier in carriers else GENERATOR_COLOR
+                else:
+                    representation = faded_generator_group_representation
+                    generator_color = FADED_COMPONENT_COLOR
+                bus_name = _quote(bus)
+                carrier_name = _quote(carrier)
+                unit = _quote(values1[0].unit)
+                yield representation % (bus_name, carrier_name, _replace("%s (%d)" % (carrier, len(values1))), len(values1), bus_name, carrier_name, sum(values2.p_nom for values2 in values1), unit, sum(values2.p_nom_opt for values2 in values1), unit, generator_color, bus_name, carrier_name, bus_name, generator_color)
+            continue
+        for values1 in generators:
+            if values1.selected:
+                representation = generator_representation
+                generator_color = carriers[values1.carrier] if values1.carrier in carriers else GENERATOR_COLOR
+            elif context and (not values.missing or broken_missing):
+                representation = faded_generator_representation
+                generator_color = FADED_COMPONENT_COLOR
+            else:
+                continue
+            name = _quote(values1.name)
+            bus_name = _quote(bus)
+            carrier = _quote(values1.carrier)
+            unit = _quote(values1.unit)
+            yield representation % (name, _replace(values1.name), name, bus_name, carrier, values1.p_nom_extendable, values1.p_nom, unit, values1.p_set, unit, values1.efficiency, values1.capital_cost, unit, values1.marginal_cost, unit, values1.p_nom_opt, unit, values1.p_time_series, unit, generator_color, name, bus_name, generator_color)
+    yield ""
 
-        # get specified buses (from declared buses) that the link connects to as well as efficiency values
-        link = links.iloc[i]
-        specified_buses = dict()
-        for bus in declared_buses:
-            value = link[bus]
-            if not pandas.isna(value):
-                number = bus[3:]
-                if number == "0":
-                    efficiency = 1.0
-                elif number == "1":
-                    if "0" in declared_efficiencies:
-                        efficiency = link["efficiency"]
-                        if pandas.isna(efficiency):
-                            efficiency = 1.0
-                    else:
-                        efficiency = 1.0
-                elif number in declared_efficiencies:
-                    if link["bus%s" % number].strip() == "":
-                        continue
-                    efficiency = link["efficiency%s" % number]
-                    if pandas.isna(efficiency):
-                        efficiency = 1.0
+
+    # add loads to result
+    yield "   // loads (%d)" % counts[2]
+    for bus, values in buses.items():
+        # represent loads (attached to the bus) in DOT
+        loads = values.loads
+        if aggregate_one_ports:   # represent one component per carrier instead
+            for carrier, values1 in _group_one_ports(loads, context and (not values.missing or broken_missing)).items():
+                if values1[0].selected:
+                    representation = load_group_representation
+                    load_color = carriers[carrier] if carrier in carriers else LOAD_COLOR
                 else:
-                    efficiency = 1.0
-                specified_buses[bus] = [value, efficiency]
+                    representation = faded_load_group_representation
+                    load_color = FADED_COMPONENT_COLOR
+                bus_name = _quote(bus)
+                carrier_name = _quote(carrier)
+                yield representation % (bus_name, carrier_name, _replace("%s (%d)" % (carrier, len(values1))), len(values1), bus_name, carrier_name, load_color, bus_name, bus_name, carrier_name, load_color)
+            continue
+        for values1 in loads:
+            if values1.selected:
+                representation = load_representation
+                load_color = carriers[values1.carrier] if values1.carrier in carriers else LOAD_COLOR
+            elif context and (not values.missing or broken_missing):
+                representation = faded_load_representation
+                load_color = FADED_COMPONENT_COLOR
+            else:
+                continue
+            name = _quote(values1.name)
+            bus_name = _quote(bus)
+            carrier = _quote(values1.carrier)
+            unit = _quote(values1.unit)
+            yield representation % (name, _replace(values1.name), name, bus_name, carrier, values1.p_set, unit, load_color, bus_name, name, load_color)
+    yield ""
 
 
-        # process link
-        if len(specified_buses) < 3:   # mono-link
+    # add stores to result
+    yield "   // stores (%d)" % counts[3]
+    for bus, values in buses.items():
+        # represent stores (attached to the bus) in DOT
+        stores = values.stores
+        if aggregate_one_ports:   # represent one component per carrier instead
+            for carrier, values1 in _group_one_ports(stores, context and (not values.missing or broken_missing)).items():
+                if values1[0].selected:
+                    representation = store_group_representation
+                    store_color = carriers[carrier] if carrier in carriers else STORE_COLOR
+                else:
+                    representation = faded_store_group_representation
+                    store_color = FADED_COMPONENT_COLOR
+                bus_name = _quote(bus)
+                carrier_name = _quote(carrier)
+                unit = _quote(values1[0].unit)
+                yield representation % (bus_name, carrier_name, _replace("%s (%d)" % (carrier, len(values1))), len(values1), bus_name, carrier_name, sum(values2.e_nom for values2 in values1), unit, sum(values2.e_nom_opt for values2 in values1), unit, store_color, bus_name, bus_name, carrier_name, store_color)
+            continue
+        for values1 in stores:
+            if values1.selected:
+                representation = store_representation
+                store_color = carriers[values1.carrier] if values1.carrier in carriers else STORE_COLOR
+            elif context and (not values.missing or broken_missing):
+                representation = faded_store_representation
+                store_color = FADED_COMPONENT_COLOR
+            else:
+                continue
+            name = _quote(values1.name)
+            bus_name = _quote(bus)
+            carrier = _quote(values1.carrier)
+            unit = _quote(values1.unit)
+            yield representation % (name, _replace(values1.name), name, bus_name, carrier, values1.e_nom_extendable, values1.e_nom, unit, values1.p_set, unit, values1.e_cyclic, values1.capital_cost, unit, values1.marginal_cost, unit, values1.e_nom_opt, unit, values1.e_time_series, unit, values1.p_time_series, unit, store_color, bus_name, name, store_color)
+    yield ""
 
-            # process mono-link
-            link = links.index[i]
-            bus0 = links.bus0.iloc[i]
-            bus1 = links.bus1.iloc[i]
-            carrier = links.carrier.iloc[i]
-            p_nom_extendable = "True" if links.p_nom_extendable.iloc[i] else "False"
-            p_nom = links.p_nom.iloc[i]
-            efficiency = links.efficiency.iloc[i]
-            capital_cost = links.capital_cost.iloc[i]
-            marginal_cost = _format_series(links_t.marginal_cost[link]) if links_t and link in links_t.marginal_cost else "%.2f" % links.marginal_cost.iloc[i]
-            p_nom_opt = links.p_nom_opt.iloc[i]
-            p0_time_series = _format_series(links_t.p0[link]) if links_t and link in links_t.p0 else "N/A"
-            p1_time_series = _format_series(links_t.p1[link]) if links_t and link in links_t.p1 else "N/A"
-            bidirectional = (efficiency == 1 and links.marginal_cost.iloc[i] == 0 and links.p_min_pu.iloc[i] == -1)
-            if bus0:
-                if bus0 in result:
-                    if result[bus0]["missing"]:
-                        if log or log_warning:
-                            print("[WAR] Link '%s' connects to bus '%s' (bus0) which does not exist" % (link, bus0))
-                    missing0 = result[bus0]["missing"]
+
+    # add storage units to result
+    yield "   // storage units (%d)" % counts[4]
+    for bus, values in buses.items():
+        # represent storage units (attached to the bus) in DOT
+        storage_units = values.storage_units
+        if aggregate_one_ports:   # represent one component per carrier instead
+            for carrier, values1 in _group_one_ports(storage_units, context and (not values.missing or broken_missing)).items():
+                if values1[0].selected:
+                    representation = storage_unit_group_representation
+                    storage_unit_color = carriers[carrier] if carrier in carriers else STORAGE_UNIT_COLOR
                 else:
-                    if log or log_warning:
-                        print("[WAR] Link '%s' connects to bus '%s' (bus0) which does not exist" % (link, bus0))
-                    result[bus0] = {"generators": list(), "loads": list(), "stores": list(), "storage_units": list(), "links": list(), "multi_link_trunks": list(), "multi_link_branches": list(), "lines": list(), "generators_count": 0, "loads_count": 0, "stores_count": 0, "storage_units_count": 0, "incoming_links_count": 0, "outgoing_links_count": 0, "lines_count": 0, "missing": True, "selected": False, "carrier": "", "unit": "", "p_time_series": ""}
-                    missing0 = True
+                    representation = faded_storage_unit_group_representation
+                    storage_unit_color = FADED_COMPONENT_COLOR
+                bus_name = _quote(bus)
+                carrier_name = _quote(carrier)
+                unit = _quote(values1[0].unit)
+                yield representation % (bus_name, carrier_name, _replace("%s (%d)" % (carrier, len(values1))), len(values1), bus_name, carrier_name, sum(values2.p_nom for values2 in values1), unit, sum(values2.p_nom_opt for values2 in values1), unit, storage_unit_color, bus_name, bus_name, carrier_name, storage_unit_color)
+            continue
+        for values1 in storage_units:
+            if values1.selected:
+                representation = storage_unit_representation
+                storage_unit_color = carriers[values1.carrier] if values1.carrier in carriers else STORAGE_UNIT_COLOR
+            elif context and (not values.missing or broken_missing):
+                representation = faded_storage_unit_representation
+                storage_unit_color = FADED_COMPONENT_COLOR
             else:
-                if log or log_warning:
-                    print("[WAR] Link '%s' does not have bus0 specified" % link)
-                bus0 = "bus #%d" % _MISSING_BUS_COUNT
-                _MISSING_BUS_COUNT += 1
-                result[bus0] = {"generators": list(), "loads": list(), "stores": list(), "storage_units": list(), "links": list(), "multi_link_trunks": list(), "multi_link_branches": list(), "lines": list(), "generators_count": 0, "loads_count": 0, "stores_count": 0, "storage_units_count": 0, "incoming_links_count": 0, "outgoing_links_count": 0, "lines_count": 0, "missing": True, "selected": False, "carrier": "", "unit": "", "p_time_series": ""}
-                missing0 = True
-            if bus1:
-                if bus1 in result:
-                    if result[bus1]["missing"]:
-                        if log or log_warning:
-                            print("[WAR] Link '%s' connects to bus '%s' (bus1) which does not exist" % (link, bus1))
-                    missing1 = result[bus1]["missing"]
+                continue
+            name = _quote(values1.name)
+            bus_name = _quote(bus)
+            carrier = _quote(values1.carrier)
+            unit = _quote(values1.unit)
+            yield representation % (name, _replace(values1.name), name, bus_name, carrier, values1.p_nom_extendable, values1.p_nom, unit, values1.p_set, unit, values1.cyclic_state_charge, values1.capital_cost, unit, values1.marginal_cost, unit, values1.p_nom_opt, unit, values1.p_time_series, unit, storage_unit_color, bus_name, name, storage_unit_color)
+    yield ""
+
+
+    # add links to result
+    yield "   // links (%d)" % counts[5]
+    for bus, values in buses.items():
+        # represent links (attached to the bus) in DOT (from bus0 only, as the reverse records attached to bus1 are marked as duplicated)
+        links = values.links
+        for values1 in links:
+            if values1.duplicated:
+                continue
+            if values1.selected:
+                faded = False
+            elif context:
+                faded = True
+            else:
+                continue
+            name = _quote(values1.name)
+            bus_name = _quote(bus)
+            bus_to_name = _quote(values1.bus_to)
+            carrier = _quote(values1.carrier)
+            if values1.missing:
+                if not broken_missing:
+                    continue
+                link_color = FADED_COMPONENT_COLOR if faded else BROKEN_MISSING_COLOR
+                if values1.bidirectional:
+                    representation = faded_broken_bidirectional_link_representation if faded else broken_bidirectional_link_representation
+                    yield representation % (bus_name, bus_to_name, _replace(values1.name), "%s (broken)" % name, "%s (bus0)" % bus_name, "%s (bus1)" % bus_to_name, carrier, values1.p_nom_extendable, values1.p_nom, values1.capital_cost, values1.marginal_cost, link_color)
                 else:
-                    if log or log_warning:
-                        print("[WAR] Link '%s' connects to bus '%s' (bus1) which does not exist" % (link, bus1))
-                    result[bus1] = {"generators": list(), "loads": list(), "stores": list(), "storage_units": list(), "links": list(), "multi_link_trunks": list(), "multi_link_branches": list(), "lines": list(), "generators_count": 0, "loads_count": 0, "stores_count": 0, "storage_units_count": 0, "incoming_links_count": 0, "outgoing_links_count": 0, "lines_count": 0, "missing": True, "selected": False, "carrier": "", "unit": "", "p_time_series": ""}
-                    missing1 = True
+                    representation = faded_broken_link_representation if faded else broken_link_representation
+                    if negative_efficiency or values1.efficiency >= 0:
+                        yield representation % (bus_name, bus_to_name, _replace(values1.name), "%s (broken)" % name, "%s (bus0)" % bus_name, "%s (bus1)" % bus_to_name, carrier, values1.p_nom_extendable, values1.p_nom, values1.efficiency, values1.capital_cost, values1.marginal_cost, "p0", "p1", link_color)
+                    else:
+                        yield representation % (bus_to_name, bus_name, _replace(values1.name), "%s (broken & inverted)" % name, "%s (bus1)" % bus_to_name, "%s (bus0)" % bus_name, carrier, values1.p_nom_extendable, values1.p_nom, -values1.efficiency, values1.capital_cost, values1.marginal_cost, "p1", "p0", link_color)
+            else:
+                link_color = FADED_COMPONENT_COLOR if faded else LINK_COLOR
+                if values1.bidirectional:
+                    representation = faded_bidirectional_link_representation if faded else bidirectional_link_representation
+                    yield representation % (bus_name, bus_to_name, _replace(values1.name), name, "%s (bus0)" % bus_name, "%s (bus1)" % bus_to_name, carrier, values1.p_nom_extendable, values1.p_nom, values1.capital_cost, values1.marginal_cost, values1.p_nom_opt, values1.p0_time_series, values1.p1_time_series, link_color)
+                else:
+                    representation = faded_link_representation if faded else link_representation
+                    if negative_efficiency or values1.efficiency >= 0:
+                        yield representation % (bus_name, bus_to_name, _replace(values1.name), name, "%s (bus0)" % bus_name, "%s (bus1)" % bus_to_name, carrier, values1.p_nom_extendable, values1.p_nom, values1.efficiency, values1.capital_cost, values1.marginal_cost, values1.p_nom_opt, "p0", values1.p0_time_series, "p1", values1.p1_time_series, link_color)
+                    else:
+                        yield representation % (bus_to_name, bus_name, _replace(values1.name), "%s (inverted)" % name, "%s (bus1)" % bus_to_name, "%s (bus0)" % bus_name, carrier, values1.p_nom_extendable, values1.p_nom, -values1.efficiency, values1.capital_cost, values1.marginal_cost, values1.p_nom_opt, "p1", values1.p1_time_series, "p0", values1.p0_time_series, link_color)
+    yield ""
+
+
+    # add multi-link trunks to result
+    yield "   // multi-link trunks (%d)" % counts[6]
+    for bus, values in buses.items():
+        # represent multi-link trunks (attached to the bus) in DOT
+        multi_link_trunks = values.multi_link_trunks
+        for values1 in multi_link_trunks:
+            if values1.selected:
+                faded = False
+            elif context:
+                faded = True
+            else:
+                continue
+            name = _quote(values1.name)
+            bus_name = _quote(bus)
+            carrier = _quote(values1.carrier)
+            not_missing = values1.count - values1.missing
+            #bus_to = "1 bus (%d missing)" % missing if not_missing == 1 else "%d buses (%d missing)" % (not_missing, missing)
+            if not_missing == 0:
+                if not broken_missing:
+                    continue
+                bus_to = _quote("\n".join(values1.bus_to))
+                bus_to_efficiencies = "\n".join(values1.bus_to_efficiencies)
+                link_color = FADED_COMPONENT_COLOR if faded else BROKEN_MISSING_COLOR
+                yield (faded_multi_link_point_representation if faded else multi_link_point_representation) % (name, _replace(values1.name), "%s (broken)" % name, bus_name, bus_to, bus_to_efficiencies, carrier, values1.p_nom_extendable, values1.p_nom, values1.capital_cost, values1.marginal_cost, values1.p_nom_opt, values1.p0_time_series, link_color)
+                yield (faded_broken_multi_link_trunk_representation if faded else broken_multi_link_trunk_representation) % (bus_name, name, _replace(values1.name), name, bus_name, bus_to, bus_to_efficiencies, carrier, values1.p_nom_extendable, values1.p_nom, values1.capital_cost, values1.marginal_cost, link_color)
+            else:
+                bus_to = _quote("\n".join(values1.bus_to) if broken_missing else "\n".join(values1.bus_to[:not_missing]))
+                bus_to_efficiencies = "\n".join(values1.bus_to_efficiencies) if broken_missing else "\n".join(values1.bus_to_efficiencies[:not_missing])
+                link_color = FADED_COMPONENT_COLOR if faded else LINK_COLOR
+                yield (faded_multi_link_point_representation if faded else multi_link_point_representation) % (name, _replace(values1.name), name, bus_name, bus_to, bus_to_efficiencies, carrier, values1.p_nom_extendable, values1.p_nom, values1.capital_cost, values1.marginal_cost, values1.p_nom_opt, values1.p0_time_series, link_color)
+                yield (faded_multi_link_trunk_representation if faded else multi_link_trunk_representation) % (bus_name, name, _replace(values1.name), name, bus_name, bus_to, bus_to_efficiencies, carrier, values1.p_nom_extendable, values1.p_nom, values1.capital_cost, values1.marginal_cost, values1.p_nom_opt, values1.p0_time_series, link_color)
+    yield ""
+
+
+    # add multi-link branches to result
+    yield "   // multi-link branches (%d)" % counts[7]
+    for bus, values in buses.items():
+        # represent multi-link branches (attached to the bus) in DOT (from bus0 only, as the reverse records attached to the other buses are marked as duplicated)
+        # TODO: test this logic
+        multi_link_branches = values.multi_link_branches
+        for values1 in multi_link_branches:
+            if values1.duplicated:
+                continue
+            if values1.selected:
+                faded = False
+            elif context:
+                faded = True
+            else:
+                continue
+            name = _quote(values1.name)
+            bus_name = _quote(bus)
+            bus_to_name = _quote(values1.bus_to)
+            carrier = _quote(values1.carrier)
+            if values.missing or buses[values1.bus_to].missing:
+                if not broken_missing:
+                    continue
+                representation = faded_broken_multi_link_branch_representation if faded else broken_multi_link_branch_representation
+                link_color = FADED_COMPONENT_COLOR if faded else BROKEN_MISSING_COLOR
+                if negative_efficiency or values1.efficiency >= 0:
+                    yield representation % ("%s (multi-link)" % name, "%s (bus)" % bus_to_name, _replace(values1.name), "%s (broken)" % name, "%s (bus0)" % bus_name, "%s (%s)" % (bus_to_name, values1.bus_value), carrier, values1.p_nom_extendable, values1.p_nom, values1.efficiency, values1.capital_cost, values1.marginal_cost, "p0", values1.p0_time_series, values1.px, "N/A", link_color)
+                else:
+                    yield representation % ("%s (bus)" % bus_to_name, "%s (multi-link)" % name, _replace(values1.name), "%s (broken & inverted)" % name, "%s (%s)" % (bus_to_name, values1.bus_value), "%s (bus0)" % bus_name, carrier, values1.p_nom_extendable, values1.p_nom, -values1.efficiency, values1.capital_cost, values1.marginal_cost, values1.px, "N/A", "p0", values1.p0_time_series, link_color)
             else:
-                if log or log_warning:
-                    print("[WAR] Link '%s' does not have bus1 specified" % link)
-                bus1 = "bus #%d" % _MISSING_BUS_COUNT
-                _MISSING_BUS_COUNT += 1
-                result[bus1] = {"generators": list(), "loads": list(), "stores": list(), "storage_units": list(), "links": list(), "multi_link_trunks": list(), "multi_link_branches": list(), "lines": list(), "generators_count": 0, "loads_count": 0, "stores_count": 0, "storage_units_count": 0, "incoming_links_count": 0, "outgoing_links_count": 0, "lines_count": 0, "missing": True, "selected": False, "carrier": "", "unit": "", "p_time_series": ""}
-                missing1 = True
-            result[bus0]["links"].append([link, bus1, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, p1_time_series, bidirectional, True, missing0 or missing1, False])
-            if focus:
-                result[bus1]["links"].append([link, bus0, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, p1_time_series, bidirectional, False, missing0 or missing1, False])
+                representation = faded_multi_link_branch_representation if faded else multi_link_branch_representation
+                link_color = FADED_COMPONENT_COLOR if faded else LINK_COLOR
+                if negative_efficiency or values1.efficiency >= 0:
+                    yield representation % ("%s (multi-link)" % name, "%s (bus)" % bus_to_name, _replace(values1.name), name, "%s (bus0)" % bus_name, "%s (%s)" % (bus_to_name, values1.bus_value), carrier, values1.p_nom_extendable, values1.p_nom, values1.efficiency, values1.capital_cost, values1.marginal_cost, values1.p_nom_opt, "p0", values1.p0_time_series, values1.px, values1.px_time_series, link_color)
+                else:
+                    yield representation % ("%s (bus)" % bus_to_name, "%s (multi-link)" % name, _replace(values1.name), "%s (inverted)" % name, "%s (%s)" % (bus_to_name, values1.bus_value), "%s (bus0)" % bus_name, carrier, values1.p_nom_extendable, values1.p_nom, -values1.efficiency, values1.capital_cost, values1.marginal_cost, values1.p_nom_opt, values1.px, values1.px_time_series, "p0", values1.p0_time_series, link_color)
+    yield ""
 
-        else:   # multi-link
 
-            # check that buses that the link connects to exist
-            missing = 0
-            for key, value in specified_buses.items():
-                bus_value, bus_efficiency = value
-                if bus_value:
-                    if bus_value in result:
-                        if result[bus_value]["missing"]:
-                            if log or log_warning:
-                                print("[WAR] Link '%s' connects to bus '%s' (%s) which does not exist" % (links.index[i], bus_value, key))
-                            if key != "bus0":
-                                missing += 1
-                    else:
-                        if log or log_warning:
-                            print("[WAR] Link '%s' connects to bus '%s' (%s) which does not exist" % (links.index[i], bus_value, key))
-                        result[bus_value] = {"generators": list(), "loads": list(), "stores": list(), "storage_units": list(), "links": list(), "multi_link_trunks": list(), "multi_link_branches": list(), "lines": list(), "generators_count": 0, "loads_count": 0, "stores_count": 0, "storage_units_count": 0, "incoming_links_count": 0, "outgoing_links_count": 0, "lines_count": 0, "missing": True, "selected": False, "carrier": "", "unit": "", "p_time_series": ""}
-                        if key != "bus0":
-                            missing += 1
+    # add lines to result
+    yield "   // lines (%d)" % counts[8]
+    for bus, values in buses.items():
+        # represent lines (attached to the bus) in DOT (from bus0 only, as the reverse records attached to bus1 are marked as duplicated)
+        lines = values.lines
+        for values1 in lines:
+            if values1.duplicated:
+                continue
+            if values1.missing:
+                if not broken_missing:
+                    continue
+                if values1.selected:
+                    representation = broken_line_representation
+                    line_color = BROKEN_MISSING_COLOR
+                elif context:
+                    representation = faded_broken_line_representation
+                    line_color = FADED_COMPONENT_COLOR
                 else:
-                    if log or log_warning:
-                        print("[WAR] Link '%s' does not have %s specified" % (links.index[i], key))
-                    bus_value = "bus #%d" % _MISSING_BUS_COUNT
-                    _MISSING_BUS_COUNT += 1
-                    result[bus_value] = {"generators": list(), "loads": list(), "stores": list(), "storage_units": list(), "links": list(), "multi_link_trunks": list(), "multi_link_branches": list(), "lines": list(), "generators_count": 0, "loads_count": 0, "stores_count": 0, "storage_units_count": 0, "incoming_links_count": 0, "outgoing_links_count": 0, "lines_count": 0, "missing": True, "selected": False, "carrier": "", "unit": "", "p_time_series": ""}
-                    value[0] = bus_value
-                    if key != "bus0":
-                        missing += 1
+                    continue
+                name = _quote(values1.name)
+                bus_name = _quote(bus)
+                bus_to_name = _quote(values1.bus_to)
+                yield representation % (bus_name, bus_to_name, _replace(values1.name), "%s (broken)" % name, bus_name, bus_to_name, _quote(values1.carrier), values1.s_nom_extendable, values1.s_nom, values1.capital_cost, line_color)
+            else:
+                if values1.selected:
+                    representation = line_representation
+                    line_color = carriers[values1.carrier] if values1.carrier in carriers else LINE_COLOR
+                elif context:
+                    representation = faded_line_representation
+                    line_color = FADED_COMPONENT_COLOR
+                else:
+                    continue
+                name = _quote(values1.name)
+                bus_name = _quote(bus)
+                bus_to_name = _quote(values1.bus_to)
+                yield representation % (bus_name, bus_to_name, _replace(values1.name), name, bus_name, bus_to_name, _quote(values1.carrier), values1.s_nom_extendable, values1.s_nom, values1.capital_cost, values1.s_nom_opt, values1.p0_time_series, values1.p1_time_series, line_color)
 
 
-            # process multi-link
-            link = links.index[i]
-            carrier = links.carrier.iloc[i]
-            p_nom_extendable = "True" if links.p_nom_extendable.iloc[i] else "False"
-            p_nom = links.p_nom.iloc[i]
-            capital_cost = links.capital_cost.iloc[i]
-            marginal_cost = _format_series(links_t.marginal_cost[link]) if links_t and link in links_t.marginal_cost else "%.2f" % links.marginal_cost.iloc[i]
-            p_nom_opt = links.p_nom_opt.iloc[i]
-            p0_time_series = _format_series(links_t.p0[link]) if links_t and link in links_t.p0 else "N/A"
-            bus0_value, bus0_efficiency = specified_buses["bus0"]
-            index = len(result[bus0_value]["multi_link_trunks"])
-            bus_to = []
-            bus_to_efficiencies = []
-            for key, value in specified_buses.items():
-                bus_value, bus_efficiency = value
-                if key != "bus0":
-                    bus_to.append("To: %s (%s)" % (bus_value, key))
-                    bus_to_efficiencies.append("Efficiency: %.2f (%s)" % (bus_efficiency, key))
-                    px = "p%s" % key[3:]
-                    px_time_series = _format_series(links_t[px][link]) if links_t and px in links_t and link in links_t[px] else "N/A"
-                    result[bus0_value]["multi_link_branches"].append([link, bus_value, key, carrier, p_nom_extendable, p_nom, bus_efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, px, px_time_series, index, True, False])
-                    if focus:
-                        result[bus_value]["multi_link_branches"].append([link, bus0_value, key, carrier, p_nom_extendable, p_nom, bus_efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, px, px_time_series, index, False, False])
-            result[bus0_value]["multi_link_trunks"].append([link, bus_to, bus_to_efficiencies, carrier, p_nom_extendable, p_nom, capital_cost, marginal_cost, p_nom_opt, p0_time_series, len(specified_buses) - 1, missing, False])
 
+def _get_adjacency(components):
+    """
+    Parameters
+    ----------
+    components : TYPE
+        DESCRIPTION.
 
-    # get lines from (PyPSA) network
-    if log or log_info:
-        print("[INF] Retrieving lines from network")
-    lines = network.lines
-    lines_t = getattr(network, "lines_t", None)
-    for i in range(len(lines)):
-        line = lines.index[i]
-        bus0 = lines.bus0.iloc[i]
-        bus1 = lines.bus1.iloc[i]
-        carrier = lines.carrier.iloc[i]
-        s_nom_extendable = "True" if lines.s_nom_extendable.iloc[i] else "False"
-        s_nom = lines.s_nom.iloc[i]
-        capital_cost = lines.capital_cost.iloc[i]
-        s_nom_opt = lines.s_nom_opt.iloc[i]
-        p0_time_series = _format_series(lines_t.p0[line]) if lines_t and line in lines_t.p0 else "N/A"
-        p1_time_series = _format_series(lines_t.p1[line]) if lines_t and line in lines_t.p1 else "N/A"
-        if bus0:
-            if bus0 in result:
-                if result[bus0]["missing"]:
-                    if log or log_warning:
-                        print("[WAR] Line '%s' connects to bus '%s' (bus0) which does not exist" % (line, bus0))
-                missing0 = result[bus0]["missing"]
-            else:
-                if log or log_warning:
-                    print("[WAR] Line '%s' connects to bus '%s' (bus0) which does not exist" % (line, bus0))
-                result[bus0] = {"generators": list(), "loads": list(), "stores": list(), "storage_units": list(), "links": list(), "multi_link_trunks": list(), "multi_link_branches": list(), "lines": list(), "generators_count": 0, "loads_count": 0, "stores_count": 0, "storage_units_count": 0, "incoming_links_count": 0, "outgoing_links_count": 0, "lines_count": 0, "missing": True, "selected": False, "carrier": "", "unit": "", "p_time_series": ""}
-                missing0 = True
-        else:
-            if log or log_warning:
-                print("[WAR] Line '%s' does not have bus0 specified" % line)
-            bus0 = "bus #%d" % _MISSING_BUS_COUNT
-            _MISSING_BUS_COUNT += 1
-            result[bus0] = {"generators": list(), "loads": list(), "stores": list(), "storage_units": list(), "links": list(), "multi_link_trunks": list(), "multi_link_branches": list(), "lines": list(), "generators_count": 0, "loads_count": 0, "stores_count": 0, "storage_units_count": 0, "incoming_links_count": 0, "outgoing_links_count": 0, "lines_count": 0, "missing": True, "selected": False, "carrier": "", "unit": "", "p_time_series": ""}
-            missing0 = True
-        if bus1:
-            if bus1 in result:
-                if result[bus1]["missing"]:
-                    if log or log_warning:
-                        print("[WAR] Line '%s' connects to bus '%s' (bus1) which does not exist" % (line, bus1))
-                missing1 = result[bus1]["missing"]
-            else:
-                if log or log_warning:
-                    print("[WAR] Line '%s' connects to bus '%s' (bus1) which does not exist" % (line, bus1))
-                result[bus1] = {"generators": list(), "loads": list(), "stores": list(), "storage_units": list(), "links": list(), "multi_link_trunks": list(), "multi_link_branches": list(), "lines": list(), "generators_count": 0, "loads_count": 0, "stores_count": 0, "storage_units_count": 0, "incoming_links_count": 0, "outgoing_links_count": 0, "lines_count": 0, "missing": True, "selected": False, "carrier": "", "unit": "", "p_time_series": ""}
-                missing1 = True
-        else:
-            if log or log_warning:
-                print("[WAR] Line '%s' does not have bus1 specified" % line)
-            bus1 = "bus #%d" % _MISSING_BUS_COUNT
-            _MISSING_BUS_COUNT += 1
-            result[bus1] = {"generators": list(), "loads": list(), "stores": list(), "storage_units": list(), "links": list(), "multi_link_trunks": list(), "multi_link_branches": list(), "lines": list(), "generators_count": 0, "loads_count": 0, "stores_count": 0, "storage_units_count": 0, "incoming_links_count": 0, "outgoing_links_count": 0, "lines_count": 0, "missing": True, "selected": False, "carrier": "", "unit": "", "p_time_series": ""}
-            missing1 = True
-        result[bus0]["lines"].append([line, bus1, carrier, s_nom_extendable, s_nom, capital_cost, s_nom_opt, p0_time_series, p1_time_series, True, missing0 or missing1, False])
-        if focus:
-            result[bus1]["lines"].append([line, bus0, carrier, s_nom_extendable, s_nom, capital_cost, s_nom_opt, p0_time_series, p1_time_series, False, missing0 or missing1, False])
+    Returns
+    -------
+    TYPE
+        DESCRIPTION.
+    """
 
+    ids = dict()
+    values = list(components.values())
+    kinds = list()
+    edges = list()
+    keys = list()
+    forward = dict()
+    link_ids = dict()
+    line_ids = dict()
 
-    return result
 
+    # assign an integer identifier to each bus
+    for bus in components:
+        ids[bus] = len(ids)
 
 
-def _process_components(buses, bus_filter, generator_filter, load_filter, store_filter, storage_unit_filter, link_filter, line_filter, carrier_filter, negative_efficiency, broken_missing, carrier_color, context):
+    # build compressed sparse row (CSR) arrays mapping each bus to its neighbours (the edges of a bus are stored in the order links, multi-link branches and lines)
+    records = [values1 for values0 in values for values1 in (*values0.links, *values0.multi_link_branches, *values0.lines)]
+    offsets = [0]
+    offsets.extend(accumulate(len(values0.links) + len(values0.multi_link_branches) + len(values0.lines) for values0 in values))
+    targets = [ids[values1.bus_to] for values1 in records]
+    for values1 in records:
+        if isinstance(values1, _Link):
+            kinds.append(_LINK_EDGE)
+            edges.append(link_ids.setdefault(values1.name, len(link_ids)))   # both ends of a link share the same (non-negative) edge identifier
+            key = (_LINK_EDGE, values1.name)
+        elif isinstance(values1, _MultiLinkBranch):
+            kinds.append(_MULTI_LINK_BRANCH_EDGE)
+            edges.append(-1)
+            key = (_MULTI_LINK_BRANCH_EDGE, values1.name, values1.bus_value)
+        else:   # _Line
+            kinds.append(_LINE_EDGE)
+            edges.append(-2 - line_ids.setdefault(values1.name, len(line_ids)))   # both ends of a line share the same (negative) edge identifier
+            key = (_LINE_EDGE, values1.name)
+        keys.append(key)
+        if values1.direction:
+            forward[key] = values1
+
+
+    # map each edge to the (canonical) record representing it, i.e. the forward record attached to bus0 (so that a link, multi-link branch or line is selected and represented only once, no matter from which of its ends it is reached)
+    canonical = [forward[key] for key in keys]
+
+
+    return ids, values, offsets, targets, kinds, records, edges, canonical
+
+
+
+def _focus(components, adjacency, focus, neighbourhood, bus_filter, generator_filter, load_filter, store_filter, storage_unit_filter, link_filter, line_filter, carrier_filter, negative_efficiency, broken_missing, carrier_color, context, log, log_info, log_warning, carriers):
     """
     Parameters
     ----------
-    buses : TYPE
+    components : TYPE
+        DESCRIPTION.
+    adjacency : TYPE
+        DESCRIPTION.
+    focus : TYPE
+        DESCRIPTION.
+    neighbourhood : TYPE
         DESCRIPTION.
     bus_filter : TYPE
         DESCRIPTION.
@@ -608,190 +2364,386 @@ def _process_components(buses, bus_filter, generator_filter, load_filter, store_
         DESCRIPTION.
     context : TYPE
         DESCRIPTION.
+    log : TYPE
+        DESCRIPTION.
+    log_info : TYPE
+        DESCRIPTION.
+    log_warning : TYPE
+        DESCRIPTION.
+    carriers : TYPE
+        DESCRIPTION.
 
     Returns
     -------
-    carriers : TYPE
+    visited : TYPE
         DESCRIPTION.
     """
 
-    carriers = dict()
+    ids, values, offsets, targets, kinds, records, edges, canonical = adjacency
+    visited = set()
+    visited_edges = set()
+    sources = set()
+    remaining = dict()
 
 
-    # loop through existing buses
-    for bus, values0 in buses.items():
+    # add buses to focus on to the queue (i.e. the bucket of their neighbourhood), keeping the largest neighbourhood of a bus in case it is given more than once
+    depths = _get_focus_depths(focus, neighbourhood)
+    queue = [[] for _ in range(max(depth for bus, depth in depths) + 1)]
+    for bus, depth in depths:
+        index = ids[bus]
+        sources.add(index)
+        if remaining.get(index, -1) < depth:
+            remaining[index] = depth
+            queue[depth].append(index)
 
-        # process bus
-        if (not values0["missing"] or broken_missing) and (not bus_filter or bus_filter.match(bus)) and (not carrier_filter or carrier_filter.match(values0["carrier"])):
-            if carrier_color:
-                carrier = values0["carrier"]
-                if carrier and carrier not in carriers:
-                    carriers[carrier] = None
-            values0["selected"] = True
 
+    # process queue (one bucket at a time, from the largest neighbourhood remaining to visit to the smallest, so that each bus is processed only once and with the largest neighbourhood it can be reached with from any of the buses to focus on)
+    for neighbourhood in range(len(queue) - 1, -1, -1):
+        for index in queue[neighbourhood]:
 
-        # process generators (attached to the bus)
-        generators = values0["generators"]
-        for values1 in generators:
-            generator, carrier, unit, p_nom_extendable, p_nom, p_set, efficiency, capital_cost, marginal_cost, p_nom_opt, p_time_series, selected = values1
-            if values0["selected"] and (not generator_filter or generator_filter.match(generator)) and (not carrier_filter or carrier_filter.match(carrier)):
-                if carrier_color:
-                    if carrier and carrier not in carriers:
-                        carriers[carrier] = None
-                values1[-1] = True
-                buses[bus]["generators_count"] += 1
-            elif context:
-                buses[bus]["generators_count"] += 1
+            # check if bus has already been visited (processed)
+            if index in visited:
+                continue
+            visited.add(index)
+            values0 = values[index]
+            bus = values0.name
 
 
-        # process loads (attached to the bus)
-        loads = values0["loads"]
-        for values1 in loads:
-            load, carrier, unit, p_set, selected = values1
-            if values0["selected"] and (not load_filter or load_filter.match(load)) and (not carrier_filter or carrier_filter.match(carrier)):
-                if carrier_color:
-                    if carrier and carrier not in carriers:
-                        carriers[carrier] = None
-                values1[-1] = True
-                buses[bus]["loads_count"] += 1
-            elif context:
-                buses[bus]["loads_count"] += 1
+            # display info message
+            if log or log_info:
+                print("[INF] Focusing on bus '%s'" % bus)
 
 
-        # process stores (attached to the bus)
-        stores = values0["stores"]
-        for values1 in stores:
-            store, carrier, unit, e_nom_extendable, e_nom, p_set, e_cyclic, capital_cost, marginal_cost, e_nom_opt, e_time_series, p_time_series, selected = values1
-            if values0["selected"] and (not store_filter or store_filter.match(store)) and (not carrier_filter or carrier_filter.match(carrier)):
+            # process bus
+            if index in sources or ((not values0.missing or broken_missing) and (not bus_filter or bus_filter.match(bus))) and (not carrier_filter or carrier_filter.match(values0.carrier)):
                 if carrier_color:
+                    carrier = values0.carrier
                     if carrier and carrier not in carriers:
                         carriers[carrier] = None
-                values1[-1] = True
-                buses[bus]["stores_count"] += 1
-            elif context:
-                buses[bus]["stores_count"] += 1
+                values0.selected = True
 
 
-        # process storage units (attached to the bus)
-        storage_units = values0["storage_units"]
-        for values1 in storage_units:
-            storage_unit, carrier, unit, p_nom_extendable, p_nom, p_set, cyclic_state_charge, capital_cost, marginal_cost, p_nom_opt, p_time_series, selected = values1
-            if values0["selected"] and (not storage_unit_filter or storage_unit_filter.match(storage_unit)) and (not carrier_filter or carrier_filter.match(carrier)):
-                if carrier_color:
-                    if carrier and carrier not in carriers:
-                        carriers[carrier] = None
-                values1[-1] = True
-                buses[bus]["storage_units_count"] += 1
-            elif context:
-                buses[bus]["storage_units_count"] += 1
+            # check if neighbourhood visiting reached the limit
+            if neighbourhood == 0:
+                continue
 
 
-        # process links (attached to the bus)
-        links = values0["links"]
-        for values1 in links:
-            link, bus_to, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, p1_time_series, bidirectional, direction, missing, selected = values1
-            if not missing or broken_missing:
-                if values0["selected"] and (not bus_filter or bus_filter.match(bus_to)) and (not link_filter or link_filter.match(link)) and (not carrier_filter or carrier_filter.match(carrier)):
-                    values1[-1] = True
-                if values1[-1] or context:
-                    if bidirectional:
-                        buses[bus]["incoming_links_count"] += 1
-                        buses[bus]["outgoing_links_count"] += 1
-                        buses[bus_to]["incoming_links_count"] += 1
-                        buses[bus_to]["outgoing_links_count"] += 1
-                    elif negative_efficiency or efficiency >= 0:
-                        if direction:
-                            buses[bus]["outgoing_links_count"] += 1
-                            buses[bus_to]["incoming_links_count"] += 1
-                        else:
-                            buses[bus]["incoming_links_count"] += 1
-                            buses[bus_to]["outgoing_links_count"] += 1
-                    else:
-                        if direction:
-                            buses[bus]["incoming_links_count"] += 1
-                            buses[bus_to]["outgoing_links_count"] += 1
+            # process generators (attached to the bus currently on focus)
+            generators = values0.generators
+            for values1 in generators:
+                if values0.selected and (not generator_filter or generator_filter.match(values1.name)) and (not carrier_filter or carrier_filter.match(values1.carrier)):
+                    if carrier_color:
+                        if values1.carrier and values1.carrier not in carriers:
+                            carriers[values1.carrier] = None
+                    values1.selected = True
+
+
+            # process loads (attached to the bus currently on focus)
+            loads = values0.loads
+            for values1 in loads:
+                if values0.selected and (not load_filter or load_filter.match(values1.name)) and (not carrier_filter or carrier_filter.match(values1.carrier)):
+                    if carrier_color:
+                        if values1.carrier and values1.carrier not in carriers:
+                            carriers[values1.carrier] = None
+                    values1.selected = True
+
+
+            # process stores (attached to the bus currently on focus)
+            stores = values0.stores
+            for values1 in stores:
+                if values0.selected and (not store_filter or store_filter.match(values1.name)) and (not carrier_filter or carrier_filter.match(values1.carrier)):
+                    if carrier_color:
+                        if values1.carrier and values1.carrier not in carriers:
+                            carriers[values1.carrier] = None
+                    values1.selected = True
+
+
+            # process storage units (attached to the bus currently on focus)
+            storage_units = values0.storage_units
+            for values1 in storage_units:
+                if values0.selected and (not storage_unit_filter or storage_unit_filter.match(values1.name)) and (not carrier_filter or carrier_filter.match(values1.carrier)):
+                    if carrier_color:
+                        if values1.carrier and values1.carrier not in carriers:
+                            carriers[values1.carrier] = None
+                    values1.selected = True
+
+
+            # process multi-link trunks (attached to the bus currently on focus) first, as their selection does not depend on the links, multi-link branches and lines
+            multi_link_trunks = values0.multi_link_trunks
+            multi_link_branches = values0.multi_link_branches
+            branches = None   # index of the multi-link branches (attached to the bus) by name, only built when a trunk needs to look up its branches
+            for values1 in multi_link_trunks:
+                not_missing = values1.count - values1.missing
+                if not_missing or broken_missing:
+                    if values0.selected and (not link_filter or link_filter.match(values1.name)) and (not carrier_filter or carrier_filter.match(values1.carrier)):
+                        if bus_filter:
+                            if branches is None:
+                                branches = dict()
+                                for values2 in multi_link_branches:
+                                    branches.setdefault(values2.name, []).append(values2)
+                            for values2 in branches.get(values1.name, ()):
+                                if not values0.missing and not components[values2.bus_to].missing or broken_missing:
+                                    if bus_filter.match(values2.bus_to):
+                                        values1.selected = True
+                                        break
                         else:
-                            buses[bus]["outgoing_links_count"] += 1
-                            buses[bus_to]["incoming_links_count"] += 1
+                            values1.selected = True
+
+
+            # process links, multi-link branches and lines (attached to the bus currently on focus) by walking through the neighbours of the bus in the adjacency arrays
+            for edge in range(offsets[index], offsets[index + 1]):
+                values1 = records[edge]
+                values3 = canonical[edge]
+                target = targets[edge]
+                values2 = values[target]
+                kind = kinds[edge]
+
+                # process link
+                if kind == _LINK_EDGE:
+                    if edges[edge] in visited_edges:
+                        continue
+                    visited_edges.add(edges[edge])
+                    if not values1.missing or broken_missing:
+                        if values0.selected and (not bus_filter or bus_filter.match(values1.bus_to)) and (not link_filter or link_filter.match(values1.name)) and (not carrier_filter or carrier_filter.match(values1.carrier)):
+                            values3.selected = True
+                        if values3.selected or context:
+                            if remaining.get(target, -1) < neighbourhood - 1:   # add neighbouring (adjacent) bus to queue (unless it is already reachable with a larger neighbourhood)
+                                remaining[target] = neighbourhood - 1
+                                queue[neighbourhood - 1].append(target)
+
+                # process multi-link branch
+                elif kind == _MULTI_LINK_BRANCH_EDGE:
+                    if not values0.missing and not values2.missing or broken_missing:
+                        if values0.selected and (not bus_filter or bus_filter.match(values1.bus_to)) and (not link_filter or link_filter.match(values1.name)) and (not carrier_filter or carrier_filter.match(values1.carrier)):
+                            values3.selected = True
+                            if not values1.direction or neighbourhood > 1:
+                                multi_link_trunks = values2.multi_link_trunks
+                                if values1.index < len(multi_link_trunks):
+                                    multi_link_trunks[values1.index].selected = True
+                        if values3.selected or context:   # TODO: test logic
+                            if remaining.get(target, -1) < neighbourhood - 1:   # add neighbouring (adjacent) bus to queue (unless it is already reachable with a larger neighbourhood)
+                                remaining[target] = neighbourhood - 1
+                                queue[neighbourhood - 1].append(target)
+
+                # process line
+                else:
+                    if edges[edge] in visited_edges:
+                        continue
+                    visited_edges.add(edges[edge])
+                    if not values1.missing or broken_missing:
+                        if values0.selected and (not bus_filter or bus_filter.match(values1.bus_to)) and (not line_filter or line_filter.match(values1.name)) and (not carrier_filter or carrier_filter.match(values1.carrier)):
+                            if carrier_color:
+                                if values1.carrier and values1.carrier not in carriers:
+                                    carriers[values1.carrier] = None
+                            values3.selected = True
+                        if values3.selected or context:
+                            if remaining.get(target, -1) < neighbourhood - 1:   # add neighbouring (adjacent) bus to queue (unless it is already reachable with a larger neighbourhood)
+                                remaining[target] = neighbourhood - 1
+                                queue[neighbourhood - 1].append(target)
+
+
+    return visited
+
+
+
+def _check_parameters(neighbourhood, file_output, file_format, layout_engine, render_timeout, render_cache_directory, reuse_layout):
+    """
+    Parameters
+    ----------
+    neighbourhood : TYPE
+        DESCRIPTION.
+    file_output : TYPE
+        DESCRIPTION.
+    file_format : TYPE
+        DESCRIPTION.
+    layout_engine : TYPE
+        DESCRIPTION.
+    render_timeout : TYPE
+        DESCRIPTION.
+    render_cache_directory : TYPE
+        DESCRIPTION.
+    reuse_layout : TYPE
+        DESCRIPTION.
+
+    Returns
+    -------
+    TYPE
+        DESCRIPTION.
+    """
+
+    # check if neighbourhood is valid
+    if isinstance(neighbourhood, int):
+        if neighbourhood < 0:
+            print("[ERR] The neighbourhood should be equal or greater than 0")
+            return -1   # return unsuccessfully
+    else:   # list
+        for value in neighbourhood:
+            if value < 0:
+                print("[ERR] The neighbourhood should be equal or greater than 0")
+                return -1   # return unsuccessfully
+
+
+    # check if file format(s) is valid
+    if isinstance(file_format, str):
+        if file_format not in ("svg", "png", "jpg", "gif", "pdf", "ps"):
+            print("[ERR] The file format '%s' is not valid (acceptable formats are: 'svg', 'png', 'jpg', 'gif', 'pdf' or 'ps')!" % file_format)
+            return -1   # return unsuccessfully
+    else:   # list
+        if not file_format:
+            print("[ERR] At least one file format should be specified")
+            return -1   # return unsuccessfully
+        for value in file_format:
+            if value not in ("svg", "png", "jpg", "gif", "pdf", "ps"):
+                print("[ERR] The file format '%s' is not valid (acceptable formats are: 'svg', 'png', 'jpg', 'gif', 'pdf' or 'ps')!" % value)
+                return -1   # return unsuccessfully
+
+
+    # check if layout engine is valid
+    if layout_engine not in ("dot", "sfdp", "neato", "fdp", "auto"):
+        print("[ERR] The layout engine '%s' is not valid (acceptable engines are: 'dot', 'sfdp', 'neato', 'fdp' or 'auto')!" % layout_engine)
+        return -1   # return unsuccessfully
+
+
+    # check if render timeout is valid
+    if render_timeout is not None and render_timeout <= 0:
+        print("[ERR] The render timeout should be greater than 0")
+        return -1   # return unsuccessfully
+
+
+    # check if render cache can be used (as it is made of files, it cannot be used when generating the topographical representation in memory)
+    if render_cache_directory and file_output is None:
+        print("[ERR] The render cache can only be used when a file output is specified")
+        return -1   # return unsuccessfully
+
+
+    # check if layout can be reused (as it is stored in the render cache)
+    if reuse_layout and not render_cache_directory:
+        print("[ERR] The layout can only be reused when a render cache directory is specified")
+        return -1   # return unsuccessfully
+
+
+    return 0   # return successfully
+
 
 
-        # process multi-link trunks (attached to the bus)
-        multi_link_trunks = values0["multi_link_trunks"]
-        multi_link_branches = values0["multi_link_branches"]
-        for values1 in multi_link_trunks:
-            link_trunk, bus_to, bus_to_efficiencies, carrier, p_nom_extendable, p_nom, capital_cost, marginal_cost, p_nom_opt, p0_time_series, count, missing, selected = values1
-            not_missing = count - missing
-            if not_missing or broken_missing:
-                if values0["selected"] and (not link_filter or link_filter.match(link_trunk)) and (not carrier_filter or carrier_filter.match(carrier)):
-                    if bus_filter:
-                        for values2 in multi_link_branches:
-                            link_branch, bus_to, bus_value, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, px, px_time_series, index, direction, selected = values2
-                            if link_trunk == link_branch:
-                                if not values0["missing"] and not buses[bus_to]["missing"] or broken_missing:
-                                    if bus_filter.match(bus_to):
-                                        values1[-1] = True
-                                        break
-                    else:
-                        values1[-1] = True
+def _reset_components(components):
+    """
+    Parameters
+    ----------
+    components : TYPE
+        DESCRIPTION.
+
+    Returns
+    -------
+    None.
+    """
+
+    # loop through existing buses
+    for values0 in components.values():
+
+        # reset bus
+        values0.selected = False
+
+
+        # reset one-port components (attached to the bus)
+        for values1 in values0.generators:
+            values1.selected = False
+        for values1 in values0.loads:
+            values1.selected = False
+        for values1 in values0.stores:
+            values1.selected = False
+        for values1 in values0.storage_units:
+            values1.selected = False
+
+
+        # reset links, multi-links and lines (attached to the bus), marking their reverse records as duplicated as these are represented from bus0 only (i.e. through their forward records)
+        for values1 in values0.links:
+            values1.selected = False
+            values1.duplicated = not values1.direction
+        for values1 in values0.multi_link_trunks:
+            values1.selected = False
+        for values1 in values0.multi_link_branches:
+            values1.selected = False
+            values1.duplicated = not values1.direction
+        for values1 in values0.lines:
+            values1.selected = False
+            values1.duplicated = not values1.direction
+
+
+
+def _get_cache_digest(cache_directory, file_input):
+    """
+    Parameters
+    ----------
+    cache_directory : TYPE
+        DESCRIPTION.
+    file_input : TYPE
+        DESCRIPTION.
+
+    Returns
+    -------
+    TYPE
+        DESCRIPTION.
+    """
+
+    # get key of file based on its path (and on the version of PyPSATopo and the format of the cache, as these may change between versions) as well as its state, i.e. its modification time and size
+    status = os.stat(file_input)
+    key = hashlib.sha256(("%s|%s|%d" % (os.path.abspath(file_input), __version__, _CACHE_FORMAT)).encode()).hexdigest()
+    key_file = os.path.join(cache_directory, "%s.key" % key)
+    state = "%d|%d" % (status.st_mtime_ns, status.st_size)
 
 
-        # process multi-link branches (attached to the bus)
-        for values1 in multi_link_branches:
-            link, bus_to, bus_value, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, px, px_time_series, index, direction, selected = values1
-            if not values0["missing"] and not buses[bus_to]["missing"] or broken_missing:
-                if values0["selected"] and (not bus_filter or bus_filter.match(bus_to)) and (not link_filter or link_filter.match(link)) and (not carrier_filter or carrier_filter.match(carrier)):
-                    values1[-1] = True
-                if values1[-1] or context:   # TODO: test logic
-                    if negative_efficiency or efficiency >= 0:
-                        if direction:
-                            buses[bus]["outgoing_links_count"] += 1
-                            buses[bus_to]["incoming_links_count"] += 1
-                        else:
-                            buses[bus]["incoming_links_count"] += 1
-                            buses[bus_to]["outgoing_links_count"] += 1
-                    else:
-                        if direction:
-                            buses[bus]["incoming_links_count"] += 1
-                            buses[bus_to]["outgoing_links_count"] += 1
-                        else:
-                            buses[bus]["outgoing_links_count"] += 1
-                            buses[bus_to]["incoming_links_count"] += 1
+    # get digest of file content from key file (in case it exists and the file has not changed since it was written), the key file holding the state of the file followed by its digest
+    previous = None
+    try:
+        with open(key_file, "r") as handle:
+            values = handle.read().split()
+        if len(values) == 2:
+            if values[0] == state:
+                return values[1]
+            previous = values[1]
+    except OSError:
+        pass
+
+
+    # compute digest of file content (only done when the file is seen for the first time or has changed since then)
+    digest = hashlib.blake2b(digest_size = 32)
+    with open(file_input, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    digest.update(("%s|%d" % (__version__, _CACHE_FORMAT)).encode())
+    result = digest.hexdigest()
+
+
+    # write state and digest of file content into key file, replacing those of the previous version of the file (through a temporary file so that a partially written key file is never read by a concurrent process)
+    try:
+        os.makedirs(cache_directory, exist_ok = True)
+        with open("%s.%d.tmp" % (key_file, os.getpid()), "w") as handle:
+            handle.write("%s %s" % (state, result))
+        os.replace("%s.%d.tmp" % (key_file, os.getpid()), key_file)
+    except OSError:
+        pass
 
 
-        # process lines (attached to the bus)
-        lines = values0["lines"]
-        for values1 in lines:
-            line, bus1, carrier, s_nom_extendable, s_nom, capital_cost, s_nom_opt, p0_time_series, p1_time_series, direction, missing, selected = values1
-            if not missing or broken_missing:
-                if values0["selected"] and (not bus_filter or bus_filter.match(bus_to)) and (not line_filter or line_filter.match(line)) and (not carrier_filter or carrier_filter.match(carrier)):
-                    if carrier_color:
-                        if carrier and carrier not in carriers:
-                            carriers[carrier] = None
-                    values1[-1] = True
-                if values1[-1] or context:
-                    buses[bus]["lines_count"] += 1
-                    buses[bus1]["lines_count"] += 1
+    # remove cache file holding the topology of the previous version of the file (in case its content changed), so that the cache does not grow each time the file changes
+    if previous and previous != result:
+        try:
+            os.remove(os.path.join(cache_directory, "%s.topology" % previous))
+        except OSError:
+            pass
 
 
-    return carriers
+    return result
 
 
 
-def _represent_components(buses, carriers, negative_efficiency, broken_missing, carrier_color, context, log, log_info, log_warning):
+def _read_cache(cache_directory, file_input, log, log_info, log_warning):
     """
     Parameters
     ----------
-    buses : TYPE
-        DESCRIPTION.
-    carriers : TYPE
-        DESCRIPTION.
-    negative_efficiency : TYPE
-        DESCRIPTION.
-    broken_missing : TYPE
-        DESCRIPTION.
-    carrier_color : TYPE
+    cache_directory : TYPE
         DESCRIPTION.
-    context : TYPE
+    file_input : TYPE
         DESCRIPTION.
     log : TYPE
         DESCRIPTION.
@@ -802,398 +2754,521 @@ def _represent_components(buses, carriers, negative_efficiency, broken_missing,
 
     Returns
     -------
-    result : TYPE
+    TYPE
         DESCRIPTION.
     """
 
-    result = list()
-    result_buses = list()
-    result_generators = list()
-    result_loads = list()
-    result_stores = list()
-    result_storage_units = list()
-    result_links = list()
-    result_multi_link_trunks = list()
-    result_multi_link_branches = list()
-    result_lines = list()
+    # get cache file of (PyPSA) network
+    try:
+        cache_file = os.path.join(cache_directory, "%s.topology" % _get_cache_digest(cache_directory, file_input))
+    except OSError:
+        return None   # the file cannot be read (the error will be reported when reading it as a PyPSA network)
+    if not os.path.isfile(cache_file):
+        return None
 
 
-    # add carrier color table
-    if carrier_color:
-        if isinstance(carrier_color, bool) and carrier_color:
-            hue = 1.0 / (len(carriers) + 1)
-            i = 0
-            for key in carriers.keys():
-                red, green, blue = colorsys.hsv_to_rgb(hue * i, 1.0, 1.0)
-                carriers[key] = "#%02x%02x%02x" % (int(255 * red), int(255 * green), int(255 * blue))
-                i += 1
-        else:   # dictionary
-            carriers = carrier_color
-        result.append("   // carrier color table")
-        result.append("   \"Carrier Color Table\" [shape = \"none\" label = <")
-        result.append("      <table border = \"0\" cellborder = \"1\" cellspacing = \"0\" cellpadding = \"5\">")
-        result.append("         <tr>")
-        result.append("            <td width = \"110\" bgcolor = \"grey90\"><font color = \"black\"><b>CARRIER</b></font></td><td width = \"130\" bgcolor = \"grey92\"><font color = \"black\"><b>COLOR</b></font></td>")
-        result.append("         </tr>")
-        for key, value in carriers.items():
-            result.append("         <tr>")
-            result.append("            <td width = \"110\">%s</td><td width = \"130\" bgcolor = \"%s\"></td>" % (key, value))
-            result.append("         </tr>")
-        result.append("      </table>")
-        result.append("   >];")
-        result.append("")
-
-
-    # get component DOT representations
-    bus_representation = DOT_REPRESENTATION["BUS"]
-    missing_bus_representation = DOT_REPRESENTATION["MISSING_BUS"]
-    generator_representation = DOT_REPRESENTATION["GENERATOR"]
-    load_representation = DOT_REPRESENTATION["LOAD"]
-    store_representation = DOT_REPRESENTATION["STORE"]
-    storage_unit_representation = DOT_REPRESENTATION["STORAGE_UNIT"]
-    link_representation = DOT_REPRESENTATION["LINK"]
-    broken_link_representation = DOT_REPRESENTATION["BROKEN_LINK"]
-    bidirectional_link_representation = DOT_REPRESENTATION["BIDIRECTIONAL_LINK"]
-    broken_bidirectional_link_representation = DOT_REPRESENTATION["BROKEN_BIDIRECTIONAL_LINK"]
-    multi_link_point_representation = DOT_REPRESENTATION["MULTI_LINK_POINT"]
-    multi_link_trunk_representation = DOT_REPRESENTATION["MULTI_LINK_TRUNK"]
-    broken_multi_link_trunk_representation = DOT_REPRESENTATION["BROKEN_MULTI_LINK_TRUNK"]
-    multi_link_branch_representation = DOT_REPRESENTATION["MULTI_LINK_BRANCH"]
-    broken_multi_link_branch_representation = DOT_REPRESENTATION["BROKEN_MULTI_LINK_BRANCH"]
-    line_representation = DOT_REPRESENTATION["LINE"]
-    broken_line_representation = DOT_REPRESENTATION["BROKEN_LINE"]
+    # read topology of (PyPSA) network from cache file
+    if log or log_info:
+        print("[INF] Reading topology of network from cache file '%s'" % cache_file)
+    try:
+        with open(cache_file, "rb") as handle:
+            return pickle.load(handle)
+    except:
+        if log or log_warning:
+            print("[WAR] The cache file '%s' could not be read (the network will be extracted again)" % cache_file)
+        return None
 
 
-    # loop through existing buses
-    for bus, values in buses.items():
 
-        # represent bus in DOT
-        if values["missing"]:
-            if values["selected"]:
-                result_buses.append(missing_bus_representation % (bus, TEXT_COLOR, _replace(bus), bus, buses[bus]["generators_count"], buses[bus]["loads_count"], buses[bus]["stores_count"], buses[bus]["storage_units_count"], buses[bus]["incoming_links_count"], buses[bus]["outgoing_links_count"], buses[bus]["lines_count"], values["unit"], BUS_MINIMUM_WIDTH, BUS_THICKNESS, BROKEN_MISSING_COLOR))
-            elif context and broken_missing:
-                result_buses.append(missing_bus_representation % (bus, FADED_TEXT_COLOR, _replace(bus), bus, buses[bus]["generators_count"], buses[bus]["loads_count"], buses[bus]["stores_count"], buses[bus]["storage_units_count"], buses[bus]["incoming_links_count"], buses[bus]["outgoing_links_count"], buses[bus]["lines_count"], values["unit"], BUS_MINIMUM_WIDTH, BUS_THICKNESS, FADED_COMPONENT_COLOR))
-        else:
-            if values["selected"]:
-                bus_color = carriers[values["carrier"]] if values["carrier"] in carriers else BUS_COLOR
-                result_buses.append(bus_representation % (bus, TEXT_COLOR, _replace(bus), bus, values["carrier"], values["unit"], buses[bus]["generators_count"], buses[bus]["loads_count"], buses[bus]["stores_count"], buses[bus]["storage_units_count"], buses[bus]["incoming_links_count"], buses[bus]["outgoing_links_count"], buses[bus]["lines_count"], values["p_time_series"], values["unit"], BUS_MINIMUM_WIDTH, BUS_THICKNESS, bus_color))
-            elif context:
-                result_buses.append(bus_representation % (bus, FADED_TEXT_COLOR, _replace(bus), bus, values["carrier"], values["unit"], buses[bus]["generators_count"], buses[bus]["loads_count"], buses[bus]["stores_count"], buses[bus]["storage_units_count"], buses[bus]["incoming_links_count"], buses[bus]["outgoing_links_count"], buses[bus]["lines_count"], values["p_time_series"], values["unit"], BUS_MINIMUM_WIDTH, BUS_THICKNESS, FADED_COMPONENT_COLOR))
+def _write_cache(cache_directory, file_input, topology, log, log_info, log_warning):
+    """
+    Parameters
+    ----------
+    cache_directory : TYPE
+        DESCRIPTION.
+    file_input : TYPE
+        DESCRIPTION.
+    topology : TYPE
+        DESCRIPTION.
+    log : TYPE
+        DESCRIPTION.
+    log_info : TYPE
+        DESCRIPTION.
+    log_warning : TYPE
+        DESCRIPTION.
 
+    Returns
+    -------
+    None.
+    """
 
-        # represent generators (attached to the bus) in DOT
-        generators = values["generators"]
-        for generator, carrier, unit, p_nom_extendable, p_nom, p_set, efficiency, capital_cost, marginal_cost, p_nom_opt, p_time_series, selected in generators:
-            if selected:
-                generator_color = carriers[carrier] if carrier in carriers else GENERATOR_COLOR
-                result_generators.append(generator_representation % (generator, TEXT_COLOR, _replace(generator), generator, bus, carrier, p_nom_extendable, p_nom, unit, p_set, unit, efficiency, capital_cost, unit, marginal_cost, unit, p_nom_opt, unit, p_time_series, unit, GENERATOR_MINIMUM_WIDTH, GENERATOR_THICKNESS, generator_color, generator, bus, LINK_THICKNESS, generator_color))
-            elif context and (not values["missing"] or broken_missing):
-                result_generators.append(generator_representation % (generator, FADED_TEXT_COLOR, _replace(generator), generator, bus, carrier, p_nom_extendable, p_nom, unit, p_set, unit, efficiency, capital_cost, unit, marginal_cost, unit, p_nom_opt, unit, p_time_series, unit, GENERATOR_MINIMUM_WIDTH, GENERATOR_THICKNESS, FADED_COMPONENT_COLOR, generator, bus, LINK_THICKNESS, FADED_COMPONENT_COLOR))
+    # write topology of (PyPSA) network into cache file (through a temporary file so that a partially written cache file is never read)
+    try:
+        cache_file = os.path.join(cache_directory, "%s.topology" % _get_cache_digest(cache_directory, file_input))
+        if log or log_info:
+            print("[INF] Writing topology of network into cache file '%s'" % cache_file)
+        with open("%s.%d.tmp" % (cache_file, os.getpid()), "wb") as handle:
+            pickle.dump(topology, handle, protocol = pickle.HIGHEST_PROTOCOL)
+        os.replace("%s.%d.tmp" % (cache_file, os.getpid()), cache_file)
+    except:
+        if log or log_warning:
+            print("[WAR] The topology of network could not be written into cache directory '%s'" % cache_directory)
 
 
-        # represent loads (attached to the bus) in DOT
-        loads = values["loads"]
-        for load, carrier, unit, p_set, selected in loads:
-            if selected:
-                load_color = carriers[carrier] if carrier in carriers else LOAD_COLOR
-                result_loads.append(load_representation % (load, TEXT_COLOR, _replace(load), load, bus, carrier, p_set, unit, LOAD_MINIMUM_WIDTH, LOAD_MINIMUM_HEIGHT, LOAD_THICKNESS, load_color, bus, load, LINK_THICKNESS, load_color))
-            elif context and (not values["missing"] or broken_missing):
-                result_loads.append(load_representation % (load, FADED_TEXT_COLOR, _replace(load), load, bus, carrier, p_set, unit, LOAD_MINIMUM_WIDTH, LOAD_MINIMUM_HEIGHT, LOAD_THICKNESS, FADED_COMPONENT_COLOR, bus, load, LINK_THICKNESS, FADED_COMPONENT_COLOR))
 
+def _get_title(tooltip):
+    """
+    Parameters
+    ----------
+    tooltip : TYPE
+        DESCRIPTION.
 
-        # represent stores (attached to the bus) in DOT
-        stores = values["stores"]
-        for store, carrier, unit, e_nom_extendable, e_nom, p_set, e_cyclic, capital_cost, marginal_cost, e_nom_opt, e_time_series, p_time_series, selected in stores:
-            if selected:
-                store_color = carriers[carrier] if carrier in carriers else STORE_COLOR
-                result_stores.append(store_representation % (store, TEXT_COLOR, _replace(store), store, bus, carrier, e_nom_extendable, e_nom, unit, p_set, unit, e_cyclic, capital_cost, unit, marginal_cost, unit, e_nom_opt, unit, e_time_series, unit, p_time_series, unit, STORE_MINIMUM_WIDTH, STORE_THICKNESS, store_color, bus, store, LINK_THICKNESS, store_color))
-            elif context and (not values["missing"] or broken_missing):
-                result_stores.append(store_representation % (store, FADED_TEXT_COLOR, _replace(store), store, bus, carrier, e_nom_extendable, e_nom, unit, p_set, unit, e_cyclic, capital_cost, unit, marginal_cost, unit, e_nom_opt, unit, e_time_series, unit, p_time_series, unit, STORE_MINIMUM_WIDTH, STORE_THICKNESS, FADED_COMPONENT_COLOR, bus, store, LINK_THICKNESS, FADED_COMPONENT_COLOR))
+    Returns
+    -------
+    TYPE
+        DESCRIPTION.
+    """
 
+    # unescape double quotes of tooltip (giving up in case it holds any other escape sequence or an entity, as the tool 'dot' expands these, e.g. "\N" into the name of the node)
+    value = tooltip.replace("\\\"", "\"")
+    if "\\" in value or "&" in value and _ENTITY_REGEXP.search(value):
+        return None
 
-        # represent storage units (attached to the bus) in DOT
-        storage_units = values["storage_units"]
-        for storage_unit, carrier, unit, p_nom_extendable, p_nom, p_set, cyclic_state_charge, capital_cost, marginal_cost, p_nom_opt, p_time_series, selected in storage_units:
-            if selected:
-                storage_unit_color = carriers[carrier] if carrier in carriers else STORAGE_UNIT_COLOR
-                result_storage_units.append(storage_unit_representation % (storage_unit, TEXT_COLOR, _replace(storage_unit), storage_unit, bus, carrier, p_nom_extendable, p_nom, unit, p_set, unit, cyclic_state_charge, capital_cost, unit, marginal_cost, unit, p_nom_opt, unit, p_time_series, unit, STORAGE_UNIT_MINIMUM_WIDTH, STORAGE_UNIT_THICKNESS, storage_unit_color, bus, storage_unit, LINK_THICKNESS, storage_unit_color))
-            elif context and (not values["missing"] or broken_missing):
-                result_storage_units.append(storage_unit_representation % (storage_unit, FADED_TEXT_COLOR, _replace(storage_unit), storage_unit, bus, carrier, p_nom_extendable, p_nom, unit, p_set, unit, cyclic_state_charge, capital_cost, unit, marginal_cost, unit, p_nom_opt, unit, p_time_series, unit, STORAGE_UNIT_MINIMUM_WIDTH, STORAGE_UNIT_THICKNESS, FADED_COMPONENT_COLOR, bus, storage_unit, LINK_THICKNESS, FADED_COMPONENT_COLOR))
-
-        # represent links (attached to the bus) in DOT
-        links = values["links"]
-        for link, bus_to, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, p1_time_series, bidirectional, direction, missing, selected in links:
-            if missing:
-                if broken_missing:
-                    if selected:
-                        if bidirectional:
-                            if direction:   # TODO: check if this "if" makes sense for bidirectional links
-                                result_links.append(broken_bidirectional_link_representation % (bus, bus_to, TEXT_COLOR, _replace(link), "%s (broken)" % link, "%s (bus0)" % bus, "%s (bus1)" % bus_to, carrier, p_nom_extendable, p_nom, capital_cost, marginal_cost, LINK_THICKNESS, BROKEN_MISSING_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                            else:
-                                result_links.append(broken_bidirectional_link_representation % (bus_to, bus, TEXT_COLOR, _replace(link), "%s (broken)" % link, "%s (bus0)" % bus_to, "%s (bus1)" % bus, carrier, p_nom_extendable, p_nom, capital_cost, marginal_cost, LINK_THICKNESS, BROKEN_MISSING_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))   # TODO: check if "p0_time_series" needs to be inverted with "p1_time_series"
-                        elif negative_efficiency or efficiency >= 0:
-                            if direction:
-                                result_links.append(broken_link_representation % (bus, bus_to, TEXT_COLOR, _replace(link), "%s (broken)" % link, "%s (bus0)" % bus, "%s (bus1)" % bus_to, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, "p0", "p1", LINK_THICKNESS, BROKEN_MISSING_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                            else:
-                                result_links.append(broken_link_representation % (bus_to, bus, TEXT_COLOR, _replace(link), "%s (broken)" % link, "%s (bus0)" % bus_to, "%s (bus1)" % bus, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, LINK_THICKNESS, BROKEN_MISSING_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                        else:
-                            if direction:
-                                result_links.append(broken_link_representation % (bus_to, bus, TEXT_COLOR, _replace(link), "%s (broken & inverted)" % link, "%s (bus1)" % bus_to, "%s (bus0)" % bus, carrier, p_nom_extendable, p_nom, -efficiency, capital_cost, marginal_cost, "p1", "p0", LINK_THICKNESS, BROKEN_MISSING_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                            else:
-                                result_links.append(broken_link_representation % (bus, bus_to, TEXT_COLOR, _replace(link), "%s (broken & inverted)" % link, "%s (bus0)" % bus, "%s (bus1)" % bus_to, carrier, p_nom_extendable, p_nom, -efficiency, capital_cost, marginal_cost, LINK_THICKNESS, BROKEN_MISSING_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                    elif context:
-                        if bidirectional:
-                            if direction:   # TODO: check if this "if" makes sense for bidirectional links
-                                result_links.append(broken_bidirectional_link_representation % (bus, bus_to, FADED_TEXT_COLOR, _replace(link), "%s (broken)" % link, "%s (bus0)" % bus, "%s (bus1)" % bus_to, carrier, p_nom_extendable, p_nom, capital_cost, marginal_cost, LINK_THICKNESS, FADED_COMPONENT_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                            else:
-                                result_links.append(broken_bidirectional_link_representation % (bus_to, bus, FADED_TEXT_COLOR, _replace(link), "%s (broken)" % link, "%s (bus0)" % bus_to, "%s (bus1)" % bus, carrier, p_nom_extendable, p_nom, capital_cost, marginal_cost, LINK_THICKNESS, FADED_COMPONENT_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                        elif negative_efficiency or efficiency >= 0:
-                            if direction:
-                                result_links.append(broken_link_representation % (bus, bus_to, FADED_TEXT_COLOR, _replace(link), "%s (broken)" % link, "%s (bus0)" % bus, "%s (bus1)" % bus_to, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, "p0", "p1", LINK_THICKNESS, FADED_COMPONENT_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                            else:
-                                result_links.append(broken_link_representation % (bus_to, bus, FADED_TEXT_COLOR, _replace(link), "%s (broken)" % link, "%s (bus0)" % bus_to, "%s (bus1)" % bus, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, LINK_THICKNESS, FADED_COMPONENT_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                        else:
-                            if direction:
-                                result_links.append(broken_link_representation % (bus_to, bus, FADED_TEXT_COLOR, _replace(link), "%s (broken & inverted)" % link, "%s (bus1)" % bus_to, "%s (bus0)" % bus, carrier, p_nom_extendable, p_nom, -efficiency, capital_cost, marginal_cost, "p1", "p0", LINK_THICKNESS, FADED_COMPONENT_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                            else:
-                                result_links.append(broken_link_representation % (bus, bus_to, FADED_TEXT_COLOR, _replace(link), "%s (broken & inverted)" % link, "%s (bus0)" % bus, "%s (bus1)" % bus_to, carrier, p_nom_extendable, p_nom, -efficiency, capital_cost, marginal_cost, LINK_THICKNESS, FADED_COMPONENT_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-            else:
-                if selected:
-                    if bidirectional:
-                        if direction:   # TODO: check if this "if" makes sense for bidirectional links
-                            result_links.append(bidirectional_link_representation % (bus, bus_to, TEXT_COLOR, _replace(link), link, "%s (bus0)" % bus, "%s (bus1)" % bus_to, carrier, p_nom_extendable, p_nom, capital_cost, marginal_cost, p_nom_opt, p0_time_series, p1_time_series, LINK_THICKNESS, LINK_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                        else:
-                            result_links.append(bidirectional_link_representation % (bus_to, bus, TEXT_COLOR, _replace(link), link, "%s (bus0)" % bus_to, "%s (bus1)" % bus, carrier, p_nom_extendable, p_nom, capital_cost, marginal_cost, p_nom_opt, p0_time_series, p1_time_series, LINK_THICKNESS, LINK_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                    elif negative_efficiency or efficiency >= 0:
-                        if direction:
-                            result_links.append(link_representation % (bus, bus_to, TEXT_COLOR, _replace(link), link, "%s (bus0)" % bus, "%s (bus1)" % bus_to, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, "p0", p0_time_series, "p1", p1_time_series, LINK_THICKNESS, LINK_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                        else:
-                            result_links.append(link_representation % (bus_to, bus, TEXT_COLOR, _replace(link), link, "%s (bus0)" % bus_to, "%s (bus1)" % bus, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, "p0", p0_time_series, "p1", p1_time_series, LINK_THICKNESS, LINK_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                    else:
-                        if direction:
-                            result_links.append(link_representation % (bus_to, bus, TEXT_COLOR, _replace(link), "%s (inverted)" % link, "%s (bus1)" % bus_to, "%s (bus0)" % bus, carrier, p_nom_extendable, p_nom, -efficiency, capital_cost, marginal_cost, p_nom_opt, "p1", p1_time_series, "p0", p0_time_series, LINK_THICKNESS, LINK_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                        else:
-                            result_links.append(link_representation % (bus, bus_to, TEXT_COLOR, _replace(link), "%s (inverted)" % link, "%s (bus1)" % bus, "%s (bus0)" % bus_to, carrier, p_nom_extendable, p_nom, -efficiency, capital_cost, marginal_cost, p_nom_opt, "p1", p1_time_series, "p0", p0_time_series, LINK_THICKNESS, LINK_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                elif context:
-                    if bidirectional:
-                        if direction:   # TODO: check if this "if" makes sense for bidirectional links
-                            result_links.append(bidirectional_link_representation % (bus, bus_to, FADED_TEXT_COLOR, _replace(link), link, "%s (bus0)" % bus, "%s (bus1)" % bus_to, carrier, p_nom_extendable, p_nom, capital_cost, marginal_cost, p_nom_opt, p0_time_series, p1_time_series, LINK_THICKNESS, FADED_COMPONENT_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                        else:
-                            result_links.append(bidirectional_link_representation % (bus_to, bus, FADED_TEXT_COLOR, _replace(link), link, "%s (bus0)" % bus_to, "%s (bus1)" % bus, carrier, p_nom_extendable, p_nom, capital_cost, marginal_cost, p_nom_opt, p0_time_series, p1_time_series, LINK_THICKNESS, FADED_COMPONENT_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                    elif negative_efficiency or efficiency >= 0:
-                        if direction:
-                            result_links.append(link_representation % (bus, bus_to, FADED_TEXT_COLOR, _replace(link), link, "%s (bus0)" % bus, "%s (bus1)" % bus_to, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, "p0", p0_time_series, "p1", p1_time_series, LINK_THICKNESS, FADED_COMPONENT_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                        else:
-                            result_links.append(link_representation % (bus_to, bus, FADED_TEXT_COLOR, _replace(link), link, "%s (bus0)" % bus_to, "%s (bus1)" % bus, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, "p0", p0_time_series, "p1", p1_time_series, LINK_THICKNESS, FADED_COMPONENT_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                    else:
-                        if direction:
-                            result_links.append(link_representation % (bus_to, bus, FADED_TEXT_COLOR, _replace(link), "%s (inverted)" % link, "%s (bus1)" % bus_to, "%s (bus0)" % bus, carrier, p_nom_extendable, p_nom, -efficiency, capital_cost, marginal_cost, p_nom_opt, "p1", p1_time_series, "p0", p0_time_series, LINK_THICKNESS, FADED_COMPONENT_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                        else:
-                            result_links.append(link_representation % (bus, bus_to, FADED_TEXT_COLOR, _replace(link), "%s (inverted)" % link, "%s (bus1)" % bus, "%s (bus0)" % bus_to, carrier, p_nom_extendable, p_nom, -efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, p1_time_series, LINK_THICKNESS, FADED_COMPONENT_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
 
+    # escape tooltip as the tool 'dot' writes it into the title of an SVG file (i.e. the same title as it would have been written when generating the SVG file from scratch)
+    value = value.translate(_TITLE_TABLE)
+    if "  " in value:
+        value = _SPACE_REGEXP.sub("&#160;", value)
 
-        # represent multi-link trunks (attached to the bus) in DOT
-        multi_link_trunks = values["multi_link_trunks"]
-        for link, bus_to, bus_to_efficiencies, carrier, p_nom_extendable, p_nom, capital_cost, marginal_cost, p_nom_opt, p0_time_series, count, missing, selected in multi_link_trunks:
-            not_missing = count - missing
-            #bus_to = "1 bus (%d missing)" % missing if not_missing == 1 else "%d buses (%d missing)" % (not_missing, missing)
-            if not_missing == 0:
-                if broken_missing:
-                    bus_to = "\n".join(bus_to)
-                    bus_to_efficiencies = "\n".join(bus_to_efficiencies)
-                    if selected:
-                        result_multi_link_trunks.append(multi_link_point_representation % (link, TEXT_COLOR, _replace(link), "%s (broken)" % link, bus, bus_to, bus_to_efficiencies, carrier, p_nom_extendable, p_nom, capital_cost, marginal_cost, p_nom_opt, p0_time_series, MULTI_LINK_POINT_WIDTH, BROKEN_MISSING_COLOR))
-                        result_multi_link_trunks.append(broken_multi_link_trunk_representation % (bus, link, TEXT_COLOR, _replace(link), link, bus, bus_to, bus_to_efficiencies, carrier, p_nom_extendable, p_nom, capital_cost, marginal_cost, LINK_THICKNESS, BROKEN_MISSING_COLOR))
-                    elif context:
-                        result_multi_link_trunks.append(multi_link_point_representation % (link, FADED_TEXT_COLOR, _replace(link), "%s (broken)" % link, bus, bus_to, bus_to_efficiencies, carrier, p_nom_extendable, p_nom, capital_cost, marginal_cost, p_nom_opt, p0_time_series, MULTI_LINK_POINT_WIDTH, FADED_COMPONENT_COLOR))
-                        result_multi_link_trunks.append(broken_multi_link_trunk_representation % (bus, link, FADED_TEXT_COLOR, _replace(link), "%s (broken)" % link, bus, bus_to, bus_to_efficiencies, carrier, p_nom_extendable, p_nom, capital_cost, marginal_cost, p_nom_opt, LINK_THICKNESS, FADED_COMPONENT_COLOR))
-            else:
-                bus_to = "\n".join(bus_to) if broken_missing else "\n".join(bus_to[:not_missing])
-                bus_to_efficiencies = "\n".join(bus_to_efficiencies) if broken_missing else "\n".join(bus_to_efficiencies[:not_missing])
-                if selected:
-                    result_multi_link_trunks.append(multi_link_point_representation % (link, TEXT_COLOR, _replace(link), link, bus, bus_to, bus_to_efficiencies, carrier, p_nom_extendable, p_nom, capital_cost, marginal_cost, p_nom_opt, p0_time_series, MULTI_LINK_POINT_WIDTH, LINK_COLOR))
-                    result_multi_link_trunks.append(multi_link_trunk_representation % (bus, link, TEXT_COLOR, _replace(link), link, bus, bus_to, bus_to_efficiencies, carrier, p_nom_extendable, p_nom, capital_cost, marginal_cost, p_nom_opt, p0_time_series, LINK_THICKNESS, LINK_COLOR))
-                elif context:
-                    result_multi_link_trunks.append(multi_link_point_representation % (link, FADED_TEXT_COLOR, _replace(link), link, bus, bus_to, bus_to_efficiencies, carrier, p_nom_extendable, p_nom, capital_cost, marginal_cost, p_nom_opt, p0_time_series, MULTI_LINK_POINT_WIDTH, FADED_COMPONENT_COLOR))
-                    result_multi_link_trunks.append(multi_link_trunk_representation % (bus, link, FADED_TEXT_COLOR, _replace(link), link, bus, bus_to, bus_to_efficiencies, carrier, p_nom_extendable, p_nom, capital_cost, marginal_cost, p_nom_opt, p0_time_series, LINK_THICKNESS, FADED_COMPONENT_COLOR))
 
+    return value
 
-        # process multi-link branches (attached to the bus)
-        # TODO: test this logic
-        multi_link_branches = values["multi_link_branches"]
-        for link, bus_to, bus_value, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, px, px_time_series, index, direction, selected in multi_link_branches:
-            if values["missing"] or buses[bus_to]["missing"]:
-                if broken_missing:
-                    if selected:
-                        if negative_efficiency or efficiency >= 0:
-                            #if direction:
-                            if True:
-                                result_multi_link_branches.append(broken_multi_link_branch_representation % ("%s (multi-link)" % link, "%s (bus)" % bus_to, TEXT_COLOR, _replace(link), "%s (broken)" % link, "%s (bus0)" % bus, "%s (%s)" % (bus_to, bus_value), carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, "p0", p0_time_series, px, "N/A", LINK_THICKNESS, BROKEN_MISSING_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                            #else:
-                            #    result_multi_link_branches.append(broken_multi_link_branch_representation % ("%s (bus)" % bus_to, "%s (multi-link)" % link, TEXT_COLOR, _replace(link), "%s (broken)" % link, "%s (bus0)" % bus, "%s (%s)" % (bus_to, bus_value), carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, "p0", p0_time_series, px, "N/A", LINK_THICKNESS, BROKEN_MISSING_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                        else:
-                            #if direction:
-                            if True:
-                                result_multi_link_branches.append(broken_multi_link_branch_representation % ("%s (bus)" % bus_to, "%s (multi-link)" % link, TEXT_COLOR, _replace(link), "%s (broken & inverted)" % link, "%s (%s)" % (bus_to, bus_value), "%s (bus0)" % bus, carrier, p_nom_extendable, p_nom, -efficiency, capital_cost, marginal_cost, px, "N/A", "p0", p0_time_series, LINK_THICKNESS, BROKEN_MISSING_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                            #else:
-                            #    result_multi_link_branches.append(broken_multi_link_branch_representation % ("%s (multi-link)" % link, "%s (bus)" % bus_to, TEXT_COLOR, _replace(link), "%s (broken & inverted)" % link, "%s (%s)" % (bus_to, bus_value), "%s (bus0)" % bus, carrier, p_nom_extendable, p_nom, -efficiency, capital_cost, marginal_cost, px, "N/A", "p0", p0_time_series, LINK_THICKNESS, BROKEN_MISSING_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                    elif context:
-                        if negative_efficiency or efficiency >= 0:
-                            #if direction:
-                            if True:
-                                result_multi_link_branches.append(broken_multi_link_branch_representation % ("%s (multi-link)" % link, "%s (bus)" % bus_to, FADED_TEXT_COLOR, _replace(link), "%s (broken)" % link, "%s (bus0)" % bus, "%s (%s)" % (bus_to, bus_value), carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, "p0", p0_time_series, px, "N/A", LINK_THICKNESS, FADED_COMPONENT_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                            #else:
-                            #    result_multi_link_branches.append(broken_multi_link_branch_representation % ("%s (bus)" % bus_to, "%s (multi-link)" % link, FADED_TEXT_COLOR, _replace(link), "%s (broken)" % link, "%s (bus0)" % bus, "%s (%s)" % (bus_to, bus_value), carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, "p0", p0_time_series, px, "N/A", LINK_THICKNESS, FADED_COMPONENT_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                        else:
-                            #if direction:
-                            if True:
-                                result_multi_link_branches.append(broken_multi_link_branch_representation % ("%s (bus)" % bus_to, "%s (multi-link)" % link, FADED_TEXT_COLOR, _replace(link), "%s (broken & inverted)" % link, "%s (%s)" % (bus_to, bus_value), "%s (bus0)" % bus, carrier, p_nom_extendable, p_nom, -efficiency, capital_cost, marginal_cost, px, "N/A", "p0", p0_time_series, LINK_THICKNESS, FADED_COMPONENT_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                            #else:
-                            #    result_multi_link_branches.append(broken_multi_link_branch_representation % ("%s (multi-link)" % link, "%s (bus)" % bus_to, FADED_TEXT_COLOR, _replace(link), "%s (broken & inverted)" % link, "%s (%s)" % (bus_to, bus_value), "%s (bus0)" % bus, carrier, p_nom_extendable, p_nom, -efficiency, capital_cost, marginal_cost, px, "N/A", "p0", p0_time_series, LINK_THICKNESS, FADED_COMPONENT_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-            else:   # TODO: ok in terms of the logic in this "else"
-                if selected:
-                    if negative_efficiency or efficiency >= 0:
-                        if direction:
-                            result_multi_link_branches.append(multi_link_branch_representation % ("%s (multi-link)" % link, "%s (bus)" % bus_to, TEXT_COLOR, _replace(link), link, "%s (bus0)" % bus, "%s (%s)" % (bus_to, bus_value), carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, "p0", p0_time_series, px, px_time_series, LINK_THICKNESS, LINK_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                        else:
-                            result_multi_link_branches.append(multi_link_branch_representation % ("%s (multi-link)" % link, "%s (bus)" % bus, TEXT_COLOR, _replace(link), link, "%s (bus0)" % bus_to, "%s (%s)" % (bus, bus_value), carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, "p0", p0_time_series, px, px_time_series, LINK_THICKNESS, LINK_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                    else:
-                        if direction:
-                            result_multi_link_branches.append(multi_link_branch_representation % ("%s (bus)" % bus_to, "%s (multi-link)" % link, TEXT_COLOR, _replace(link), "%s (inverted)" % link, "%s (%s)" % (bus_to, bus_value), "%s (bus0)" % bus, carrier, p_nom_extendable, p_nom, -efficiency, capital_cost, marginal_cost, p_nom_opt, px, px_time_series, "p0", p0_time_series, LINK_THICKNESS, LINK_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                        else:
-                            result_multi_link_branches.append(multi_link_branch_representation % ("%s (bus)" % bus, "%s (multi-link)" % link, TEXT_COLOR, _replace(link), "%s (inverted)" % link, "%s (%s)" % (bus, bus_value), "%s (bus0)" % bus_to, carrier, p_nom_extendable, p_nom, -efficiency, capital_cost, marginal_cost, p_nom_opt, px, px_time_series, "p0", p0_time_series, LINK_THICKNESS, LINK_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                elif context:
-                    if negative_efficiency or efficiency >= 0:
-                        if direction:
-                            result_multi_link_branches.append(multi_link_branch_representation % ("%s (multi-link)" % link, "%s (bus)" % bus_to, FADED_TEXT_COLOR, _replace(link), link, "%s (bus0)" % bus, "%s (%s)" % (bus_to, bus_value), carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, "p0", p0_time_series, px, px_time_series, LINK_THICKNESS, FADED_COMPONENT_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                        else:
-                            result_multi_link_branches.append(multi_link_branch_representation % ("%s (multi-link)" % link, "%s (bus)" % bus, FADED_TEXT_COLOR, _replace(link), link, "%s (bus0)" % bus_to, "%s (%s)" % (bus, bus_value), carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, "p0", p0_time_series, px, px_time_series, LINK_THICKNESS, FADED_COMPONENT_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                    else:
-                        if direction:
-                            result_multi_link_branches.append(multi_link_branch_representation % ("%s (bus)" % bus_to, "%s (multi-link)" % link, FADED_TEXT_COLOR, _replace(link), "%s (inverted)" % link, "%s (%s)" % (bus_to, bus_value), "%s (bus0)" % bus, carrier, p_nom_extendable, p_nom, -efficiency, capital_cost, marginal_cost, p_nom_opt, px, px_time_series, "p0", p0_time_series, LINK_THICKNESS, FADED_COMPONENT_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
-                        else:
-                            result_multi_link_branches.append(multi_link_branch_representation % ("%s (bus)" % bus, "%s (multi-link)" % link, FADED_TEXT_COLOR, _replace(link), "%s (inverted)" % link, "%s (%s)" % (bus, bus_value), "%s (bus0)" % bus_to, carrier, p_nom_extendable, p_nom, -efficiency, capital_cost, marginal_cost, p_nom_opt, px, px_time_series, "p0", p0_time_series, LINK_THICKNESS, FADED_COMPONENT_COLOR, LINK_ARROW_SHAPE, LINK_ARROW_SIZE))
 
 
-        # represent lines (attached to the bus) in DOT
-        lines = values["lines"]
-        for line, bus1, carrier, s_nom_extendable, s_nom, capital_cost, s_nom_opt, p0_time_series, p1_time_series, direction, missing, selected in lines:
-            if missing:
-                if broken_missing:
-                    if selected:
-                        if direction:
-                            result_lines.append(broken_line_representation % (bus, bus1, TEXT_COLOR, _replace(line), "%s (broken)" % line, bus, bus1, carrier, s_nom_extendable, s_nom, capital_cost, LINE_THICKNESS, BROKEN_MISSING_COLOR, LINE_ARROW_SHAPE, LINE_ARROW_SHAPE, LINE_ARROW_SIZE))
-                        else:
-                            result_lines.append(broken_line_representation % (bus1, bus, TEXT_COLOR, _replace(line), "%s (broken)" % line, bus1, bus, carrier, s_nom_extendable, s_nom, capital_cost, LINE_THICKNESS, BROKEN_MISSING_COLOR, LINE_ARROW_SHAPE, LINE_ARROW_SHAPE, LINE_ARROW_SIZE))
-                    elif context:
-                        if direction:
-                            result_lines.append(broken_line_representation % (bus, bus1, FADED_TEXT_COLOR, _replace(line), "%s (broken)" % line, bus, bus1, carrier, s_nom_extendable, s_nom, capital_cost, LINE_THICKNESS, FADED_COMPONENT_COLOR, LINE_ARROW_SHAPE, LINE_ARROW_SHAPE, LINE_ARROW_SIZE))
-                        else:
-                            result_lines.append(broken_line_representation % (bus1, bus, FADED_TEXT_COLOR, _replace(line), "%s (broken)" % line, bus1, bus, carrier, s_nom_extendable, s_nom, capital_cost, LINE_THICKNESS, FADED_COMPONENT_COLOR, LINE_ARROW_SHAPE, LINE_ARROW_SHAPE, LINE_ARROW_SIZE))
-            else:
-                if selected:
-                    line_color = carriers[carrier] if carrier in carriers else LINE_COLOR
-                    if direction:
-                        result_lines.append(line_representation % (bus, bus1, TEXT_COLOR, _replace(line), line, bus, bus1, carrier, s_nom_extendable, s_nom, capital_cost, s_nom_opt, p0_time_series, p1_time_series, LINE_THICKNESS, line_color, LINE_ARROW_SHAPE, LINE_ARROW_SHAPE, LINE_ARROW_SIZE))
-                    else:
-                        result_lines.append(line_representation % (bus1, bus, TEXT_COLOR, _replace(line), line, bus1, bus, carrier, s_nom_extendable, s_nom, capital_cost, s_nom_opt, p0_time_series, p1_time_series, LINE_THICKNESS, line_color, LINE_ARROW_SHAPE, LINE_ARROW_SHAPE, LINE_ARROW_SIZE))
-                elif context:
-                    if direction:
-                        result_lines.append(line_representation % (bus, bus1, FADED_TEXT_COLOR, _replace(line), line, bus, bus1, carrier, s_nom_extendable, s_nom, capital_cost, s_nom_opt, p0_time_series, p1_time_series, LINE_THICKNESS, FADED_COMPONENT_COLOR, LINE_ARROW_SHAPE, LINE_ARROW_SHAPE, LINE_ARROW_SIZE))
-                    else:
-                        result_lines.append(line_representation % (bus1, bus, FADED_TEXT_COLOR, _replace(line), line, bus1, bus, carrier, s_nom_extendable, s_nom, capital_cost, s_nom_opt, p1_time_series, p0_time_series, LINE_THICKNESS, FADED_COMPONENT_COLOR, LINE_ARROW_SHAPE, LINE_ARROW_SHAPE, LINE_ARROW_SIZE))
+def _reuse_layout(render_cache_directory, key, file_output, file_format, tooltips):
+    """
+    Parameters
+    ----------
+    render_cache_directory : TYPE
+        DESCRIPTION.
+    key : TYPE
+        DESCRIPTION.
+    file_output : TYPE
+        DESCRIPTION.
+    file_format : TYPE
+        DESCRIPTION.
+    tooltips : TYPE
+        DESCRIPTION.
 
+    Returns
+    -------
+    TYPE
+        DESCRIPTION.
+    """
 
-    # add buses to result
-    result.append("   // buses (%d)" % len(result_buses))
-    result.extend(result_buses)
-    result.append("")
+    # copy output file from the render cache as is in case it is not an SVG file (as tooltips are only found in these)
+    cache_file = os.path.join(render_cache_directory, "%s.%s" % (key, file_format))
+    if file_format != "svg":
+        try:
+            shutil.copyfile(cache_file, file_output)
+            os.utime(cache_file)
+        except OSError:
+            return False
+        return True
 
 
-    # add generators to result
-    result.append("   // generators (%d)" % len(result_generators))
-    result.extend(result_generators)
-    result.append("")
+    # read SVG file and the tooltips it was generated with from the render cache
+    tooltips_file = os.path.join(render_cache_directory, "%s.tooltips" % key)
+    try:
+        with open(cache_file, "r", encoding = "utf-8") as handle:
+            text = handle.read()
+        with open(tooltips_file, "r", encoding = "utf-8") as handle:
+            previous = json.load(handle)
+    except (OSError, ValueError):
+        return False
+
+
+    # map tooltips the SVG file was generated with onto the current tooltips (as both are listed in the same order given that the DOT representations only differ in these), both written as the tool 'dot' writes them into SVG files, which is only possible when equal tooltips are always mapped onto equal tooltips
+    if len(previous) != len(tooltips):
+        return False
+    mapping = dict()
+    for value0, value1 in zip(previous, tooltips):
+        value0 = _get_title(value0)
+        value1 = _get_title(value1)
+        if value0 is None or value1 is None or mapping.setdefault(value0, value1) != value1:
+            return False
+
+
+    # rewrite tooltips of SVG file (giving up in case any of these cannot be mapped, as it would be left outdated)
+    result = list()
+    position = 0
+    for match in _TITLE_REGEXP.finditer(text):
+        value = mapping.get(match.group(1))
+        if value is None:
+            return False
+        result.append(text[position:match.start(1)])
+        result.append(value)
+        position = match.end(1)
+    result.append(text[position:])
+
+
+    # write output file (marking render cache files as recently used)
+    try:
+        with open(file_output, "w", encoding = "utf-8") as handle:
+            handle.write("".join(result))
+        os.utime(cache_file)
+        os.utime(tooltips_file)
+    except OSError:
+        return False
 
 
-    # add loads to result
-    result.append("   // loads (%d)" % len(result_loads))
-    result.extend(result_loads)
-    result.append("")
+    return True
 
 
-    # add stores to result
-    result.append("   // stores (%d)" % len(result_stores))
-    result.extend(result_stores)
-    result.append("")
 
+def _write_render_cache(render_cache_directory, key, file_outputs, file_formats, tooltips, log, log_info, log_warning):
+    """
+    Parameters
+    ----------
+    render_cache_directory : TYPE
+        DESCRIPTION.
+    key : TYPE
+        DESCRIPTION.
+    file_outputs : TYPE
+        DESCRIPTION.
+    file_formats : TYPE
+        DESCRIPTION.
+    tooltips : TYPE
+        DESCRIPTION.
+    log : TYPE
+        DESCRIPTION.
+    log_info : TYPE
+        DESCRIPTION.
+    log_warning : TYPE
+        DESCRIPTION.
+
+    Returns
+    -------
+    None.
+    """
 
-    # add storage units to result
-    result.append("   // storage units (%d)" % len(result_storage_units))
-    result.extend(result_storage_units)
-    result.append("")
+    # copy output files into render cache files (through temporary files so that a partially written cache file is never read)
+    try:
+        os.makedirs(render_cache_directory, exist_ok = True)
+        for file_output, file_format in zip(file_outputs, file_formats):
+            cache_file = os.path.join(render_cache_directory, "%s.%s" % (key, file_format))
+            if log or log_info:
+                print("[INF] Writing output file '%s' into render cache file '%s'" % (file_output, cache_file))
+            shutil.copyfile(file_output, "%s.%d.tmp" % (cache_file, os.getpid()))
+            os.replace("%s.%d.tmp" % (cache_file, os.getpid()), cache_file)
+        if tooltips is not None:   # layout to be reused (whose SVG file is rewritten with the tooltips of subsequent renderings, these being mapped from the tooltips it was generated with)
+            cache_file = os.path.join(render_cache_directory, "%s.tooltips" % key)
+            with open("%s.%d.tmp" % (cache_file, os.getpid()), "w", encoding = "utf-8") as handle:
+                json.dump(tooltips, handle)
+            os.replace("%s.%d.tmp" % (cache_file, os.getpid()), cache_file)
+    except OSError:
+        if log or log_warning:
+            print("[WAR] The output file(s) could not be written into render cache directory '%s'" % render_cache_directory)
+        return
 
 
-    # add links to result
-    result.append("   // links (%d)" % len(result_links))
-    result.extend(result_links)
-    result.append("")
+    # evict least recently used render cache files (i.e. those with the oldest modification times, as these are updated whenever the files are read) until the render cache does not exceed its size
+    try:
+        entries = sorted((entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in os.scandir(render_cache_directory) if entry.is_file() and not entry.name.endswith(".tmp"))
+    except OSError:
+        return
+    size = sum(value[1] for value in entries)
+    for modification_time, file_size, cache_file in entries:
+        if size <= RENDER_CACHE_SIZE:
+            break
+        if log or log_info:
+            print("[INF] Evicting render cache file '%s'" % cache_file)
+        try:
+            os.remove(cache_file)
+        except OSError:
+            continue
+        size -= file_size
 
 
-    # add multi-link trunks to result
-    result.append("   // multi-link trunks (%d)" % (len(result_multi_link_trunks) / 2))
-    result.extend(result_multi_link_trunks)
-    result.append("")
 
+def _run_dot(arguments, lines, handle, spool, file_output_dot, layout_engine, render_timeout, capture, log, log_info, log_warning):
+    """
+    Parameters
+    ----------
+    arguments : TYPE
+        DESCRIPTION.
+    lines : TYPE
+        DESCRIPTION.
+    handle : TYPE
+        DESCRIPTION.
+    spool : TYPE
+        DESCRIPTION.
+    file_output_dot : TYPE
+        DESCRIPTION.
+    layout_engine : TYPE
+        DESCRIPTION.
+    render_timeout : TYPE
+        DESCRIPTION.
+    capture : TYPE
+        DESCRIPTION.
+    log : TYPE
+        DESCRIPTION.
+    log_info : TYPE
+        DESCRIPTION.
+    log_warning : TYPE
+        DESCRIPTION.
 
-    # add multi-link branches to result
-    result.append("   // multi-link branches (%d)" % len(result_multi_link_branches))
-    result.extend(result_multi_link_branches)
-    result.append("")
+    Returns
+    -------
+    TYPE
+        DESCRIPTION.
+    """
+
+    # launch the tool 'dot' reading the DOT representation from its standard input, its errors going to a temporary file so that it never blocks on a full pipe (in case the DOT representation was spooled, the tool reads it from the spool file instead)
+    errors = tempfile.TemporaryFile()
+    try:
+        start = time.perf_counter()
+        try:
+            process = subprocess.Popen(arguments, stdin = spool if spool else subprocess.PIPE, stdout = subprocess.DEVNULL if capture is None else subprocess.PIPE, stderr = errors)
+        except FileNotFoundError:
+            process = None
+            status = "[ERR] The tool 'dot' is not installed or could not be found (please visit https://graphviz.org/download to download and install it)!"
+        except:
+            process = None
+            status = "[ERR] The tool 'dot' generated an error!"
+        pipe = process.stdin if process else None
 
 
-    # add lines to result
-    result.append("   // lines (%d)" % len(result_lines))
-    result.extend(result_lines)
+        # stream DOT representation (in batches of lines as these are yielded) into the DOT file and the standard input of the tool 'dot' (i.e. without holding the whole representation in memory) and wait for the latter to finish (killing it in case it exceeds the render timeout)
+        try:
+            while True:
+                batch = list(islice(lines, _BATCH_SIZE))
+                if not batch:
+                    break
+                if process and render_timeout and time.perf_counter() - start > render_timeout:
+                    raise subprocess.TimeoutExpired(process.args, render_timeout)
+                if handle:
+                    handle.write("%s%s" % (os.linesep.join(batch), os.linesep))
+                if pipe:
+                    try:
+                        pipe.write(("%s\n" % "\n".join(batch)).encode("utf-8"))
+                    except OSError:   # the tool 'dot' stopped reading (its error is reported below)
+                        pipe = None
+                elif not handle:
+                    break
+            if handle:
+                handle.write(os.linesep)
+                handle.close()
+            if process:
+                try:
+                    if pipe:
+                        pipe.write(b"\n")
+                    if process.stdin and capture is None:
+                        process.stdin.close()
+                except OSError:
+                    pass
+                if capture is None:
+                    process.wait(timeout = max(render_timeout - (time.perf_counter() - start), 0) if render_timeout else None)
+                else:   # standard output captured (read while waiting for the tool 'dot' to finish, so that it never blocks on a full pipe)
+                    capture.append(process.communicate(timeout = max(render_timeout - (time.perf_counter() - start), 0) if render_timeout else None)[0])
+        except subprocess.TimeoutExpired:
+            if handle:
+                handle.close()
+            process.kill()
+            process.wait()
+            if log or log_warning:
+                print("[WAR] The tool 'dot' exceeded the render timeout of %s seconds with layout engine '%s' and was killed" % (render_timeout, layout_engine))
+            return _TIMEOUT_STATUS   # return unsuccessfully
+        except KeyboardInterrupt:
+            if handle:
+                handle.close()
+            if process:
+                process.kill()
+                process.wait()
+            if log or log_warning:
+                print("[WAR] Terminated by user request!")
+            return _INTERRUPTED_STATUS   # return successfully
+        except OSError:
+            if handle:
+                handle.close()
+            if process:
+                process.kill()
+                process.wait()
+            print("[ERR] The file '%s' could not be written!" % file_output_dot)
+            return -1   # return unsuccessfully
+
+
+        # check if the tool 'dot' was successful
+        if not process:
+            print(status)
+            return -1   # return unsuccessfully
+        if process.returncode:
+            errors.seek(0)
+            print("[ERR] The tool 'dot' generated an error (%s)!" % errors.read().decode("utf-8", "replace").strip())
+            return -1   # return unsuccessfully (the exit status of the tool 'dot' not being returned as it is, since its negative values, i.e. killed by a signal, could be mistaken for the statuses of a timeout or an interruption)
+        if log or log_info:
+            print("[INF] Laid out and rendered topographical representation of the network with layout engine '%s' in %.2f seconds" % (layout_engine, time.perf_counter() - start))
 
 
-    return result, len(result_buses), len(result_generators), len(result_loads), len(result_stores), len(result_storage_units), len(result_links) + len(result_multi_link_trunks) / 2, len(result_lines)
+        return 0   # return successfully
+    finally:   # close the temporary file holding the errors of the tool 'dot' however it ends
+        errors.close()
 
 
 
-def _focus(components, bus, neighbourhood, bus_filter, generator_filter, load_filter, store_filter, storage_unit_filter, link_filter, line_filter, carrier_filter, negative_efficiency, broken_missing, carrier_color, context, log, log_info, log_warning, carriers):
+async def _run_dot_async(arguments, lines, handle, spool, file_output_dot, layout_engine, render_timeout, capture, log, log_info, log_warning):
     """
     Parameters
     ----------
-    components : TYPE
+    arguments : TYPE
         DESCRIPTION.
-    bus : TYPE
+    lines : TYPE
         DESCRIPTION.
-    neighbourhood : TYPE
+    handle : TYPE
         DESCRIPTION.
-    bus_filter : TYPE
+    spool : TYPE
         DESCRIPTION.
-    generator_filter : TYPE
+    file_output_dot : TYPE
         DESCRIPTION.
-    load_filter : TYPE
+    layout_engine : TYPE
         DESCRIPTION.
-    store_filter : TYPE
+    render_timeout : TYPE
         DESCRIPTION.
-    storage_unit_filter : TYPE
+    capture : TYPE
         DESCRIPTION.
-    link_filter : TYPE
+    log : TYPE
         DESCRIPTION.
-    line_filter : TYPE
+    log_info : TYPE
         DESCRIPTION.
-    carrier_filter : TYPE
+    log_warning : TYPE
         DESCRIPTION.
-    negative_efficiency : TYPE
+
+    Returns
+    -------
+    TYPE
         DESCRIPTION.
-    broken_missing : TYPE
+    """
+
+    errors = None
+    try:
+        # wait until the number of processes of the tool 'dot' running concurrently (in the current event loop) is below the maximum allowed
+        loop = asyncio.get_running_loop()
+        if loop not in _SEMAPHORES:
+            _SEMAPHORES[loop] = asyncio.Semaphore(RENDER_PROCESSES)
+        async with _SEMAPHORES[loop]:
+
+
+            # launch the tool 'dot' (as an asynchronous subprocess) reading the DOT representation from its standard input, its errors going to a temporary file so that it never blocks on a full pipe (in case the DOT representation was spooled, the tool reads it from the spool file instead)
+            errors = tempfile.TemporaryFile()
+            start = time.perf_counter()
+            try:
+                process = await asyncio.create_subprocess_exec(*arguments, stdin = spool if spool else asyncio.subprocess.PIPE, stdout = asyncio.subprocess.DEVNULL if capture is None else asyncio.subprocess.PIPE, stderr = errors)
+            except FileNotFoundError:
+                process = None
+                status = "[ERR] The tool 'dot' is not installed or could not be found (please visit https://graphviz.org/download to download and install it)!"
+            except:
+                process = None
+                status = "[ERR] The tool 'dot' generated an error!"
+            pipe = process.stdin if process else None
+
+
+            # stream DOT representation (in batches of lines as these are yielded) into the DOT file and the standard input of the tool 'dot' (giving control back to the event loop whenever the latter is full) and wait for the tool to finish (killing it in case it exceeds the render timeout)
+            try:
+                while True:
+                    batch = list(islice(lines, _BATCH_SIZE))
+                    if not batch:
+                        break
+                    if process and render_timeout and time.perf_counter() - start > render_timeout:
+                        raise asyncio.TimeoutError()
+                    if handle:
+                        handle.write("%s%s" % (os.linesep.join(batch), os.linesep))
+                    if pipe:
+                        try:
+                            pipe.write(("%s\n" % "\n".join(batch)).encode("utf-8"))
+                            await pipe.drain()
+                        except OSError:   # the tool 'dot' stopped reading (its error is reported below)
+                            pipe = None
+                    elif not handle:
+                        break
+                if handle:
+                    handle.write(os.linesep)
+                    handle.close()
+                if process:
+                    try:
+                        if pipe:
+                            pipe.write(b"\n")
+                            await pipe.drain()
+                        if process.stdin:
+                            process.stdin.close()
+                    except OSError:
+                        pass
+                    if capture is None:
+                        await asyncio.wait_for(process.wait(), timeout = max(render_timeout - (time.perf_counter() - start), 0) if render_timeout else None)
+                    else:   # standard output captured (read while waiting for the tool 'dot' to finish, so that it never blocks on a full pipe)
+                        capture.append((await asyncio.wait_for(process.communicate(), timeout = max(render_timeout - (time.perf_counter() - start), 0) if render_timeout else None))[0])
+            except asyncio.TimeoutError:
+                if handle:
+                    handle.close()
+                process.kill()
+                await process.wait()
+                if log or log_warning:
+                    print("[WAR] The tool 'dot' exceeded the render timeout of %s seconds with layout engine '%s' and was killed" % (render_timeout, layout_engine))
+                return _TIMEOUT_STATUS   # return unsuccessfully
+            except asyncio.CancelledError:   # the task rendering the network was cancelled (the tool 'dot' being killed before propagating the cancellation)
+                if handle:
+                    handle.close()
+                if process and process.returncode is None:
+                    process.kill()
+                    await process.wait()
+                raise
+            except OSError:
+                if handle:
+                    handle.close()
+                if process:
+                    process.kill()
+                    await process.wait()
+                print("[ERR] The file '%s' could not be written!" % file_output_dot)
+                return -1   # return unsuccessfully
+
+
+        # check if the tool 'dot' was successful
+        if not process:
+            print(status)
+            return -1   # return unsuccessfully
+        if process.returncode:
+            errors.seek(0)
+            print("[ERR] The tool 'dot' generated an error (%s)!" % errors.read().decode("utf-8", "replace").strip())
+            return -1   # return unsuccessfully (the exit status of the tool 'dot' not being returned as it is, since its negative values, i.e. killed by a signal, could be mistaken for the statuses of a timeout or an interruption)
+        if log or log_info:
+            print("[INF] Laid out and rendered topographical representation of the network with layout engine '%s' in %.2f seconds" % (layout_engine, time.perf_counter() - start))
+
+
+        return 0   # return successfully
+    finally:   # close the temporary file holding the errors of the tool 'dot' however it ends
+        if errors:
+            errors.close()
+
+
+
+def _generate_output(dot_representation, file_outputs, file_formats, layout_engine, render_timeout, render_cache_directory, reuse_layout, outputs, log, log_info, log_warning):
+    """
+    Parameters
+    ----------
+    dot_representation : TYPE
         DESCRIPTION.
-    carrier_color : TYPE
+    file_outputs : TYPE
         DESCRIPTION.
-    context : TYPE
+    file_formats : TYPE
+        DESCRIPTION.
+    layout_engine : TYPE
+        DESCRIPTION.
+    render_timeout : TYPE
+        DESCRIPTION.
+    render_cache_directory : TYPE
+        DESCRIPTION.
+    reuse_layout : TYPE
+        DESCRIPTION.
+    outputs : TYPE
         DESCRIPTION.
     log : TYPE
         DESCRIPTION.
@@ -1201,235 +3276,756 @@ def _focus(components, bus, neighbourhood, bus_filter, generator_filter, load_fi
         DESCRIPTION.
     log_warning : TYPE
         DESCRIPTION.
-    carriers : TYPE
-        DESCRIPTION.
 
     Returns
     -------
-    None.
+    TYPE
+        DESCRIPTION.
     """
 
-    visited = set()
-    queue = deque()
+    # generate DOT representation and output(s) in memory in case no output files are given, the output being read from the standard output of the tool 'dot' or, when several file formats are requested, from the files written by the tool into a temporary directory (as its outputs could not be told apart on its standard output, and so that the layout is still computed only once)
+    if file_outputs is None:
+        lines = list(dot_representation)
+        outputs.append("%s\n" % "\n".join(lines))
+        if log or log_info:
+            print("[INF] Generating topographical representation of the network in memory in the %s format(s) (using layout engine '%s')" % (", ".join(value.upper() for value in file_formats), layout_engine))
+        if len(file_formats) == 1:
+            capture = list()
+            status = yield (["dot", "-K%s" % layout_engine, "-T%s" % file_formats[0]], iter(lines), None, None, None, layout_engine, render_timeout, capture, log, log_info, log_warning)
+            if status == _INTERRUPTED_STATUS:
+                return 0   # return successfully
+            if status:
+                return status   # return unsuccessfully
+            outputs.append(capture[0])
+        else:
+            with tempfile.TemporaryDirectory() as directory:
+                arguments = ["dot", "-K%s" % layout_engine]
+                for index, file_format in enumerate(file_formats):
+                    arguments.extend(("-T%s" % file_format, "-o", os.path.join(directory, "output%d.%s" % (index, file_format))))
+                status = yield (arguments, iter(lines), None, None, None, layout_engine, render_timeout, None, log, log_info, log_warning)
+                if status == _INTERRUPTED_STATUS:
+                    return 0   # return successfully
+                if status:
+                    return status   # return unsuccessfully
+                try:
+                    for index, file_format in enumerate(file_formats):
+                        with open(os.path.join(directory, "output%d.%s" % (index, file_format)), "rb") as handle:
+                            outputs.append(handle.read())
+                except OSError:
+                    print("[ERR] The output of the tool 'dot' could not be read from temporary directory '%s'!" % directory)
+                    return -1   # return unsuccessfully
+        return 0   # return successfully
 
 
-    # add initial bus and neighbourhood to queue
-    queue.append((bus, neighbourhood))
+    # open DOT file where to write the DOT representation of (PyPSA) network (in case it is requested)
+    handle = None
+    file_output_dot = "%s.dot" % os.path.splitext(file_outputs[0])[0]
+    if WRITE_DOT_FILE:
+        if log or log_info:
+            print("[INF] Writing DOT file '%s'" % file_output_dot)
+        try:
+            handle = open(file_output_dot, "w")
+        except:
+            print("[ERR] The file '%s' could not be written!" % file_output_dot)
+            return -1   # return unsuccessfully
 
 
-    # process queue
-    while queue:
+    # spool DOT representation (in batches of lines as these are yielded) into the DOT file and a temporary file while computing the digest of its body (i.e. without the metadata at its beginning, which holds the time of generation) in case the render cache is used, as well as the digest of its body without tooltips (i.e. of its structure) and the tooltips themselves in case the layout is to be reused
+    lines = iter(dot_representation)
+    spool = None
+    try:
+        if render_cache_directory:
+            spool = tempfile.TemporaryFile()
+            digest = hashlib.blake2b(digest_size = 32)
+            structure = hashlib.blake2b(digest_size = 32)
+            tooltips = list()
+            body = False
+            try:
+                while True:
+                    batch = list(islice(lines, _BATCH_SIZE))
+                    if not batch:
+                        break
+                    if handle:
+                        handle.write("%s%s" % (os.linesep.join(batch), os.linesep))
+                    text = "%s\n" % "\n".join(batch)
+                    spool.write(text.encode("utf-8"))
+                    if not body:
+                        for index, line in enumerate(batch):
+                            if line.startswith("digraph"):
+                                body = True
+                                text = "%s\n" % "\n".join(batch[index:])
+                                break
+                    if body:
+                        digest.update(text.encode("utf-8"))
+                        if reuse_layout:
+                            tooltips.extend(_TOOLTIP_REGEXP.findall(text))
+                            structure.update(_TOOLTIP_REGEXP.sub("tooltip = \"\"", text).encode("utf-8"))
+                if handle:
+                    handle.write(os.linesep)
+                    handle.close()
+                    handle = None
+            except OSError:
+                if handle:
+                    handle.close()
+                    print("[ERR] The file '%s' could not be written!" % file_output_dot)
+                else:
+                    print("[ERR] The DOT representation could not be spooled into a temporary file!")
+                return -1   # return unsuccessfully
+            spool.write(b"\n")
+            spool.seek(0)
+            digest.update(("|%s" % layout_engine).encode())
+            key = digest.hexdigest()
+            structure.update(("|%s" % layout_engine).encode())
+            layout_key = structure.hexdigest()
+
+
+            # copy output files from the render cache (marking these as recently used) or, in case the layout is to be reused, rewrite the tooltips of those laid out with the same structure, so that only those not found in it are generated
+            pending = list()
+            for file_output, file_format in zip(file_outputs, file_formats):
+                cache_file = os.path.join(render_cache_directory, "%s.%s" % (key, file_format))
+                try:
+                    shutil.copyfile(cache_file, file_output)
+                    os.utime(cache_file)
+                except OSError:
+                    if reuse_layout and _reuse_layout(render_cache_directory, layout_key, file_output, file_format, tooltips):
+                        if log or log_info:
+                            print("[INF] Reusing layout of render cache file '%s' for output file '%s'" % (os.path.join(render_cache_directory, "%s.%s" % (layout_key, file_format)), file_output))
+                    else:
+                        pending.append((file_output, file_format))
+                    continue
+                if log or log_info:
+                    print("[INF] Copying output file '%s' from render cache file '%s'" % (file_output, cache_file))
+            if not pending:
+                return 0   # return successfully
+            file_outputs = [value[0] for value in pending]
+            file_formats = [value[1] for value in pending]
 
-        # retrieve bus and neighbourhood from queue
-        bus, neighbourhood = queue.popleft()
 
+        # request the tool 'dot' to be run with the given layout engine, writing the result directly into the output file(s) (as the layout is computed once and then rendered into each of the file formats requested), by yielding its arguments so that the caller runs it either synchronously or asynchronously (and sends back its status)
+        if log or log_info:
+            if len(file_outputs) == 1:
+                print("[INF] Generating topographical representation of the network into output file '%s' in the %s format (using layout engine '%s')" % (file_outputs[0], file_formats[0].upper(), layout_engine))
+            else:
+                print("[INF] Generating topographical representation of the network into output files %s in the %s formats (using layout engine '%s')" % (", ".join("'%s'" % value for value in file_outputs), ", ".join(value.upper() for value in file_formats), layout_engine))
+        arguments = ["dot", "-K%s" % layout_engine]
+        for file_output, file_format in zip(file_outputs, file_formats):
+            arguments.extend(("-T%s" % file_format, "-o", file_output))
+        status = yield (arguments, lines, handle, spool, file_output_dot, layout_engine, render_timeout, None, log, log_info, log_warning)
+        if status == _INTERRUPTED_STATUS:
+            return 0   # return successfully
+        if status:
+            return status   # return unsuccessfully
 
-        # check if bus has already been visited (processed)
-        key = "%s (bus)" % bus
-        if key in visited:
-            continue
-        visited.add(key)
 
+        # write output files into render cache (in case it is used), keyed by the DOT representation and, in case the layout is to be reused, also by its structure along with its tooltips (so that renderings with and without reusing the layout share their entries)
+        if render_cache_directory:
+            _write_render_cache(render_cache_directory, key, file_outputs, file_formats, None, log, log_info, log_warning)
+            if reuse_layout:
+                _write_render_cache(render_cache_directory, layout_key, file_outputs, file_formats, tooltips, log, log_info, log_warning)
 
-        # display info message
-        if log or log_info:
-            print("[INF] Focusing on bus '%s'" % bus)
 
+        return 0   # return successfully
+    finally:   # close the spool file (if any) however the generation ends
+        if spool:
+            spool.close()
 
-        # process bus
-        values0 = components[bus]
-        if len(visited) == 1 or ((not values0["missing"] or broken_missing) and (not bus_filter or bus_filter.match(bus))) and (not carrier_filter or carrier_filter.match(values0["carrier"])):
-            if carrier_color:
-                carrier = values0["carrier"]
-                if carrier and carrier not in carriers:
-                    carriers[carrier] = None
-            values0["selected"] = True
 
 
-        # check if neighbourhood visiting reached the limit
-        if neighbourhood == 0:
-            continue
+class Topology:
+    """
+    Topology of a (PyPSA) network whose components are extracted once, so that it can be rendered several times (e.g. with different focuses and filters) without re-reading the network.
+    """
 
+    def __init__(self, network, cache_directory = None, focus = None, neighbourhood = 0, log = False, log_info = False, log_warning = False):
+        """
+        Parameters
+        ----------
+        network : TYPE
+            DESCRIPTION.
+        cache_directory : TYPE, optional
+            DESCRIPTION. The default is None.
+        focus : TYPE, optional
+            DESCRIPTION. The default is None.
+        neighbourhood : TYPE, optional
+            DESCRIPTION. The default is 0.
+        log : TYPE, optional
+            DESCRIPTION. The default is False.
+        log_info : TYPE, optional
+            DESCRIPTION. The default is False.
+        log_warning : TYPE, optional
+            DESCRIPTION. The default is False.
+
+        Returns
+        -------
+        None.
+        """
+
+        self._adjacency = None   # the adjacency of the buses is only built when focusing for the first time
+        self._counters = None   # the (flattened) tables to count components per bus are only built when rendering for the first time
+        self._totals = dict()   # counts of all components per bus (i.e. regardless of selection), computed once per combination of negative efficiency and broken/missing flags
+        self._reach = None   # the focus (and neighbourhood) that the extraction was restricted to (if any)
+        self._aggregations = dict()   # topologies of the groups of buses (by regular expression or by location), each aggregated once when rendered for the first time
+        self._groups = None   # the group of each bus (in case the topology is an aggregation of buses)
+
+
+        # get topology from cache (in case the network is a file that was already extracted)
+        if isinstance(network, str):
+            self.file_input = network
+            if cache_directory:
+                topology = _read_cache(cache_directory, network, log, log_info, log_warning)
+                if topology:
+                    self.name, self._sizes, self._components = topology
+                    return
+        else:   # pypsa.components.Network
+            self.file_input = None
+
+
+        # read (PyPSA) network
+        if isinstance(network, str):
+            pypsa_network = _read_network(network, log, log_info, log_warning)
+        else:   # pypsa.components.Network
+            pypsa_network = network
+
+
+        # get components from (PyPSA) network (only those reachable from the bus(es) to focus on in case focus is specified)
+        self.name = pypsa_network.name
+        self._sizes = (len(pypsa_network.buses), len(pypsa_network.generators), len(pypsa_network.loads), len(pypsa_network.stores), len(pypsa_network.storage_units), len(pypsa_network.links), len(pypsa_network.lines), len(pypsa_network.snapshots))
+        if focus:
+            self._reach = (focus, neighbourhood)
+            pypsa_network = _restrict_network(pypsa_network, focus, neighbourhood, log, log_info, log_warning)
+        self._components = _get_components(pypsa_network, log, log_info, log_warning)
+
+
+        # write topology to cache (unless it was restricted to a focus)
+        if isinstance(network, str) and cache_directory and not focus:
+            _write_cache(cache_directory, network, (self.name, self._sizes, self._components), log, log_info, log_warning)
+
+
+
+    def render(self, focus = None, neighbourhood = 0, bus_filter = None, generator_filter = None, load_filter = None, store_filter = None, storage_unit_filter = None, link_filter = None, line_filter = None, carrier_filter = None, negative_efficiency = True, broken_missing = False, carrier_color = None, context = False, file_output = FILE_OUTPUT, file_format = FILE_FORMAT, aggregate_one_ports = False, aggregate_buses = None, layout_engine = LAYOUT_ENGINE, render_timeout = RENDER_TIMEOUT, render_cache_directory = None, reuse_layout = False, log = False, log_info = False, log_warning = False):
+        """
+        Parameters
+        ----------
+        focus : TYPE, optional
+            DESCRIPTION. The default is None.
+        neighbourhood : TYPE, optional
+            DESCRIPTION. The default is 0.
+        bus_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        generator_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        load_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        store_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        storage_unit_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        link_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        line_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        carrier_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        negative_efficiency : TYPE, optional
+            DESCRIPTION. The default is True.
+        broken_missing : TYPE, optional
+            DESCRIPTION. The default is False.
+        carrier_color : TYPE, optional
+            DESCRIPTION. The default is None.
+        context : TYPE, optional
+            DESCRIPTION. The default is False.
+        file_output : TYPE, optional
+            DESCRIPTION. The default is FILE_OUTPUT.
+        file_format : TYPE, optional
+            DESCRIPTION. The default is FILE_FORMAT.
+        aggregate_one_ports : TYPE, optional
+            DESCRIPTION. The default is False.
+        aggregate_buses : TYPE, optional
+            DESCRIPTION. The default is None.
+        layout_engine : TYPE, optional
+            DESCRIPTION. The default is LAYOUT_ENGINE.
+        render_timeout : TYPE, optional
+            DESCRIPTION. The default is RENDER_TIMEOUT.
+        render_cache_directory : TYPE, optional
+            DESCRIPTION. The default is None.
+        reuse_layout : TYPE, optional
+            DESCRIPTION. The default is False.
+        log : TYPE, optional
+            DESCRIPTION. The default is False.
+        log_info : TYPE, optional
+            DESCRIPTION. The default is False.
+        log_warning : TYPE, optional
+            DESCRIPTION. The default is False.
+
+        Returns
+        -------
+        TYPE
+            DESCRIPTION.
+        """
+
+        # render topology, running the tool 'dot' synchronously whenever requested by the rendering
+        rendering = self._render(focus, neighbourhood, bus_filter, generator_filter, load_filter, store_filter, storage_unit_filter, link_filter, line_filter, carrier_filter, negative_efficiency, broken_missing, carrier_color, context, file_output, file_format, aggregate_one_ports, aggregate_buses, layout_engine, render_timeout, render_cache_directory, reuse_layout, log, log_info, log_warning)
+        try:
+            arguments = next(rendering)
+            while True:
+                arguments = rendering.send(_run_dot(*arguments))
+        except StopIteration as stop:
+            return stop.value
+
+
+
+    async def render_async(self, focus = None, neighbourhood = 0, bus_filter = None, generator_filter = None, load_filter = None, store_filter = None, storage_unit_filter = None, link_filter = None, line_filter = None, carrier_filter = None, negative_efficiency = True, broken_missing = False, carrier_color = None, context = False, file_output = FILE_OUTPUT, file_format = FILE_FORMAT, aggregate_one_ports = False, aggregate_buses = None, layout_engine = LAYOUT_ENGINE, render_timeout = RENDER_TIMEOUT, render_cache_directory = None, reuse_layout = False, log = False, log_info = False, log_warning = False):
+        """
+        Parameters
+        ----------
+        focus : TYPE, optional
+            DESCRIPTION. The default is None.
+        neighbourhood : TYPE, optional
+            DESCRIPTION. The default is 0.
+        bus_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        generator_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        load_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        store_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        storage_unit_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        link_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        line_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        carrier_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        negative_efficiency : TYPE, optional
+            DESCRIPTION. The default is True.
+        broken_missing : TYPE, optional
+            DESCRIPTION. The default is False.
+        carrier_color : TYPE, optional
+            DESCRIPTION. The default is None.
+        context : TYPE, optional
+            DESCRIPTION. The default is False.
+        file_output : TYPE, optional
+            DESCRIPTION. The default is FILE_OUTPUT.
+        file_format : TYPE, optional
+            DESCRIPTION. The default is FILE_FORMAT.
+        aggregate_one_ports : TYPE, optional
+            DESCRIPTION. The default is False.
+        aggregate_buses : TYPE, optional
+            DESCRIPTION. The default is None.
+        layout_engine : TYPE, optional
+            DESCRIPTION. The default is LAYOUT_ENGINE.
+        render_timeout : TYPE, optional
+            DESCRIPTION. The default is RENDER_TIMEOUT.
+        render_cache_directory : TYPE, optional
+            DESCRIPTION. The default is None.
+        reuse_layout : TYPE, optional
+            DESCRIPTION. The default is False.
+        log : TYPE, optional
+            DESCRIPTION. The default is False.
+        log_info : TYPE, optional
+            DESCRIPTION. The default is False.
+        log_warning : TYPE, optional
+            DESCRIPTION. The default is False.
+
+        Returns
+        -------
+        TYPE
+            DESCRIPTION.
+        """
+
+        # render topology, running the tool 'dot' asynchronously whenever requested by the rendering (so that the event loop is not blocked while the tool lays out and renders the topographical representation of the network)
+        rendering = self._render(focus, neighbourhood, bus_filter, generator_filter, load_filter, store_filter, storage_unit_filter, link_filter, line_filter, carrier_filter, negative_efficiency, broken_missing, carrier_color, context, file_output, file_format, aggregate_one_ports, aggregate_buses, layout_engine, render_timeout, render_cache_directory, reuse_layout, log, log_info, log_warning)
+        try:
+            arguments = next(rendering)
+            while True:
+                arguments = rendering.send(await _run_dot_async(*arguments))
+        except StopIteration as stop:
+            return stop.value
+
+
+
+    def _render(self, focus = None, neighbourhood = 0, bus_filter = None, generator_filter = None, load_filter = None, store_filter = None, storage_unit_filter = None, link_filter = None, line_filter = None, carrier_filter = None, negative_efficiency = True, broken_missing = False, carrier_color = None, context = False, file_output = FILE_OUTPUT, file_format = FILE_FORMAT, aggregate_one_ports = False, aggregate_buses = None, layout_engine = LAYOUT_ENGINE, render_timeout = RENDER_TIMEOUT, render_cache_directory = None, reuse_layout = False, log = False, log_info = False, log_warning = False):
+        """
+        Parameters
+        ----------
+        focus : TYPE, optional
+            DESCRIPTION. The default is None.
+        neighbourhood : TYPE, optional
+            DESCRIPTION. The default is 0.
+        bus_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        generator_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        load_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        store_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        storage_unit_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        link_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        line_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        carrier_filter : TYPE, optional
+            DESCRIPTION. The default is None.
+        negative_efficiency : TYPE, optional
+            DESCRIPTION. The default is True.
+        broken_missing : TYPE, optional
+            DESCRIPTION. The default is False.
+        carrier_color : TYPE, optional
+            DESCRIPTION. The default is None.
+        context : TYPE, optional
+            DESCRIPTION. The default is False.
+        file_output : TYPE, optional
+            DESCRIPTION. The default is FILE_OUTPUT.
+        file_format : TYPE, optional
+            DESCRIPTION. The default is FILE_FORMAT.
+        aggregate_one_ports : TYPE, optional
+            DESCRIPTION. The default is False.
+        aggregate_buses : TYPE, optional
+            DESCRIPTION. The default is None.
+        layout_engine : TYPE, optional
+            DESCRIPTION. The default is LAYOUT_ENGINE.
+        render_timeout : TYPE, optional
+            DESCRIPTION. The default is RENDER_TIMEOUT.
+        render_cache_directory : TYPE, optional
+            DESCRIPTION. The default is None.
+        reuse_layout : TYPE, optional
+            DESCRIPTION. The default is False.
+        log : TYPE, optional
+            DESCRIPTION. The default is False.
+        log_info : TYPE, optional
+            DESCRIPTION. The default is False.
+        log_warning : TYPE, optional
+            DESCRIPTION. The default is False.
+
+        Returns
+        -------
+        TYPE
+            DESCRIPTION.
+        """
+
+        components = self._components
+
+
+        # check if parameters are valid
+        if _check_parameters(neighbourhood, file_output, file_format, layout_engine, render_timeout, render_cache_directory, reuse_layout):
+            return -1   # return unsuccessfully
 
-        # process generators (attached to the bus currently on focus)
-        generators = values0["generators"]
-        for values1 in generators:
-            generator, carrier, unit, p_nom_extendable, p_nom, p_set, efficiency, capital_cost, marginal_cost, p_nom_opt, p_time_series, selected = values1
-            if values0["selected"] and (not generator_filter or generator_filter.match(generator)) and (not carrier_filter or carrier_filter.match(carrier)):
-                if carrier_color:
-                    if carrier and carrier not in carriers:
-                        carriers[carrier] = None
-                values1[-1] = True
-                components[bus]["generators_count"] += 1
-            elif context:
-                components[bus]["generators_count"] += 1
 
+        # check if topology can be rendered with the focus given (in case it was restricted to a focus when extracted)
+        if self._reach and (not focus or context or self._reach != (focus, neighbourhood)):
+            print("[ERR] The topology was extracted focusing on '%s' (with neighbourhood %s) and can only be rendered with the same focus and without context!" % self._reach)
+            return -1   # return unsuccessfully
 
-        # process loads (attached to the bus currently on focus)
-        loads = values0["loads"]
-        for values1 in loads:
-            load, carrier, unit, p_set, selected = values1
-            if values0["selected"] and (not load_filter or load_filter.match(load)) and (not carrier_filter or carrier_filter.match(carrier)):
-                if carrier_color:
-                    if carrier and carrier not in carriers:
-                        carriers[carrier] = None
-                values1[-1] = True
-                components[bus]["loads_count"] += 1
-            elif context:
-                components[bus]["loads_count"] += 1
 
+        # aggregate buses into groups (by regular expression or by location) and render these instead, the aggregation being done once and reused by subsequent renderings (the bus(es) to focus on being replaced by their groups)
+        topology = self
+        focus_buses = focus
+        if aggregate_buses:
+            key = aggregate_buses if isinstance(aggregate_buses, str) else True
+            if key not in self._aggregations:
+                if log or log_info:
+                    print("[INF] Aggregating buses %s" % ("by location" if key is True else "in function of regular expression '%s'" % key))
+                topology = copy.copy(self)
+                topology._components, topology._groups = _aggregate_buses(components, aggregate_buses)
+                topology._adjacency = None
+                topology._counters = None
+                topology._totals = dict()
+                self._aggregations[key] = topology
+            topology = self._aggregations[key]
+            components = topology._components
+            if focus:
+                groups = topology._groups
+                focus_buses = groups.get(focus, focus) if isinstance(focus, str) else [groups.get(bus, bus) for bus in focus]
 
-        # process stores (attached to the bus currently on focus)
-        stores = values0["stores"]
-        for values1 in stores:
-            store, carrier, unit, e_nom_extendable, e_nom, p_set, e_cyclic, capital_cost, marginal_cost, e_nom_opt, e_time_series, p_time_series, selected = values1
-            if values0["selected"] and (not store_filter or store_filter.match(store)) and (not carrier_filter or carrier_filter.match(carrier)):
-                if carrier_color:
-                    if carrier and carrier not in carriers:
-                        carriers[carrier] = None
-                values1[-1] = True
-                components[bus]["stores_count"] += 1
-            elif context:
-                components[bus]["stores_count"] += 1
 
+        # check if bus to focus on exists in (PyPSA) network
+        if focus:
+            if isinstance(focus_buses, str):
+                if focus_buses not in components or components[focus_buses].missing:
+                    print("[ERR] The bus '%s' to focus on does not exist!" % focus_buses)
+                    return -1   # return unsuccessfully
+            else:   # list
+                for bus in focus_buses:
+                    if bus not in components or components[bus].missing:
+                        print("[ERR] The bus '%s' to focus on does not exist!" % bus)
+                        return -1   # return unsuccessfully
+
+
+        # compile regular expressions (memoizing their matches)
+        bus_filter_regexp = _Filter(bus_filter) if bus_filter else None
+        generator_filter_regexp = _Filter(generator_filter) if generator_filter else None
+        load_filter_regexp = _Filter(load_filter) if load_filter else None
+        store_filter_regexp = _Filter(store_filter) if store_filter else None
+        storage_unit_filter_regexp = _Filter(storage_unit_filter) if storage_unit_filter else None
+        link_filter_regexp = _Filter(link_filter) if link_filter else None
+        line_filter_regexp = _Filter(line_filter) if line_filter else None
+        carrier_filter_regexp = _Filter(carrier_filter) if carrier_filter else None
+
+
+        # get network name
+        if self.name:
+            network_name = self.name
+            if log or log_info:
+                print("[INF] Start generating topographical representation of the network '%s'" % network_name)
+        else:
+            network_name = NETWORK_NAME
+            if log or log_info:
+                print("[INF] Start generating topographical representation of the network")
 
-        # process storage units (attached to the bus currently on focus)
-        storage_units = values0["storage_units"]
-        for values1 in storage_units:
-            storage_unit, carrier, unit, p_nom_extendable, p_nom, p_set, cyclic_state_charge, capital_cost, marginal_cost, p_nom_opt, p_time_series, selected = values1
-            if values0["selected"] and (not storage_unit_filter or storage_unit_filter.match(storage_unit)) and (not carrier_filter or carrier_filter.match(carrier)):
-                if carrier_color:
-                    if carrier and carrier not in carriers:
-                        carriers[carrier] = None
-                values1[-1] = True
-                components[bus]["storage_units_count"] += 1
-            elif context:
-                components[bus]["storage_units_count"] += 1
 
+        # reset components (i.e. clear selections left by a previous rendering)
+        _reset_components(components)
 
-        # process links (attached to the bus currently on focus)
-        links = values0["links"]
-        for values1 in links:
-            link, bus_to, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, p1_time_series, bidirectional, direction, missing, selected = values1
-            key = "%s (link)" % link
-            if key in visited:
-                continue
-            visited.add(key)
-            if not missing or broken_missing:
-                if values0["selected"] and (not bus_filter or bus_filter.match(bus_to)) and (not link_filter or link_filter.match(link)) and (not carrier_filter or carrier_filter.match(carrier)):
-                    values1[-1] = True
-                if values1[-1] or context:
-                    if bidirectional:
-                        components[bus]["incoming_links_count"] += 1
-                        components[bus]["outgoing_links_count"] += 1
-                        components[bus_to]["incoming_links_count"] += 1
-                        components[bus_to]["outgoing_links_count"] += 1
-                    elif negative_efficiency or efficiency >= 0:
-                        if direction:
-                            components[bus]["outgoing_links_count"] += 1
-                            components[bus_to]["incoming_links_count"] += 1
-                        else:
-                            components[bus]["incoming_links_count"] += 1
-                            components[bus_to]["outgoing_links_count"] += 1
-                    else:
-                        if direction:
-                            components[bus]["incoming_links_count"] += 1
-                            components[bus_to]["outgoing_links_count"] += 1
-                        else:
-                            components[bus]["outgoing_links_count"] += 1
-                            components[bus_to]["incoming_links_count"] += 1
-                    key = "%s (bus)" % bus_to
-                    if key not in visited:
-                        queue.append((bus_to, neighbourhood - 1))   # add neighbouring (adjacent) bus to queue
 
+        # process components
+        if focus:
 
-        # process multi-link trunks (attached to the bus currently on focus)
-        multi_link_trunks = values0["multi_link_trunks"]
-        multi_link_branches = values0["multi_link_branches"]
-        for values1 in multi_link_trunks:
-            link_trunk, bus_to, bus_to_efficiencies, carrier, p_nom_extendable, p_nom, capital_cost, marginal_cost, p_nom_opt, p0_time_series, count, missing, selected = values1
-            not_missing = count - missing
-            if not_missing or broken_missing:
-                if values0["selected"] and (not link_filter or link_filter.match(link_trunk)) and (not carrier_filter or carrier_filter.match(carrier)):
-                    if bus_filter:
-                        for values2 in multi_link_branches:
-                            link_branch, bus_to, bus_value, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, px, px_time_series, index, direction, selected = values2
-                            if link_trunk == link_branch:
-                                if not values0["missing"] and not components[bus_to]["missing"] or broken_missing:
-                                    if bus_filter.match(bus_to):
-                                        values1[-1] = True
-                                        break
-                    else:
-                        values1[-1] = True
+            # focus on bus(es) in one single traversal
+            carriers = dict()
+            if topology._adjacency is None:
+                topology._adjacency = _get_adjacency(components)
+            adjacency = topology._adjacency
+            visited = _focus(components, adjacency, focus_buses, neighbourhood, bus_filter_regexp, generator_filter_regexp, load_filter_regexp, store_filter_regexp, storage_unit_filter_regexp, link_filter_regexp, line_filter_regexp, carrier_filter_regexp, negative_efficiency, broken_missing, carrier_color, context, log, log_info, log_warning, carriers)
 
+        else:
+            visited = None
+            carriers = _process_components(components, bus_filter_regexp, generator_filter_regexp, load_filter_regexp, store_filter_regexp, storage_unit_filter_regexp, link_filter_regexp, line_filter_regexp, carrier_filter_regexp, negative_efficiency, broken_missing, carrier_color, context)
 
-        # process multi-link branches (attached to the bus currently on focus)
-        for values1 in multi_link_branches:
-            link, bus_to, bus_value, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, px, px_time_series, index, direction, selected = values1
-            if not values0["missing"] and not components[bus_to]["missing"] or broken_missing:
-                if values0["selected"] and (not bus_filter or bus_filter.match(bus_to)) and (not link_filter or link_filter.match(link)) and (not carrier_filter or carrier_filter.match(carrier)):
-                    values1[-1] = True
-                    if not direction or neighbourhood > 1:
-                        multi_link_trunks = components[bus_to]["multi_link_trunks"]
-                        if index < len(multi_link_trunks):
-                            multi_link_trunks[index][-1] = True
-                if values1[-1] or context:   # TODO: test logic
-                    if negative_efficiency or efficiency >= 0:
-                        if direction:
-                            components[bus]["outgoing_links_count"] += 1
-                            components[bus_to]["incoming_links_count"] += 1
-                        else:
-                            components[bus]["incoming_links_count"] += 1
-                            components[bus_to]["outgoing_links_count"] += 1
+
+        # count components to represent in DOT (as the counts are needed before the DOT representation itself is streamed)
+        counts = _count_components(components, broken_missing, context)
+        buses_count, generators_count, loads_count, stores_count, storage_units_count, links_count, multi_link_trunks_count, multi_link_branches_count, lines_count = counts
+        links_count += multi_link_trunks_count
+
+
+        # get counts of components per bus shown in tooltips (when in context mode or when nothing is filtered out, these are the counts of all components, which are computed once and reused by subsequent renderings)
+        if topology._counters is None:
+            topology._counters = _get_counters(components)
+        if context or not (focus or bus_filter or generator_filter or load_filter or store_filter or storage_unit_filter or link_filter or line_filter or carrier_filter):
+            key = (negative_efficiency, broken_missing)
+            if key not in topology._totals:
+                topology._totals[key] = _count_per_bus(topology._counters, negative_efficiency, broken_missing, False)
+            counters = topology._totals[key]
+        else:
+            counters = _count_per_bus(topology._counters, negative_efficiency, broken_missing, True, visited)   # only the buses visited when focusing may have selected components attached
+
+
+        # get output files, i.e. the file output (with the extension of the file format in case it does not have one) or, when several file formats are requested, one output file per file format named after the file output (no output files being used when the file output is None, as the topographical representation is then generated in memory)
+        if file_output is None:
+            file_outputs = None
+            file_formats = [file_format] if isinstance(file_format, str) else file_format
+        elif isinstance(file_format, str):
+            if not os.path.splitext(file_output)[1]:
+                file_output = "%s.%s" % (file_output, file_format)
+            file_outputs = [file_output]
+            file_formats = [file_format]
+        else:   # list
+            file_outputs = ["%s.%s" % (os.path.splitext(file_output)[0], value) for value in file_format]
+            file_formats = file_format
+
+
+        # select layout engine (in case of "auto", "dot" unless there are too many components to represent for its hierarchical layout, in which case the force-directed engine "sfdp" is selected)
+        if layout_engine == "auto":
+            engine = "sfdp" if sum(counts) > LAYOUT_THRESHOLD else "dot"
+            if log or log_info:
+                print("[INF] Selecting layout engine '%s' (%d component(s) to represent, with a threshold of %d)" % (engine, sum(counts), LAYOUT_THRESHOLD))
+        else:
+            engine = layout_engine
+
+
+        # generate output files based on (PyPSA) network DOT representation (falling back to the cheaper layout engine "sfdp" and then to a reduced level of detail, i.e. aggregating one-port components, whenever the render timeout is exceeded, the fallbacks taken being recorded in the metadata of the digraph)
+        fallbacks = list()
+        one_ports = aggregate_one_ports
+        while True:
+
+            # add metadata to digraph
+            now = datetime.datetime.now()
+            result = list()
+            result.append("//")
+            result.append("// Generated by %s version %s (on the %04d/%02d/%02d at %02d:%02d:%02d) using the following parameters: " % (__project__, __version__, now.year, now.month, now.day, now.hour, now.minute, now.second))
+            result.append("//")
+            result.append("//    file_input=%s" % self.file_input)
+            result.append("//    focus=%s" % focus)
+            result.append("//    neighbourhood=%s" % neighbourhood)
+            result.append("//    bus_filter=%s" % bus_filter)
+            result.append("//    generator_filter=%s" % generator_filter)
+            result.append("//    load_filter=%s" % load_filter)
+            result.append("//    store_filter=%s" % store_filter)
+            result.append("//    storage_unit_filter=%s" % storage_unit_filter)
+            result.append("//    link_filter=%s" % link_filter)
+            result.append("//    line_filter=%s" % line_filter)
+            result.append("//    carrier_filter=%s" % carrier_filter)
+            result.append("//    negative_efficiency=%s" % negative_efficiency)
+            result.append("//    broken_missing=%s" % broken_missing)
+            result.append("//    carrier_color=%s" % carrier_color)
+            result.append("//    context=%s" % context)
+            result.append("//    file_output=%s" % (file_output if isinstance(file_format, str) or file_output is None else file_outputs))
+            result.append("//    file_format=%s" % file_format)
+            result.append("//    aggregate_one_ports=%s" % aggregate_one_ports)
+            result.append("//    aggregate_buses=%s" % aggregate_buses)
+            result.append("//    layout_engine=%s" % layout_engine)
+            result.append("//    render_timeout=%s" % render_timeout)
+            result.append("//    render_cache_directory=%s" % render_cache_directory)
+            result.append("//    reuse_layout=%s" % reuse_layout)
+            result.append("//    log=%s" % log)
+            result.append("//    log_info=%s" % log_info)
+            result.append("//    log_warning=%s" % log_warning)
+            result.append("//")
+            if fallbacks:
+                result.append("// The following fallback(s) were taken as the render timeout was exceeded:")
+                result.append("//")
+                for fallback in fallbacks:
+                    result.append("//    %s" % fallback)
+                result.append("//")
+            result.append("")
+
+
+            # declare digraph header
+            result.append("digraph \"%s\"" % _quote(network_name))
+
+
+            # open digraph body
+            result.append("{")
+
+
+            # configure digraph layout
+            result.append("   // digraph layout")
+            result.append("   margin = %.2f" % MARGIN)
+            result.append("   bgcolor = \"%s\"" % BACKGROUND_COLOR)
+            if network_name != "":
+                result.append("   labelloc = \"t\"")
+                result.append("   label = \"%s\n\n\n           \"" % _quote(network_name))
+                result.append("   tooltip = \"Network: %s\nBuses: %d (out of %d)\nGenerators: %d (out of %d)\nLoads: %s (out of %d)\nStores: %d (out of %d)\nStorage units: %d (out of %d)\nLinks: %d (out of %d)\nLines: %d (out of %d)\nSnapshots: %d\"" % (_quote(network_name), buses_count, self._sizes[0], generators_count, self._sizes[1], loads_count, self._sizes[2], stores_count, self._sizes[3], storage_units_count, self._sizes[4], links_count, self._sizes[5], lines_count, self._sizes[6], self._sizes[7]))
+            result.append("   rankdir = \"%s\"" % RANK_DIRECTION)
+            result.append("   ranksep = %.2f" % RANK_SEPARATION)
+            result.append("   nodesep = %.2f" % NODE_SEPARATION)
+            if engine == "dot":
+                result.append("   splines = \"%s\"" % EDGE_STYLE)
+            else:   # force-directed engines (drawing edges as straight lines, as routing these around nodes would take longer than laying out the nodes themselves)
+                result.append("   layout = \"%s\"" % engine)
+                result.append("   splines = \"line\"")
+            result.append("   node [fontname = \"%s\", fontsize = %.2f]" % (TEXT_FONT, TEXT_SIZE))
+            result.append("   edge [fontname = \"%s\", fontsize = %.2f]" % (TEXT_FONT, TEXT_SIZE))
+            result.append("")
+
+
+            # chain DOT representation of components (yielded while being streamed) and closing of digraph body to result
+            representation = chain(result, _represent_components(components, carriers, counts, counters, negative_efficiency, broken_missing, carrier_color, context, one_ports, log, log_info, log_warning), ("}", ))
+
+
+            # generate output files (or outputs in memory) based on (PyPSA) network DOT representation
+            outputs = list()
+            status = yield from _generate_output(representation, file_outputs, file_formats, engine, render_timeout, render_cache_directory, reuse_layout, outputs, log, log_info, log_warning)
+            if status != _TIMEOUT_STATUS:
+                break
+
+
+            # select next fallback (if any)
+            if engine != "sfdp":
+                fallback = "layout_engine=%s was replaced by layout_engine=sfdp" % engine
+                engine = "sfdp"
+            elif not one_ports:
+                fallback = "aggregate_one_ports=False was replaced by aggregate_one_ports=True"
+                one_ports = True
+            else:
+                print("[ERR] The render timeout of %s seconds was exceeded and no further fallback is available!" % render_timeout)
+                status = -1   # unsuccessful
+                break
+            if log or log_warning:
+                print("[WAR] Falling back as the render timeout was exceeded (%s)" % fallback)
+            fallbacks.append(fallback)
+
+
+        # display info message
+        if not status:
+            if log or log_info:
+                print("[INF] Finished generating topographical representation of the network!")
+
+
+        # display topographical representation (only when running from Jupyter), taking it straight from memory in case it was generated in memory
+        if not status:
+            try:
+                if get_ipython().__class__.__name__ == "ZMQInteractiveShell":   # in Jupyter
+                    import IPython.display
+                    if file_formats[0] == "svg":
+                        display(IPython.display.SVG(data = outputs[1]) if file_outputs is None else IPython.display.SVG(filename = file_outputs[0]))
                     else:
-                        if direction:
-                            components[bus]["incoming_links_count"] += 1
-                            components[bus_to]["outgoing_links_count"] += 1
-                        else:
-                            components[bus]["outgoing_links_count"] += 1
-                            components[bus_to]["incoming_links_count"] += 1
-                    queue.append((bus_to, neighbourhood - 1))   # add neighbouring (adjacent) bus to queue
+                        display(IPython.display.Image(data = outputs[1]) if file_outputs is None else IPython.display.Image(filename = file_outputs[0]))
+            except:
+                pass
 
 
-        # process lines (attached to the bus currently on focus)
-        lines = values0["lines"]
-        for values1 in lines:
-            line, bus1, carrier, s_nom_extendable, s_nom, capital_cost, s_nom_opt, p0_time_series, p1_time_series, direction, missing, selected = values1
-            key = "%s (line)" % line
-            if key in visited:
-                continue
-            visited.add(key)
-            if not missing or broken_missing:
-                if values0["selected"] and (not bus_filter or bus_filter.match(bus1)) and (not line_filter or line_filter.match(line)) and (not carrier_filter or carrier_filter.match(carrier)):
-                    if carrier_color:
-                        if carrier and carrier not in carriers:
-                            carriers[carrier] = None
-                    values1[-1] = True
-                if values1[-1] or context:
-                    components[bus]["lines_count"] += 1
-                    components[bus1]["lines_count"] += 1
-                    key = "%s (bus)" % bus1
-                    if key not in visited:
-                        queue.append((bus1, neighbourhood - 1))   # add neighbouring (adjacent) bus to queue
+        # return DOT representation and output (or list of outputs in case several file formats were requested) in case these were generated in memory
+        if not status and file_outputs is None and len(outputs) > len(file_formats):   # unless the tool 'dot' was interrupted by user request
+            return outputs[0], outputs[1] if isinstance(file_format, str) else outputs[1:]
+
 
+        return status
 
 
-def _generate_output(dot_representation, file_output, file_format, log, log_info, log_warning):
+
+def generate(network, focus = None, neighbourhood = 0, bus_filter = None, generator_filter = None, load_filter = None, store_filter = None, storage_unit_filter = None, link_filter = None, line_filter = None, carrier_filter = None, negative_efficiency = True, broken_missing = False, carrier_color = None, context = False, file_output = FILE_OUTPUT, file_format = FILE_FORMAT, aggregate_one_ports = False, aggregate_buses = None, layout_engine = LAYOUT_ENGINE, render_timeout = RENDER_TIMEOUT, render_cache_directory = None, reuse_layout = False, cache_directory = None, log = False, log_info = False, log_warning = False):
     """
     Parameters
     ----------
-    dot_representation : TYPE
-        DESCRIPTION.
-    file_output : TYPE
-        DESCRIPTION.
-    file_format : TYPE
-        DESCRIPTION.
-    log : TYPE
-        DESCRIPTION.
-    log_info : TYPE
-        DESCRIPTION.
-    log_warning : TYPE
+    network : TYPE
         DESCRIPTION.
+    focus : TYPE, optional
+        DESCRIPTION. The default is None.
+    neighbourhood : TYPE, optional
+        DESCRIPTION. The default is 0.
+    bus_filter : TYPE, optional
+        DESCRIPTION. The default is None.
+    generator_filter : TYPE, optional
+        DESCRIPTION. The default is None.
+    load_filter : TYPE, optional
+        DESCRIPTION. The default is None.
+    store_filter : TYPE, optional
+        DESCRIPTION. The default is None.
+    storage_unit_filter : TYPE, optional
+        DESCRIPTION. The default is None.
+    link_filter : TYPE, optional
+        DESCRIPTION. The default is None.
+    line_filter : TYPE, optional
+        DESCRIPTION. The default is None.
+    carrier_filter : TYPE, optional
+        DESCRIPTION. The default is None.
+    negative_efficiency : TYPE, optional
+        DESCRIPTION. The default is True.
+    broken_missing : TYPE, optional
+        DESCRIPTION. The default is False.
+    carrier_color : TYPE, optional
+        DESCRIPTION. The default is None.
+    context : TYPE, optional
+        DESCRIPTION. The default is False.
+    file_output : TYPE, optional
+        DESCRIPTION. The default is FILE_OUTPUT.
+    file_format : TYPE, optional
+        DESCRIPTION. The default is FILE_FORMAT.
+    aggregate_one_ports : TYPE, optional
+        DESCRIPTION. The default is False.
+    aggregate_buses : TYPE, optional
+        DESCRIPTION. The default is None.
+    layout_engine : TYPE, optional
+        DESCRIPTION. The default is LAYOUT_ENGINE.
+    render_timeout : TYPE, optional
+        DESCRIPTION. The default is RENDER_TIMEOUT.
+    render_cache_directory : TYPE, optional
+        DESCRIPTION. The default is None.
+    reuse_layout : TYPE, optional
+        DESCRIPTION. The default is False.
+    cache_directory : TYPE, optional
+        DESCRIPTION. The default is None.
+    log : TYPE, optional
+        DESCRIPTION. The default is False.
+    log_info : TYPE, optional
+        DESCRIPTION. The default is False.
+    log_warning : TYPE, optional
+        DESCRIPTION. The default is False.
 
     Returns
     -------
@@ -1437,56 +4033,21 @@ def _generate_output(dot_representation, file_output, file_format, log, log_info
         DESCRIPTION.
     """
 
-    # write DOT representation of (PyPSA) network into a DOT file
-    file_output_dot = "%s.dot" % file_output.rsplit(".", 1)[0]
-    if log or log_info:
-        print("[INF] Writing DOT file '%s'" % file_output_dot)
-    try:
-        with open(file_output_dot, "w") as handle:
-            for line in dot_representation:
-                handle.write("%s%s" % (line, os.linesep))
-            handle.write(os.linesep)
-    except:
-        print("[ERR] The file '%s' could not be written!" % file_output_dot)
-        return -1   # return unsuccessfully
-
-
-    # launch the tool 'dot' passing DOT file to it
-    if log or log_info:
-        print("[INF] Generating topographical representation of the network based on DOT file '%s'" % file_output_dot)
-    try:
-        result = subprocess.run(["dot", "-T%s" % file_format, file_output_dot], capture_output = True)
-    except KeyboardInterrupt:
-        if log or log_warning:
-            print("[WAR] Terminated by user request!")
-        return 0   # return successfully
-    except FileNotFoundError:
-        print("[ERR] The tool 'dot' is not installed or could not be found (please visit https://graphviz.org/download to download and install it)!")
-        return -1   # return unsuccessfully
-    except:
-        print("[ERR] The tool 'dot' generated an error!")
-        return -1   # return unsuccessfully
-    if result.check_returncode():
-        print("[ERR] The tool 'dot' generated an error!")
-        return result.check_returncode()   # return unsuccessfully
-
-
-    # write result generated by the tool 'dot' into an output file
-    if log or log_info:
-        print("[INF] Writing output file '%s' in the %s format" % (file_output, file_format.upper()))
-    try:
-        with open(file_output, "wb") as handle:
-            handle.write(result.stdout)
-    except:
-        print("[ERR] The file '%s' could not be written!" % file_output)
+    # check if parameters are valid (before reading the network, as it may take a while)
+    if _check_parameters(neighbourhood, file_output, file_format, layout_engine, render_timeout, render_cache_directory, reuse_layout):
         return -1   # return unsuccessfully
 
 
-    return 0   # return successfully
+    # extract topology from (PyPSA) network (restricting it to the buses reachable from the bus(es) to focus on, unless the full topology is needed as context or to be cached) and render it
+    if focus and not context and not cache_directory:
+        topology = Topology(network, focus = focus, neighbourhood = neighbourhood, log = log, log_info = log_info, log_warning = log_warning)
+    else:
+        topology = Topology(network, cache_directory, log = log, log_info = log_info, log_warning = log_warning)
+    return topology.render(focus, neighbourhood, bus_filter, generator_filter, load_filter, store_filter, storage_unit_filter, link_filter, line_filter, carrier_filter, negative_efficiency, broken_missing, carrier_color, context, file_output, file_format, aggregate_one_ports, aggregate_buses, layout_engine, render_timeout, render_cache_directory, reuse_layout, log, log_info, log_warning)
 
 
 
-def generate(network, focus = None, neighbourhood = 0, bus_filter = None, generator_filter = None, load_filter = None, store_filter = None, storage_unit_filter = None, link_filter = None, line_filter = None, carrier_filter = None, negative_efficiency = True, broken_missing = False, carrier_color = None, context = False, file_output = FILE_OUTPUT, file_format = FILE_FORMAT, log = False, log_info = False, log_warning = False):
+async def generate_async(network, focus = None, neighbourhood = 0, bus_filter = None, generator_filter = None, load_filter = None, store_filter = None, storage_unit_filter = None, link_filter = None, line_filter = None, carrier_filter = None, negative_efficiency = True, broken_missing = False, carrier_color = None, context = False, file_output = FILE_OUTPUT, file_format = FILE_FORMAT, aggregate_one_ports = False, aggregate_buses = None, layout_engine = LAYOUT_ENGINE, render_timeout = RENDER_TIMEOUT, render_cache_directory = None, reuse_layout = False, cache_directory = None, log = False, log_info = False, log_warning = False):
     """
     Parameters
     ----------
@@ -1524,6 +4085,20 @@ def generate(network, focus = None, neighbourhood = 0, bus_filter = None, genera
         DESCRIPTION. The default is FILE_OUTPUT.
     file_format : TYPE, optional
         DESCRIPTION. The default is FILE_FORMAT.
+    aggregate_one_ports : TYPE, optional
+        DESCRIPTION. The default is False.
+    aggregate_buses : TYPE, optional
+        DESCRIPTION. The default is None.
+    layout_engine : TYPE, optional
+        DESCRIPTION. The default is LAYOUT_ENGINE.
+    render_timeout : TYPE, optional
+        DESCRIPTION. The default is RENDER_TIMEOUT.
+    render_cache_directory : TYPE, optional
+        DESCRIPTION. The default is None.
+    reuse_layout : TYPE, optional
+        DESCRIPTION. The default is False.
+    cache_directory : TYPE, optional
+        DESCRIPTION. The default is None.
     log : TYPE, optional
         DESCRIPTION. The default is False.
     log_info : TYPE, optional
@@ -1537,271 +4112,50 @@ def generate(network, focus = None, neighbourhood = 0, bus_filter = None, genera
         DESCRIPTION.
     """
 
-    result = list()
-    visited = set()
-
-
-    # check if neighbourhood is valid
-    if isinstance(neighbourhood, int):
-        if neighbourhood < 0:
-            print("[ERR] The neighbourhood should be equal or greater than 0")
-            return -1   # return unsuccessfully
-    else:   # list
-        for value in neighbourhood:
-            if value < 0:
-                print("[ERR] The neighbourhood should be equal or greater than 0")
-                return -1   # return unsuccessfully
-
-
-    # check if file format is valid
-    if file_format not in ("svg", "png", "jpg", "gif", "pdf", "ps"):
-        print("[ERR] The file format '%s' is not valid (acceptable formats are: 'svg', 'png', 'jpg', 'gif', 'pdf' or 'ps')!" % file_format)
+    # check if parameters are valid (before reading the network, as it may take a while)
+    if _check_parameters(neighbourhood, file_output, file_format, layout_engine, render_timeout, render_cache_directory, reuse_layout):
         return -1   # return unsuccessfully
 
 
-    # read (PyPSA) network
-    if isinstance(network, str):
-        if log or log_info:
-            print("[INF] Reading file '%s' containing PyPSA-based network" % network)
-        pypsa_network = pypsa.Network(network)
-    else:   # pypsa.components.Network
-        pypsa_network = network
-
-
-    # check if bus to focus on exists in (PyPSA) network
-    if focus:
-        buses = pypsa_network.buses.index
-        if isinstance(focus, str):
-            if focus not in buses:
-                print("[ERR] The bus '%s' to focus on does not exist!" % focus)
-                return -1   # return unsuccessfully
-        else:   # list
-            for bus in focus:
-                if bus not in buses:
-                    print("[ERR] The bus '%s' to focus on does not exist!" % bus)
-                    return -1   # return unsuccessfully
-
-
-    # compile regular expressions
-    bus_filter_regexp = re.compile(bus_filter) if bus_filter else None
-    generator_filter_regexp = re.compile(generator_filter) if generator_filter else None
-    load_filter_regexp = re.compile(load_filter) if load_filter else None
-    store_filter_regexp = re.compile(store_filter) if store_filter else None
-    storage_unit_filter_regexp = re.compile(storage_unit_filter) if storage_unit_filter else None
-    link_filter_regexp = re.compile(link_filter) if link_filter else None
-    line_filter_regexp = re.compile(line_filter) if line_filter else None
-    carrier_filter_regexp = re.compile(carrier_filter) if carrier_filter else None
-
-
-    # get network name
-    if pypsa_network.name:
-        network_name = pypsa_network.name
-        if log or log_info:
-            print("[INF] Start generating topographical representation of the network '%s'" % network_name)
-    else:
-        network_name = NETWORK_NAME
-        if log or log_info:
-            print("[INF] Start generating topographical representation of the network")
-
-
-    # get components from (PyPSA) network
-    components = _get_components(pypsa_network, focus is not None, log, log_info, log_warning)
-
-
-    # process components
-    if focus:
-
-        # focus on bus
-        carriers = dict()
-        if isinstance(focus, str):
-            if isinstance(neighbourhood, int):
-                value = neighbourhood
-            else:   # list
-                value = neighbourhood[0] if len(neighbourhood) else 0
-            _focus(components, focus, value, bus_filter_regexp, generator_filter_regexp, load_filter_regexp, store_filter_regexp, storage_unit_filter_regexp, link_filter_regexp, line_filter_regexp, negative_efficiency, broken_missing, carrier_color, context, log, log_info, log_warning, carriers)
-        else:   # list
-            for i in range(len(focus)):
-                bus = focus[i]
-                if bus not in visited:   # skip bus as it has already been visited (processed)
-                    if isinstance(neighbourhood, int):
-                        value = neighbourhood
-                    else:   # list
-                        value = neighbourhood[i] if i < len(neighbourhood) else 0
-                    _focus(components, bus, value, bus_filter_regexp, generator_filter_regexp, load_filter_regexp, store_filter_regexp, storage_unit_filter_regexp, link_filter_regexp, line_filter_regexp, carrier_filter_regexp, negative_efficiency, broken_missing, carrier_color, context, log, log_info, log_warning, carriers)
-                    visited.add(bus)
-
-
-        # remove redundant (duplicated) links
-        remove = dict()
-        for bus, values in components.items():
-            links = values["links"]
-            for link, bus_to, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, p1_time_series, bidirectional, direction, missing, selected in links:
-                if link not in remove or selected:
-                    remove[link] = [selected, False]
-        for bus, values in components.items():
-            links = values["links"]
-            for i in range(len(links) - 1, -1, -1):
-                link, bus_to, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, p1_time_series, bidirectional, direction, missing, selected = links[i]
-                if remove[link][0]:
-                    if not selected:
-                        del links[i]
-                else:
-                    if remove[link][1]:
-                        del links[i]
-                    else:
-                        remove[link][1] = True
-
-
-        # remove redundant (duplicated) multi-links
-        remove = dict()
-        for bus, values in components.items():
-            multi_link_branches = values["multi_link_branches"]
-            for link, bus_to, bus_value, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, px, px_time_series, index, direction, selected in multi_link_branches:
-                key = (link, bus_value)
-                if key not in remove:
-                    remove[key] = [False, 0, 0]
-                if selected:
-                    remove[key][0] = True
-                    remove[key][1] += 1
-                else:
-                    remove[key][2] += 1
-        for bus, values in components.items():
-            multi_link_branches = values["multi_link_branches"]
-            for i in range(len(multi_link_branches) - 1, -1, -1):
-                link, bus_to, bus_value, carrier, p_nom_extendable, p_nom, efficiency, capital_cost, marginal_cost, p_nom_opt, p0_time_series, px, px_time_series, index, direction, selected = multi_link_branches[i]
-                key = (link, bus_value)
-                if selected:
-                    if remove[key][0] and remove[key][1] > 1:
-                        del multi_link_branches[i]
-                        remove[key][1] -= 1
-                else:
-                    if remove[key][0] or remove[key][2] > 1:
-                        del multi_link_branches[i]
-                        remove[key][2] -= 1
-
-
-        # remove redundant (duplicated) lines
-        remove = dict()
-        for bus, values in components.items():
-            lines = values["lines"]
-            for line, bus1, carrier, s_nom_extendable, s_nom, capital_cost, s_nom_opt, p0_time_series, p1_time_series, direction, missing, selected in lines:
-                if line not in remove or selected:
-                    remove[line] = [selected, False]
-        for bus, values in components.items():
-            lines = values["lines"]
-            for i in range(len(lines) - 1, -1, -1):
-                line, bus1, carrier, s_nom_extendable, s_nom, capital_cost, s_nom_opt, p0_time_series, p1_time_series, direction, missing, selected = lines[i]
-                if remove[line][0]:
-                    if not selected:
-                        del lines[i]
-                else:
-                    if remove[line][1]:
-                        del lines[i]
-                    else:
-                        remove[line][1] = True
-
+    # extract topology from (PyPSA) network (restricting it to the buses reachable from the bus(es) to focus on, unless the full topology is needed as context or to be cached) and render it asynchronously
+    if focus and not context and not cache_directory:
+        topology = Topology(network, focus = focus, neighbourhood = neighbourhood, log = log, log_info = log_info, log_warning = log_warning)
     else:
-        carriers = _process_components(components, bus_filter_regexp, generator_filter_regexp, load_filter_regexp, store_filter_regexp, storage_unit_filter_regexp, link_filter_regexp, line_filter_regexp, carrier_filter_regexp, negative_efficiency, broken_missing, carrier_color, context)
-
-
-    # get DOT representation of components
-    representation, buses_count, generators_count, loads_count, stores_count, storage_units_count, links_count, lines_count = _represent_components(components, carriers, negative_efficiency, broken_missing, carrier_color, context, log, log_info, log_warning)
-
-
-    # add extension to file output in case it does not have one
-    if "." not in file_output:
-        file_output = "%s.%s" % (file_output, file_format)
-
-
-    # add metadata to digraph
-    now = datetime.datetime.now()
-    result.append("//")
-    result.append("// Generated by %s version %s (on the %04d/%02d/%02d at %02d:%02d:%02d) using the following parameters: " % (__project__, __version__, now.year, now.month, now.day, now.hour, now.minute, now.second))
-    result.append("//")
-    if isinstance(network, str):
-        result.append("//    file_input=%s" % network)
-    else:   # pypsa.components.Network
-        result.append("//    file_input=None")
-    result.append("//    focus=%s" % focus)
-    result.append("//    neighbourhood=%s" % neighbourhood)
-    result.append("//    bus_filter=%s" % bus_filter)
-    result.append("//    generator_filter=%s" % generator_filter)
-    result.append("//    load_filter=%s" % load_filter)
-    result.append("//    store_filter=%s" % store_filter)
-    result.append("//    storage_unit_filter=%s" % storage_unit_filter)
-    result.append("//    link_filter=%s" % link_filter)
-    result.append("//    line_filter=%s" % line_filter)
-    result.append("//    carrier_filter=%s" % carrier_filter)
-    result.append("//    negative_efficiency=%s" % negative_efficiency)
-    result.append("//    broken_missing=%s" % broken_missing)
-    result.append("//    carrier_color=%s" % carrier_color)
-    result.append("//    context=%s" % context)
-    result.append("//    file_output=%s" % file_output)
-    result.append("//    file_format=%s" % file_format)
-    result.append("//    log=%s" % log)
-    result.append("//    log_info=%s" % log_info)
-    result.append("//    log_warning=%s" % log_warning)
-    result.append("//")
-    result.append("")
-
+        topology = Topology(network, cache_directory, log = log, log_info = log_info, log_warning = log_warning)
+    return await topology.render_async(focus, neighbourhood, bus_filter, generator_filter, load_filter, store_filter, storage_unit_filter, link_filter, line_filter, carrier_filter, negative_efficiency, broken_missing, carrier_color, context, file_output, file_format, aggregate_one_ports, aggregate_buses, layout_engine, render_timeout, render_cache_directory, reuse_layout, log, log_info, log_warning)
 
-    # declare digraph header
-    result.append("digraph \"%s\"" % network_name)
 
 
-    # open digraph body
-    result.append("{")
-
-
-    # configure digraph layout
-    result.append("   // digraph layout")
-    result.append("   margin = %.2f" % MARGIN)
-    result.append("   bgcolor = \"%s\"" % BACKGROUND_COLOR)
-    if network_name != "":
-        result.append("   labelloc = \"t\"")
-        result.append("   label = \"%s\n\n\n           \"" % network_name)
-        result.append("   tooltip = \"Network: %s\nBuses: %d (out of %d)\nGenerators: %d (out of %d)\nLoads: %s (out of %d)\nStores: %d (out of %d)\nStorage units: %d (out of %d)\nLinks: %d (out of %d)\nLines: %d (out of %d)\nSnapshots: %d\"" % (network_name, buses_count, len(pypsa_network.buses), generators_count, len(pypsa_network.generators), loads_count, len(pypsa_network.loads), stores_count, len(pypsa_network.stores), storage_units_count, len(pypsa_network.storage_units), links_count, len(pypsa_network.links), lines_count, len(pypsa_network.lines), len(pypsa_network.snapshots)))
-    result.append("   rankdir = \"%s\"" % RANK_DIRECTION)
-    result.append("   ranksep = %.2f" % RANK_SEPARATION)
-    result.append("   nodesep = %.2f" % NODE_SEPARATION)
-    result.append("   splines = \"%s\"" % EDGE_STYLE)
-    result.append("   node [fontname = \"%s\", fontsize = %.2f]" % (TEXT_FONT, TEXT_SIZE))
-    result.append("   edge [fontname = \"%s\", fontsize = %.2f]" % (TEXT_FONT, TEXT_SIZE))
-    result.append("")
-
-
-    # add DOT representation of components to result
-    result.extend(representation)
-
-
-    # close digraph body
-    result.append("}")
-
-
-    # generate output files based on (PyPSA) network DOT representation
-    status = _generate_output(result, file_output, file_format, log, log_info, log_warning)
-
-
-    # display info message
-    if not status:
-        if log or log_info:
-            print("[INF] Finished generating topographical representation of the network!")
+def _generate_file(file_input, file_output, parameters, capture):
+    """
+    Parameters
+    ----------
+    file_input : TYPE
+        DESCRIPTION.
+    file_output : TYPE
+        DESCRIPTION.
+    parameters : TYPE
+        DESCRIPTION.
+    capture : TYPE
+        DESCRIPTION.
 
+    Returns
+    -------
+    TYPE
+        DESCRIPTION.
+    """
 
-    # display topographical representation (only when running from Jupyter)
-    if not status:
+    # generate topographical representation of network file (capturing its log messages in case it is processed in parallel with other files, so that the messages of different files are not interleaved)
+    messages = io.StringIO() if capture else sys.stdout
+    with contextlib.redirect_stdout(messages):
         try:
-            if get_ipython().__class__.__name__ == "ZMQInteractiveShell":   # in Jupyter
-                import IPython.display
-                if file_format == "svg":
-                    display(IPython.display.SVG(file_output))
-                else:
-                    display(IPython.display.Image(file_output))
-        except:
-            pass
+            status = generate(file_input, file_output = file_output, **parameters)
+        except Exception as exception:
+            print("[ERR] The network file '%s' could not be processed (%s)!" % (file_input, exception))
+            status = -1   # unsuccessful
 
 
-    return status
+    return status, messages.getvalue() if capture else ""
 
 
 
@@ -1824,7 +4178,15 @@ if __name__ == "__main__":
     parser.add_argument("--carrier-color", nargs = "*", help = "Specify a palette to color components in function of their carriers")
     parser.add_argument("--context", action = "store_true", help = "Show selected components in the topographical representation of the network amongst excluded components")
     parser.add_argument("--file-output", nargs = "+", help = "Specify the file name where to save the topographical representation of the network")
-    parser.add_argument("--file-format", choices = ["svg", "png", "jpg", "gif", "pdf", "ps"], help = "Specify the file format that the topographical representation of the network is saved as")
+    parser.add_argument("--file-format", nargs = "+", choices = ["svg", "png", "jpg", "gif", "pdf", "ps"], help = "Specify the file format(s) that the topographical representation of the network is saved as")
+    parser.add_argument("--aggregate-one-ports", action = "store_true", help = "Represent the generators, loads, stores and storage units attached to a bus as one component per carrier")
+    parser.add_argument("--aggregate-buses", nargs = "?", const = True, help = "Represent buses as groups in function of a regular expression (or of their location when no regular expression is specified)")
+    parser.add_argument("--render-timeout", type = float, help = "Specify how many seconds the tool 'dot' may take to lay out and render the topographical representation of the network before falling back to a cheaper layout engine or to a reduced level of detail")
+    parser.add_argument("--layout-engine", choices = ["dot", "sfdp", "neato", "fdp", "auto"], help = "Specify the layout engine used to lay out the topographical representation of the network ('auto' selects 'sfdp' instead of 'dot' for large networks)")
+    parser.add_argument("--render-cache-directory", action = "store", help = "Specify a directory where to cache the output files generated (to avoid laying out again topographical representations that are unchanged)")
+    parser.add_argument("--reuse-layout", action = "store_true", help = "Reuse the layout of a previous topographical representation of the network with the same structure, rewriting only its tooltips (e.g. to show the results of a new optimisation)")
+    parser.add_argument("--cache-directory", action = "store", help = "Specify a directory where to cache the topology extracted from network files (to avoid reading them again when unchanged)")
+    parser.add_argument("--jobs", type = int, default = 1, help = "Specify how many network files to process in parallel (0 means as many as there are CPU cores)")
     parser.add_argument("--log", action = "store_true", help = "Show all log messages while generating the topographical representation of the network")
     parser.add_argument("--log-info", action = "store_true", help = "Show only info log messages while generating the topographical representation of the network")
     parser.add_argument("--log-warning", action = "store_true", help = "Show only warning log messages while generating the topographical representation of the network")
@@ -1858,7 +4220,13 @@ if __name__ == "__main__":
             carrier_color = dict()
             for i in range(0, len(args.carrier_color), 2):
                 carrier_color[args.carrier_color[i]] = args.carrier_color[i + 1]
-    file_format = args.file_format if args.file_format else FILE_FORMAT
+    if args.file_format is None:
+        file_format = FILE_FORMAT
+    else:
+        file_format = args.file_format[0] if len(args.file_format) == 1 else args.file_format
+    aggregate_buses = args.aggregate_buses if args.aggregate_buses else None
+    layout_engine = args.layout_engine if args.layout_engine else LAYOUT_ENGINE
+    render_timeout = args.render_timeout if args.render_timeout else RENDER_TIMEOUT
 
 
     # display PyPSATopo information
@@ -1868,20 +4236,39 @@ if __name__ == "__main__":
 
     if files:
 
-        # loop through files passed as arguments
-        for i in range(len(files)):
+        # generate output file names
+        file_outputs = [args.file_output[i] if args.file_output and i < len(args.file_output) else "%s.%s" % (os.path.splitext(files[i])[0], file_format if isinstance(file_format, str) else file_format[0]) for i in range(len(files))]
+        parameters = {"focus": args.focus, "neighbourhood": neighbourhood, "bus_filter": bus_filter, "generator_filter": generator_filter, "load_filter": load_filter, "store_filter": store_filter, "storage_unit_filter": storage_unit_filter, "link_filter": link_filter, "line_filter": line_filter, "carrier_filter": carrier_filter, "negative_efficiency": not args.no_negative_efficiency, "broken_missing": args.broken_missing, "carrier_color": carrier_color, "context": args.context, "file_format": file_format, "aggregate_one_ports": args.aggregate_one_ports, "aggregate_buses": aggregate_buses, "layout_engine": layout_engine, "render_timeout": render_timeout, "render_cache_directory": args.render_cache_directory, "reuse_layout": args.reuse_layout, "cache_directory": args.cache_directory, "log": args.log, "log_info": args.log_info, "log_warning": args.log_warning}
+
 
-            # generate output file name
-            file_output = args.file_output[i] if args.file_output and i < len(args.file_output) else "%s.%s" % (files[i].rsplit(".", 1)[0], file_format)
+        # generate topographical representations of networks (across a pool of processes in case more than one job is requested)
+        jobs = min(args.jobs if args.jobs > 0 else os.cpu_count() or 1, len(files))
+        if jobs > 1:
+            if args.log or args.log_info:
+                print("[INF] Processing %d network files across %d jobs" % (len(files), jobs))
+            executor = ProcessPoolExecutor(max_workers = jobs)
+            results = executor.map(_generate_file, files, file_outputs, repeat(parameters), repeat(True))
+        else:
+            executor = None
+            results = map(_generate_file, files, file_outputs, repeat(parameters), repeat(False))
+        statuses = list()
+        for status, messages in results:   # in the same order as the files (while these are still being processed)
+            print(messages, end = "")
+            statuses.append(status)
+        if executor:
+            executor.shutdown()
 
 
-            # generate topographical representation of network
-            status = generate(files[i], focus = args.focus, neighbourhood = neighbourhood, bus_filter = bus_filter, generator_filter = generator_filter, load_filter = load_filter, store_filter = store_filter, storage_unit_filter = storage_unit_filter, link_filter = link_filter, line_filter = line_filter, carrier_filter = carrier_filter, negative_efficiency = not args.no_negative_efficiency, broken_missing = args.broken_missing, carrier_color = carrier_color, context = args.context, file_output = file_output, file_format = file_format, log = args.log, log_info = args.log_info, log_warning = args.log_warning)
+        # display summary of generation
+        failed = [files[i] for i in range(len(files)) if statuses[i]]
+        if args.log or args.log_info:
+            print("[INF] Generated topographical representation of %d network file(s) out of %d" % (len(files) - len(failed), len(files)))
+        if failed:
+            print("[ERR] The topographical representation of the following network file(s) could not be generated: %s" % ", ".join("'%s'" % file_input for file_input in failed))
 
 
-            # check status of generation
-            if status:
-                sys.exit(status)   # set exit code with returned status and exit
+        # set status with the one of the first unsuccessful file (if any)
+        status = next((value for value in statuses if value), 0)
 
     else:
 
@@ -1906,7 +4293,7 @@ if __name__ == "__main__":
 
 
         # generate topographical representation of dummy network
-        status = generate(network, focus = args.focus, neighbourhood = neighbourhood, bus_filter = bus_filter, generator_filter = generator_filter, load_filter = load_filter, store_filter = store_filter, storage_unit_filter = storage_unit_filter, link_filter = link_filter, line_filter = line_filter, carrier_filter = carrier_filter, negative_efficiency = not args.no_negative_efficiency, broken_missing = args.broken_missing, carrier_color = carrier_color, context = args.context, file_output = file_output, file_format = file_format, log = args.log, log_info = args.log_info, log_warning = args.log_warning)
+        status = generate(network, focus = args.focus, neighbourhood = neighbourhood, bus_filter = bus_filter, generator_filter = generator_filter, load_filter = load_filter, store_filter = store_filter, storage_unit_filter = storage_unit_filter, link_filter = link_filter, line_filter = line_filter, carrier_filter = carrier_filter, negative_efficiency = not args.no_negative_efficiency, broken_missing = args.broken_missing, carrier_color = carrier_color, context = args.context, file_output = file_output, file_format = file_format, aggregate_one_ports = args.aggregate_one_ports, aggregate_buses = aggregate_buses, layout_engine = layout_engine, render_timeout = render_timeout, render_cache_directory = args.render_cache_directory, reuse_layout = args.reuse_layout, cache_directory = args.cache_directory, log = args.log, log_info = args.log_info, log_warning = args.log_warning)
 
 
     # set exit code and finish
@@ -0,0 +1,291 @@
+"""
+Checks of PyPSATopo on a small synthetic network, covering the aggregation of buses (by regular expression and by location), the round-trip of the topology
+through the cache directory, the rejection of an invalid layout engine, the fallback taken when the render timeout is exceeded, the generation of several file
+formats at once and of outputs in memory (the tool 'dot' being replaced by a script writing the DOT representation as is for the latter checks) and the reuse
+of layouts, i.e. the rewriting of the tooltips of SVG files generated by the tool 'dot' (which is required for checking these against SVG files generated from
+scratch, the other checks using a hand-written SVG file).
+
+Usage: python tests/test_pypsatopo.py (or python -m pytest tests)
+"""
+
+
+import contextlib
+import io
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import unittest
+import warnings
+import pandas
+import pypsa
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import pypsatopo
+
+
+
+BUS_REGEXP = re.compile("^   \"([^\"]*) \\(bus\\)\" \\[", re.M)
+EDGE_REGEXP = re.compile("^   \"([^\"]*) \\(bus\\)\" -> \"([^\"]*) \\(bus\\)\" \\[label = <<font color = \"[^\"]*\">(.*?)</font>>, tooltip = \"(Link|Line): ", re.M)
+TITLE_REGEXP = re.compile("xlink:title=\"([^\"]*)\"")
+FAKE_DOT = """#!%s
+import sys
+import time
+arguments = sys.argv[1:]
+text = sys.stdin.buffer.read()
+if "-K%s" in arguments:
+    time.sleep(30)
+formats = [value[2:] for value in arguments if value.startswith("-T")]
+outputs = [arguments[index + 1] for index, value in enumerate(arguments) if value == "-o"]
+if outputs:
+    for file_format, file_output in zip(formats, outputs):
+        with open(file_output, "wb") as handle:
+            handle.write(b"-T" + file_format.encode() + b"\\n" + text)
+else:
+    sys.stdout.buffer.write(b"-T" + formats[0].encode() + b"\\n" + text)
+"""   # script replacing the tool 'dot', which writes the format requested followed by the DOT representation into each output file (or its standard output) and takes too long with the given layout engine
+
+
+
+def build_network(names = ("wind - DK1", "solar & co", "hydro  <SE>")):
+    # build a network of five buses in three areas (and two locations) whose generators are named with characters escaped in DOT and SVG files
+    network = pypsa.Network(name = "Test <&> Network")
+    network.set_snapshots(pandas.date_range("2020-01-01", periods = 4, freq = "h"))
+    network.add("Bus", ["DK1 AC", "DK1 H2", "DK2 AC", "DK2 H2", "SE AC"], carrier = ["AC", "H2", "AC", "H2", "AC"], location = ["north", "north", "south", "south", "north"])
+    network.add("Generator", list(names), bus = ["DK1 AC", "DK2 AC", "SE AC"], p_nom = [10.0, 20.0, 30.0])
+    network.add("Load", ["demand DK1", "demand DK2"], bus = ["DK1 AC", "DK2 AC"], p_set = 5.0)
+    network.add("Link", ["electrolysis DK1", "electrolysis DK2", "pipeline"], bus0 = ["DK1 AC", "DK2 AC", "DK1 H2"], bus1 = ["DK1 H2", "DK2 H2", "DK2 H2"], p_nom = 1.0)
+    network.add("Line", ["line 1", "line 2", "line 3", "line 4"], bus0 = ["DK1 AC", "DK2 AC", "DK1 AC", "DK1 AC"], bus1 = ["DK2 AC", "SE AC", "SE AC", "SE AC"], x = 0.1, s_nom = [1.0, 2.0, 3.0, 4.0])
+    return network
+
+
+
+def generate(network, file_output, **parameters):
+    # generate topographical representation of network, returning its status, the DOT representation (without metadata) and the messages displayed
+    messages = io.StringIO()
+    with contextlib.redirect_stdout(messages), warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        status = pypsatopo.generate(network, file_output = file_output, log_info = True, **parameters)
+    with open("%s.dot" % os.path.splitext(file_output)[0]) as handle:
+        representation = "\n".join(line for line in handle.read().splitlines() if not line.startswith("//"))
+    return status, representation, messages.getvalue()
+
+
+
+def require_dot():
+    # skip check in case the tool 'dot' is not installed
+    if shutil.which("dot") is None:
+        raise unittest.SkipTest("the tool 'dot' is not installed")
+
+
+
+@contextlib.contextmanager
+def fake_dot(slow_engine = None):
+    # replace the tool 'dot' with a script found first in the path while the check runs (skipping it where such a script cannot be run, i.e. on Windows)
+    if os.name == "nt":
+        raise unittest.SkipTest("the tool 'dot' cannot be replaced by a script")
+    with tempfile.TemporaryDirectory() as directory:
+        file_dot = os.path.join(directory, "dot")
+        with open(file_dot, "w") as handle:
+            handle.write(FAKE_DOT % (sys.executable, slow_engine))
+        os.chmod(file_dot, 0o755)
+        path = os.environ.get("PATH", "")
+        os.environ["PATH"] = "%s%s%s" % (directory, os.pathsep, path)
+        try:
+            yield
+        finally:
+            os.environ["PATH"] = path
+
+
+
+def test_aggregate_buses_by_regexp():
+    with tempfile.TemporaryDirectory() as directory:
+        status, representation, messages = generate(build_network(), os.path.join(directory, "topography.svg"), aggregate_buses = "(DK\\d|SE)")
+    assert sorted(BUS_REGEXP.findall(representation)) == ["DK1", "DK2", "SE"]
+    edges = sorted(EDGE_REGEXP.findall(representation))
+    assert edges == [("DK1", "DK2", "line 1", "Line"), ("DK1", "DK2", "pipeline", "Link"), ("DK1", "SE", "line 3 (and 1 more)", "Line"), ("DK2", "SE", "line 2", "Line")]   # electrolysers connect buses of the same area
+    assert "Nominal power: 7.00 MVA" in representation   # lines 3 and 4 merged
+
+
+
+def test_aggregate_buses_by_location():
+    with tempfile.TemporaryDirectory() as directory:
+        status, representation, messages = generate(build_network(), os.path.join(directory, "topography.svg"), aggregate_buses = True)
+    assert sorted(BUS_REGEXP.findall(representation)) == ["north", "south"]
+    edges = sorted(EDGE_REGEXP.findall(representation))
+    assert edges == [("north", "south", "line 1", "Line"), ("north", "south", "pipeline", "Link"), ("south", "north", "line 2", "Line")]   # lines 3 and 4 connect buses of the same location
+
+
+
+def test_topology_cache_round_trip():
+    with tempfile.TemporaryDirectory() as directory:
+        file_input = os.path.join(directory, "network.nc")
+        cache_directory = os.path.join(directory, "cache")
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            build_network().export_to_netcdf(file_input)
+        status0, representation0, messages0 = generate(file_input, os.path.join(directory, "topography0.svg"), cache_directory = cache_directory)
+        status1, representation1, messages1 = generate(file_input, os.path.join(directory, "topography1.svg"), cache_directory = cache_directory)
+        files = sorted(os.path.splitext(value)[1] for value in os.listdir(cache_directory))
+    assert "Writing topology of network into cache file" in messages0
+    assert "Reading topology of network from cache file" in messages1 and "Reading static tables" not in messages1
+    assert representation0 == representation1
+    assert files == [".key", ".topology"]
+
+
+
+def test_reject_layout_engine():
+    messages = io.StringIO()
+    with tempfile.TemporaryDirectory() as directory:
+        with contextlib.redirect_stdout(messages):
+            status = pypsatopo.generate(build_network(), file_output = os.path.join(directory, "topography.svg"), layout_engine = "circo")
+        files = os.listdir(directory)
+    assert status == -1
+    assert "[ERR] The layout engine 'circo' is not valid" in messages.getvalue()
+    assert files == []   # rejected before the network is read (and the tool 'dot' is run)
+
+
+
+def test_render_timeout_fallback():
+    with fake_dot("dot"), tempfile.TemporaryDirectory() as directory:
+        file_output = os.path.join(directory, "topography.svg")
+        status, representation, messages = generate(build_network(), file_output, layout_engine = "dot", render_timeout = 2, log_warning = True)
+        with open(os.path.join(directory, "topography.dot")) as handle:
+            header = [line for line in handle.read().splitlines() if line.startswith("//")]
+        with open(file_output, "rb") as handle:
+            output = handle.read()
+    assert status == 0
+    assert "[WAR] The tool 'dot' exceeded the render timeout of 2 seconds with layout engine 'dot' and was killed" in messages
+    assert "// The following fallback(s) were taken as the render timeout was exceeded:" in header
+    assert "//    layout_engine=dot was replaced by layout_engine=sfdp" in header
+    assert output.startswith(b"-Tsvg\n")
+
+
+
+def test_several_file_formats():
+    with fake_dot(), tempfile.TemporaryDirectory() as directory:
+        status, representation, messages = generate(build_network(), os.path.join(directory, "topography.svg"), file_format = ["svg", "ps"])
+        files = sorted(os.listdir(directory))
+        outputs = list()
+        for value in ("topography.svg", "topography.ps"):
+            with open(os.path.join(directory, value), "rb") as handle:
+                outputs.append(handle.read())
+    assert status == 0
+    assert files == ["topography.dot", "topography.ps", "topography.svg"]
+    assert messages.count("Generating topographical representation of the network") == 1   # laid out once for both file formats
+    assert outputs[0].startswith(b"-Tsvg\n") and outputs[1].startswith(b"-Tps\n") and outputs[0][6:] == outputs[1][5:]
+
+
+
+def test_outputs_in_memory():
+    network = build_network()
+    directory = os.getcwd()
+    with fake_dot(), tempfile.TemporaryDirectory() as working_directory, warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        os.chdir(working_directory)
+        try:
+            representation, output = pypsatopo.generate(network, file_output = None)
+            representation_list, outputs = pypsatopo.generate(network, file_output = None, file_format = ["svg", "ps"])
+            files = os.listdir(working_directory)
+        finally:
+            os.chdir(directory)
+    assert isinstance(representation, str) and "\n// Generated by PyPSATopo" in representation and "\ndigraph" in representation
+    assert output == b"-Tsvg\n%s\n" % representation.encode("utf-8")   # the tool 'dot' reads an empty line after the DOT representation
+    assert outputs == [b"-Tsvg\n%s\n" % representation_list.encode("utf-8"), b"-Tps\n%s\n" % representation_list.encode("utf-8")]
+    assert files == []   # nothing written to the file system
+
+
+
+def check_reuse_layout(names, reused):
+    # render network, change the results of its optimisation (which only changes tooltips) and render it again reusing the layout, the SVG file having to be identical to the one the tool 'dot' generates from scratch
+    require_dot()
+    network = build_network(names)
+    with tempfile.TemporaryDirectory() as directory:
+        render_cache_directory = os.path.join(directory, "render_cache")
+        status, representation, messages = generate(network, os.path.join(directory, "before.svg"), render_cache_directory = render_cache_directory, reuse_layout = True)
+        assert status == 0
+        network.generators.p_nom_opt = [11.0, 22.0, 33.0]
+        status, representation, messages = generate(network, os.path.join(directory, "after.svg"), render_cache_directory = render_cache_directory, reuse_layout = True)
+        assert status == 0
+        assert ("Reusing layout of render cache file" in messages) == reused
+        status, representation, messages = generate(network, os.path.join(directory, "scratch.svg"))
+        assert status == 0
+        with open(os.path.join(directory, "after.svg"), "rb") as handle0, open(os.path.join(directory, "scratch.svg"), "rb") as handle1:
+            assert handle0.read() == handle1.read()
+
+
+
+def test_reuse_layout_escaped_tooltips():
+    check_reuse_layout(("wind - DK1", "solar & \"co\"", "hydro  <SE>   it's"), True)
+
+
+
+def test_reuse_layout_entity_tooltips():
+    check_reuse_layout(("wind &#45; DK1", "solar &amp; co", "hydro &lt;SE&gt;"), False)   # entities are decoded by the tool 'dot'
+
+
+
+def test_reuse_layout_backslash_tooltips():
+    check_reuse_layout(("wind \\N DK1", "solar \\n co", "hydro \\\\ SE"), False)   # escape sequences (e.g. "\N" for the name of the node) are expanded by the tool 'dot'
+
+
+
+def test_get_title():
+    assert pypsatopo._get_title("Generator: wind - DK1\nBus: <DK1> & \\\"AC\\\"\r\nCarrier: it's   on") == "Generator: wind &#45; DK1&#10;Bus: &lt;DK1&gt; &amp; &quot;AC&quot;&#13;&#10;Carrier: it&#39;s &#160;&#160;on"
+    assert pypsatopo._get_title("Generator: wind \\N DK1") is None   # expanded into the name of the node by the tool 'dot'
+    assert pypsatopo._get_title("Generator: wind &amp; DK1") is None   # decoded by the tool 'dot'
+    assert pypsatopo._get_title("Generator: wind & DK1") == "Generator: wind &amp; DK1"
+
+
+
+def reuse_layout(titles, previous, tooltips):
+    # rewrite the titles of an SVG file (written as the tool 'dot' writes it) stored in a render cache along with the tooltips it was generated with, returning whether it succeeded and the SVG file written
+    text = "<svg>\n%s</svg>\n" % "".join("<g id=\"a_node%d\"><a xlink:title=\"%s\">\n<ellipse/>\n</a>\n</g>\n" % (index, value) for index, value in enumerate(titles))
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "key.svg"), "w", encoding = "utf-8") as handle:
+            handle.write(text)
+        with open(os.path.join(directory, "key.tooltips"), "w", encoding = "utf-8") as handle:
+            json.dump(previous, handle)
+        file_output = os.path.join(directory, "topography.svg")
+        result = pypsatopo._reuse_layout(directory, "key", file_output, "svg", tooltips)
+        if not result:
+            return result, None
+        with open(file_output, encoding = "utf-8") as handle:
+            return result, handle.read()
+
+
+
+def test_reuse_layout_rewrite_titles():
+    previous = ["Generator: wind - DK1\nOptimised nominal power: 1.00 MW", "Line: <DK1> & \\\"SE\\\"  (x)", "Bus: DK1"]
+    tooltips = ["Generator: wind - DK1\nOptimised nominal power: 2.00 MW", "Line: <DK1> & \\\"SE\\\"  (y)", "Bus: DK1"]
+    result, text = reuse_layout(["Generator: wind &#45; DK1&#10;Optimised nominal power: 1.00 MW", "Line: &lt;DK1&gt; &amp; &quot;SE&quot; &#160;(x)", "Bus: DK1"], previous, tooltips)
+    assert result
+    assert TITLE_REGEXP.findall(text) == ["Generator: wind &#45; DK1&#10;Optimised nominal power: 2.00 MW", "Line: &lt;DK1&gt; &amp; &quot;SE&quot; &#160;(y)", "Bus: DK1"]
+
+
+
+def test_reuse_layout_give_up():
+    previous = ["Generator: wind DK1", "Bus: DK1"]
+    assert reuse_layout(previous, previous, ["Generator: wind DK2", "Bus: DK1"]) == (True, "<svg>\n<g id=\"a_node0\"><a xlink:title=\"Generator: wind DK2\">\n<ellipse/>\n</a>\n</g>\n<g id=\"a_node1\"><a xlink:title=\"Bus: DK1\">\n<ellipse/>\n</a>\n</g>\n</svg>\n")
+    assert reuse_layout(previous, previous, ["Generator: wind \\N", "Bus: DK1"]) == (False, None)   # escape sequence expanded by the tool 'dot'
+    assert reuse_layout(previous, previous, ["Generator: wind &#45; DK1", "Bus: DK1"]) == (False, None)   # entity decoded by the tool 'dot'
+    assert reuse_layout(previous, previous, ["Generator: wind DK1"]) == (False, None)   # different number of tooltips
+    assert reuse_layout(["Bus: DK1", "Bus: DK1"], ["Bus: DK1", "Bus: DK1"], ["Bus: DK1", "Bus: DK2"]) == (False, None)   # equal tooltips (in the SVG file) becoming different
+
+
+
+if __name__ == "__main__":
+    failures = 0
+    for name, function in list(globals().items()):
+        if name.startswith("test_"):
+            try:
+                function()
+                print("%s: passed" % name)
+            except unittest.SkipTest as skip:
+                print("%s: skipped (%s)" % (name, skip))
+            except AssertionError:
+                failures += 1
+                print("%s: failed" % name)
+    sys.exit(1 if failures else 0)